@@ -126,6 +126,10 @@ ALTER TABLE member
     ADD CONSTRAINT fk_member_address
     FOREIGN KEY (address_id)
     REFERENCES address (id);
+ALTER TABLE member
+    ADD CONSTRAINT fk_member_role
+    FOREIGN KEY (role_id)
+    REFERENCES role (id);
 ALTER TABLE user_account
     ADD CONSTRAINT fk_user_account_member
     FOREIGN KEY (member_id)
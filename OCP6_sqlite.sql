@@ -0,0 +1,164 @@
+-- SQLITE TRANSLATION OF OCP6.sql
+-- For the embedded test databases of pop_db.py. SERIAL columns are
+-- INTEGER PRIMARY KEY (rowid aliases, numbered after the highest ID),
+-- NUMERIC prices REAL, BOOLEAN columns INTEGER (0 or 1), DATE columns
+-- ISO 8601 TEXT, and the foreign key constraints, which SQLite cannot
+-- add with ALTER TABLE, are declared within the tables. They are only
+-- enforced with PRAGMA foreign_keys = ON.
+-- ENTITIES
+CREATE TABLE address (
+    id INTEGER PRIMARY KEY,
+    street_name TEXT NOT NULL,
+    home_number TEXT NOT NULL,
+    zip_code TEXT NOT NULL,
+    country TEXT
+);
+CREATE TABLE role (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL
+);
+CREATE TABLE permission (
+    id INTEGER PRIMARY KEY,
+    label TEXT NOT NULL
+);
+CREATE TABLE user_account (
+    id INTEGER PRIMARY KEY,
+    member_id INTEGER NOT NULL,
+    email TEXT NOT NULL,
+    phone_nb TEXT,
+    hashed_pwd TEXT NOT NULL,
+    CONSTRAINT fk_user_account_member
+    FOREIGN KEY (member_id)
+    REFERENCES member (id)
+);
+CREATE TABLE member (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    firstname TEXT NOT NULL,
+    works_at_pizzeria_id INTEGER DEFAULT NULL,
+    user_account_id INTEGER,
+    address_id INTEGER NOT NULL,
+    role_id INTEGER,
+    CONSTRAINT fk_member_user_account
+    FOREIGN KEY (user_account_id)
+    REFERENCES user_account (id),
+    CONSTRAINT fk_member_pizzeria
+    FOREIGN KEY (works_at_pizzeria_id)
+    REFERENCES pizzeria (id),
+    CONSTRAINT fk_member_address
+    FOREIGN KEY (address_id)
+    REFERENCES address (id),
+    CONSTRAINT fk_member_role
+    FOREIGN KEY (role_id)
+    REFERENCES role (id)
+);
+CREATE TABLE bill (
+    id INTEGER PRIMARY KEY,
+    emission_date TEXT NOT NULL,
+    total_amout_ati REAL NOT NULL,
+    order_id INTEGER NOT NULL,
+    CONSTRAINT fk_bill_order
+    FOREIGN KEY (order_id)
+    REFERENCES taken_order (id)
+);
+CREATE TABLE order_status (
+    id INTEGER PRIMARY KEY,
+    label TEXT NOT NULL
+);
+CREATE TABLE taken_order (
+    id INTEGER PRIMARY KEY,
+    member_id INTEGER NOT NULL,
+    address_id INTEGER NOT NULL,
+    pizzeria_id INTEGER NOT NULL,
+    bill_id INTEGER,
+    status_id INTEGER NOT NULL,
+    is_paid INTEGER NOT NULL DEFAULT 0,
+    CONSTRAINT fk_order_member
+    FOREIGN KEY (member_id)
+    REFERENCES member (id),
+    CONSTRAINT fk_order_bill
+    FOREIGN KEY (bill_id)
+    REFERENCES bill (id),
+    CONSTRAINT fk_order_status
+    FOREIGN KEY (status_id)
+    REFERENCES order_status (id),
+    CONSTRAINT fk_order_address
+    FOREIGN KEY (address_id)
+    REFERENCES address (id),
+    CONSTRAINT fk_order_pizzeria
+    FOREIGN KEY (pizzeria_id)
+    REFERENCES pizzeria (id)
+);
+CREATE TABLE product (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    barcode TEXT NOT NULL,
+    gram_weight INTEGER NOT NULL,
+    unit_price_ati REAL NOT NULL
+);
+CREATE TABLE pizzeria (
+    id INTEGER PRIMARY KEY,
+    name TEXT,
+    phone_nb TEXT NOT NULL,
+    address_id INTEGER NOT NULL,
+    CONSTRAINT fk_pizzeria_address
+    FOREIGN KEY (address_id)
+    REFERENCES address (id)
+);
+CREATE TABLE recipe (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    is_public INTEGER DEFAULT 0,
+    description TEXT NOT NULL
+);
+CREATE TABLE catalog_item (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    description TEXT NOT NULL,
+    picture_file TEXT,
+    unit_price_ati REAL NOT NULL,
+    is_available INTEGER NOT NULL DEFAULT 0,
+    is_displayed INTEGER NOT NULL DEFAULT 0,
+    recipe_id INTEGER,
+    product_id INTEGER, -- a catalog_item may be a product with no recipe (sodas, etc.)
+    CONSTRAINT fk_catalog_item_recipe
+    FOREIGN KEY (recipe_id)
+    REFERENCES recipe (id),
+    CONSTRAINT fk_catalog_item_product
+    FOREIGN KEY (product_id)
+    REFERENCES product (id)
+);
+CREATE TABLE keyword (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL
+);
+-- ASSOCIATIVE ENTITIES
+CREATE TABLE has_permission_to (
+    role_id INTEGER REFERENCES role NOT NULL,
+    permission_id INTEGER REFERENCES permission NOT NULL,
+    PRIMARY KEY (role_id, permission_id)
+);
+CREATE TABLE contains_item (
+    order_id INTEGER REFERENCES taken_order NOT NULL,
+    item_id INTEGER REFERENCES catalog_item NOT NULL,
+    quantity INTEGER NOT NULL DEFAULT 1,
+    unit_price_ati REAL NOT NULL,
+    PRIMARY KEY (order_id, item_id)
+);
+CREATE TABLE has_product_in_stock (
+    pizzeria_id INTEGER REFERENCES pizzeria NOT NULL,
+    product_id INTEGER REFERENCES product NOT NULL,
+    quantity INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (pizzeria_id, product_id)
+);
+CREATE TABLE requires_product (
+    recipe_id INTEGER REFERENCES recipe NOT NULL,
+    product_id INTEGER REFERENCES product NOT NULL,
+    gram_amount INTEGER NOT NULL,
+    PRIMARY KEY (recipe_id, product_id)
+);
+CREATE TABLE has_keyword (
+    item_id INTEGER REFERENCES catalog_item NOT NULL,
+    keyword_id INTEGER REFERENCES keyword NOT NULL,
+    PRIMARY KEY (item_id, keyword_id)
+);
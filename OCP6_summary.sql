@@ -0,0 +1,126 @@
+-- SUMMARY TABLES
+-- Sales and awaiting orders per pizzeria, kept current by the triggers
+-- below, for the dashboard reports of example_queries.sql. The script
+-- can be run again over an existing database.
+CREATE TABLE IF NOT EXISTS pizzeria_item_sales (
+    pizzeria_id INTEGER REFERENCES pizzeria NOT NULL,
+    item_id INTEGER REFERENCES catalog_item NOT NULL,
+    nb_sells INTEGER NOT NULL,
+    PRIMARY KEY (pizzeria_id, item_id)
+);
+CREATE TABLE IF NOT EXISTS pizzeria_awaiting_orders (
+    pizzeria_id INTEGER REFERENCES pizzeria PRIMARY KEY,
+    nb_awaiting_orders INTEGER NOT NULL
+);
+CREATE OR REPLACE VIEW awaiting_status AS
+    SELECT id FROM order_status WHERE label IN ('En cours', 'En attente');
+
+-- Full rebuild, after a bulk load with the triggers disabled
+CREATE OR REPLACE FUNCTION refresh_summaries() RETURNS void AS $$
+BEGIN
+    TRUNCATE pizzeria_item_sales, pizzeria_awaiting_orders;
+    INSERT INTO pizzeria_item_sales (pizzeria_id, item_id, nb_sells)
+    SELECT t_o.pizzeria_id, c_i.item_id, count(*)
+    FROM contains_item c_i JOIN taken_order t_o ON t_o.id = c_i.order_id
+    WHERE t_o.pizzeria_id IS NOT NULL
+    GROUP BY t_o.pizzeria_id, c_i.item_id;
+    INSERT INTO pizzeria_awaiting_orders (pizzeria_id, nb_awaiting_orders)
+    SELECT t_o.pizzeria_id, count(*)
+    FROM taken_order t_o JOIN awaiting_status a_s ON t_o.status_id = a_s.id
+    WHERE t_o.pizzeria_id IS NOT NULL
+    GROUP BY t_o.pizzeria_id;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Statement level triggers: one aggregated write per statement, from the
+-- transition tables old_rows and new_rows
+CREATE OR REPLACE FUNCTION summarize_contains_item() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP IN ('DELETE', 'UPDATE') THEN
+        UPDATE pizzeria_item_sales s SET nb_sells = s.nb_sells - d.nb_sells
+        FROM (SELECT t_o.pizzeria_id, o.item_id, count(*) AS nb_sells
+              FROM old_rows o JOIN taken_order t_o ON t_o.id = o.order_id
+              GROUP BY t_o.pizzeria_id, o.item_id) d
+        WHERE s.pizzeria_id = d.pizzeria_id AND s.item_id = d.item_id;
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        INSERT INTO pizzeria_item_sales AS s (pizzeria_id, item_id, nb_sells)
+        SELECT t_o.pizzeria_id, n.item_id, count(*)
+        FROM new_rows n JOIN taken_order t_o ON t_o.id = n.order_id
+        WHERE t_o.pizzeria_id IS NOT NULL
+        GROUP BY t_o.pizzeria_id, n.item_id
+        ON CONFLICT (pizzeria_id, item_id)
+        DO UPDATE SET nb_sells = s.nb_sells + EXCLUDED.nb_sells;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION summarize_taken_order() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP IN ('DELETE', 'UPDATE') THEN
+        UPDATE pizzeria_awaiting_orders p
+        SET nb_awaiting_orders = p.nb_awaiting_orders - d.nb
+        FROM (SELECT o.pizzeria_id, count(*) AS nb
+              FROM old_rows o JOIN awaiting_status a_s ON o.status_id = a_s.id
+              GROUP BY o.pizzeria_id) d
+        WHERE p.pizzeria_id = d.pizzeria_id;
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        INSERT INTO pizzeria_awaiting_orders AS p
+            (pizzeria_id, nb_awaiting_orders)
+        SELECT n.pizzeria_id, count(*)
+        FROM new_rows n JOIN awaiting_status a_s ON n.status_id = a_s.id
+        WHERE n.pizzeria_id IS NOT NULL
+        GROUP BY n.pizzeria_id
+        ON CONFLICT (pizzeria_id) DO UPDATE
+        SET nb_awaiting_orders = p.nb_awaiting_orders
+            + EXCLUDED.nb_awaiting_orders;
+    END IF;
+    -- Items of the orders moved to another pizzeria follow them
+    IF TG_OP = 'UPDATE' THEN
+        UPDATE pizzeria_item_sales s SET nb_sells = s.nb_sells - d.nb_sells
+        FROM (SELECT o.pizzeria_id, c_i.item_id, count(*) AS nb_sells
+              FROM old_rows o JOIN new_rows n ON n.id = o.id
+              JOIN contains_item c_i ON c_i.order_id = o.id
+              WHERE o.pizzeria_id IS DISTINCT FROM n.pizzeria_id
+              GROUP BY o.pizzeria_id, c_i.item_id) d
+        WHERE s.pizzeria_id = d.pizzeria_id AND s.item_id = d.item_id;
+        INSERT INTO pizzeria_item_sales AS s (pizzeria_id, item_id, nb_sells)
+        SELECT n.pizzeria_id, c_i.item_id, count(*)
+        FROM old_rows o JOIN new_rows n ON n.id = o.id
+        JOIN contains_item c_i ON c_i.order_id = n.id
+        WHERE o.pizzeria_id IS DISTINCT FROM n.pizzeria_id
+        AND n.pizzeria_id IS NOT NULL
+        GROUP BY n.pizzeria_id, c_i.item_id
+        ON CONFLICT (pizzeria_id, item_id)
+        DO UPDATE SET nb_sells = s.nb_sells + EXCLUDED.nb_sells;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS summarize_contains_item_insert ON contains_item;
+CREATE TRIGGER summarize_contains_item_insert AFTER INSERT ON contains_item
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION summarize_contains_item();
+DROP TRIGGER IF EXISTS summarize_contains_item_update ON contains_item;
+CREATE TRIGGER summarize_contains_item_update AFTER UPDATE ON contains_item
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION summarize_contains_item();
+DROP TRIGGER IF EXISTS summarize_contains_item_delete ON contains_item;
+CREATE TRIGGER summarize_contains_item_delete AFTER DELETE ON contains_item
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION summarize_contains_item();
+DROP TRIGGER IF EXISTS summarize_taken_order_insert ON taken_order;
+CREATE TRIGGER summarize_taken_order_insert AFTER INSERT ON taken_order
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION summarize_taken_order();
+DROP TRIGGER IF EXISTS summarize_taken_order_update ON taken_order;
+CREATE TRIGGER summarize_taken_order_update AFTER UPDATE ON taken_order
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION summarize_taken_order();
+DROP TRIGGER IF EXISTS summarize_taken_order_delete ON taken_order;
+CREATE TRIGGER summarize_taken_order_delete AFTER DELETE ON taken_order
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION summarize_taken_order();
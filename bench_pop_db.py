@@ -0,0 +1,656 @@
+#!/usr/bin/env python3
+'''
+@desc    Benchmarks of the OCP6 database population script (pop_db.py)
+@author  SDQ <sdq@afnor.org>
+@version 1.0.0
+@date    2026-10-16
+'''
+
+from contextlib import closing, contextmanager
+import dataclasses
+import itertools
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, List, Dict, Any, Iterator, Optional, Tuple
+from argparse import ArgumentParser, Namespace
+import psycopg2
+from recipe_feasibility import FeasibilityEngine
+from pop_db import (
+    HASH_BATCH_SIZE, PASSWORD_HASHING_MODES, PasswordHasher, chunked,
+    GenerationContext, FakeMember, FakeAddress, FakeUserAccount,
+    FakeBill, FakeProduct, FakePizzeria, FakeRecipe,
+    FakeCatalogItem, RandomDataGenerator, ColumnarGenerator, TakenOrder,
+    CopyBuffer, row_columns, row_values, SCHEMA_FILE,
+)
+
+
+# Builds one row of each Fake* class relying on Faker
+FAKE_FACTORIES: Dict[str, Callable[[GenerationContext], Any]] = {
+    'FakeMember': lambda ctx: FakeMember(ctx, 1, 1),
+    'FakeAddress': lambda ctx: FakeAddress(ctx),
+    'FakeUserAccount': lambda ctx: FakeUserAccount(ctx, 1),
+    'FakeBill': lambda ctx: FakeBill(ctx, 1),
+    'FakeProduct': lambda ctx: FakeProduct(ctx, 'tomate'),
+    'FakePizzeria': lambda ctx: FakePizzeria(ctx, 'OC Pizza', 1),
+    'FakeRecipe': lambda ctx: FakeRecipe(ctx, 'Lasagne'),
+    'FakeCatalogItem': lambda ctx: FakeCatalogItem(
+        ctx, 'Lasagne', 'recipe', 1
+    ),
+}
+
+
+# Builds the rows of the generators having a columnar version, for a
+# given number of rows and prebuilt ID lists
+COLUMNAR_GENERATORS: Dict[str, Callable[..., Iterator[Any]]] = {
+    'members': lambda gen, ctx, ids, rows: gen.members(
+        ctx, list(ids), list(range(1, 6)), list(range(1, 6)), size=rows
+    ),
+    'taken_orders': lambda gen, ctx, ids, rows: gen.taken_orders(
+        ctx, ids, ids, list(range(1, 6)), list(range(1, 5)), size=rows
+    ),
+    'bills': lambda gen, ctx, ids, rows: gen.bills(ctx, ids, size=rows),
+    'contains_item': lambda gen, ctx, ids, rows: gen.contains_item(
+        ctx, ids, list(range(1, 24)), size=rows
+    ),
+}
+
+
+def rows_per_second(build: Callable[[], Any], rows: int) -> float:
+    '''Throughput of a row builder called rows times'''
+    s: float = time.perf_counter()
+    for i in range(rows):
+        build()
+    return rows / (time.perf_counter() - s)
+
+
+def bench_fakers(rows: int, seed: int) -> List[Dict[str, Any]]:
+    '''Compares, for each Fake* class, the former generation (one
+       Faker('fr_FR') built per row) with a shared GenerationContext'''
+    results: List[Dict[str, Any]] = []
+    ctx: GenerationContext = GenerationContext(seed)
+    for name, factory in FAKE_FACTORIES.items():
+        before: float = rows_per_second(
+            lambda: factory(GenerationContext(seed)), rows
+        )
+        after: float = rows_per_second(lambda: factory(ctx), rows)
+        results.append({'class': name, 'before': before, 'after': after})
+        print(f'{name:<16} {before:>12.1f} {after:>12.1f} '
+              f'{after / before:>8.1f}x')
+    return results
+
+
+def bench_hashing(rows: int, pool_size: int,
+                  rounds: int) -> List[Dict[str, Any]]:
+    '''Throughput of each password hashing mode of FakeUserAccount'''
+    results: List[Dict[str, Any]] = []
+    ctx: GenerationContext = GenerationContext(0)
+    for mode in PASSWORD_HASHING_MODES:
+        hasher: PasswordHasher = PasswordHasher.create(
+            mode, pool_size, rounds
+        )
+        for batch in chunked(range(rows), HASH_BATCH_SIZE):
+            hasher.hash_many([FakeUserAccount.password(ctx) for i in batch],
+                             [FakeUserAccount.salt(ctx) for i in batch])
+        hasher.close()
+        print(hasher.report())
+        results.append({'mode': mode, 'hashes': hasher.count,
+                        'seconds': hasher.elapsed})
+    return results
+
+
+def bench_columnar(rows: int, seed: int) -> List[Dict[str, Any]]:
+    '''Compares, for each generator having a columnar version, the rows
+       per second of RandomDataGenerator and of ColumnarGenerator'''
+    results: List[Dict[str, Any]] = []
+    ids: List[int] = list(range(1, rows + 1))
+    for name, generate in COLUMNAR_GENERATORS.items():
+        speeds: List[float] = []
+        for generator, columnar in ((RandomDataGenerator, False),
+                                    (ColumnarGenerator, True)):
+            ctx: GenerationContext = GenerationContext(seed,
+                                                       columnar=columnar)
+            s: float = time.perf_counter()
+            for row in generate(generator, ctx, ids, rows):
+                pass
+            speeds.append(rows / (time.perf_counter() - s))
+        results.append({'generator': name, 'before': speeds[0],
+                        'after': speeds[1]})
+        print(f'{name:<16} {speeds[0]:>12.1f} {speeds[1]:>12.1f} '
+              f'{speeds[1] / speeds[0]:>8.1f}x')
+    return results
+
+
+def bench_rows(rows: int) -> List[Dict[str, Any]]:
+    '''Compares the memory and the COPY encoding throughput of rows
+       stored as dataclasses with a per-row __dict__ and read column by
+       column (before) with the slotted rows read by row_getter (after)'''
+    # Same fields as TakenOrder, without slots
+    DictTakenOrder: type = dataclasses.make_dataclass('DictTakenOrder', [
+        (f.name, f.type, dataclasses.field(default=f.default))
+        for f in dataclasses.fields(TakenOrder)
+    ])
+    columns: List[str] = row_columns(TakenOrder(1, 1, 1, 1, True))
+
+    def encode(batch: List[Any], by_column: bool) -> str:
+        # Both variants write the same COPY text: only the way the values
+        # are read from the rows differs
+        stream: CopyBuffer = CopyBuffer(batch, columns)
+        if by_column:
+            stream.values_of = lambda row: row_values(row, columns)
+        return ''.join(iter(lambda: stream.read(65536), ''))
+
+    results: List[Dict[str, Any]] = []
+    encodings: List[str] = []
+    for name, row_class, by_column in (('before', DictTakenOrder, True),
+                                       ('after', TakenOrder, False)):
+        tracemalloc.start()
+        s: float = time.perf_counter()
+        batch: List[Any] = [row_class(i, i, i % 4 + 1, i % 5 + 1, i % 2 == 0,
+                                      None, i) for i in range(rows)]
+        built: float = time.perf_counter() - s
+        memory: int = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        s = time.perf_counter()
+        encodings.append(encode(batch, by_column))
+        encoded: float = time.perf_counter() - s
+        del batch
+        results.append({'rows': name, 'bytes': memory,
+                         'build': rows / built, 'encode': rows / encoded})
+        print(f'{name:<8} {memory / 1024 ** 2:>10.1f} '
+              f'{rows / built:>12.1f} {rows / encoded:>12.1f}')
+    assert encodings[0] == encodings[1], 'the variants built different rows'
+    return results
+
+
+# Run parameters which make two feeder benchmarks comparable
+COMPARABLE_PARAMS: List[str] = [
+    'size', 'loader', 'batch_size', 'mode', 'workers', 'pipeline_writers',
+    'streaming', 'columnar',
+]
+
+
+QUERIES_FILE: str = os.path.join(os.path.dirname(SCHEMA_FILE),
+                                 'example_queries.sql')
+
+# Plan keys holding the conditions whose columns may be indexed
+CONDITION_KEYS: List[str] = [
+    'Hash Cond', 'Merge Cond', 'Join Filter', 'Filter', 'Recheck Cond',
+]
+
+
+@contextmanager
+def throwaway_database(admin_db: str) -> Iterator[str]:
+    '''Creates a database with the OCP6.sql schema, dropped on exit. The
+       credentials come from the user, password and host environment
+       variables, like pop_db.py'''
+    name: str = f'ocp6_bench_{os.getpid()}'
+    # Empty values are left to the libpq defaults (PGHOST, ...)
+    credentials: Dict[str, str] = {
+        name: os.environ[name] for name in ('user', 'password', 'host')
+        if os.environ.get(name)
+    }
+    admin: Any = psycopg2.connect(dbname=admin_db, **credentials)
+    admin.autocommit = True
+    with admin.cursor() as cursor:
+        cursor.execute(f'DROP DATABASE IF EXISTS {name};')
+        cursor.execute(f'CREATE DATABASE {name};')
+    try:
+        with psycopg2.connect(dbname=name, **credentials) as connection:
+            with open(SCHEMA_FILE) as f, connection.cursor() as cursor:
+                cursor.execute(f.read())
+        connection.close()
+        yield name
+    finally:
+        with admin.cursor() as cursor:
+            cursor.execute(f'DROP DATABASE IF EXISTS {name};')
+        admin.close()
+
+
+def run_feeder(dbname: str, size: int, options: List[str]) -> Dict[str, Any]:
+    '''Runs pop_db.py in a separate process, so that its peak memory is
+       its own, and returns its run report'''
+    with tempfile.TemporaryDirectory() as directory:
+        report: str = os.path.join(directory, 'report.json')
+        subprocess.run(
+            [sys.executable, os.path.join(os.path.dirname(SCHEMA_FILE),
+                                          'pop_db.py'),
+             '--size', str(size), '--report', report, *options],
+            env={**os.environ, 'dbname': dbname}, check=True,
+            stdout=subprocess.DEVNULL
+        )
+        with open(report) as f:
+            return json.load(f)
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+            text=True, check=True, cwd=os.path.dirname(SCHEMA_FILE)
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def history_entry(report: Dict[str, Any]) -> Dict[str, Any]:
+    '''Line of the benchmark history: throughput and memory of the whole
+       populate() and of each of its stages'''
+    return {
+        'date': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'revision': git_revision(),
+        'params': {k: report['params'][k] for k in COMPARABLE_PARAMS},
+        'seconds': report['seconds'],
+        'max_rss_bytes': report['max_rss_bytes'],
+        'stages': {
+            stage['stage']: {
+                'seconds': stage['seconds'],
+                'rows_written': stage['rows_written'],
+                'rows_per_second': stage['rows_per_second'],
+                'max_rss_bytes': stage['max_rss_bytes'],
+            } for stage in report['stages']
+        },
+    }
+
+
+def regressions(entry: Dict[str, Any], history: List[Dict[str, Any]],
+                threshold: float, runs: int = 5,
+                min_seconds: float = 0.1) -> List[str]:
+    '''Stages of entry whose rows per second fell more than threshold
+       (a ratio) below the median of the last comparable runs. Stages
+       shorter than min_seconds are too noisy to be compared'''
+    previous: List[Dict[str, Any]] = [
+        e for e in history if e['params'] == entry['params']
+    ][-runs:]
+    found: List[str] = []
+    for name, stage in entry['stages'].items():
+        speeds: List[float] = [e['stages'][name]['rows_per_second']
+                               for e in previous if name in e['stages']]
+        if not speeds or stage['seconds'] < min_seconds:
+            continue
+        baseline: float = statistics.median(speeds)
+        if stage['rows_per_second'] < baseline * (1 - threshold):
+            found.append(f'{name}: {stage["rows_per_second"]:.1f} rows/s, '
+                         f'median of the previous runs {baseline:.1f}')
+    return found
+
+
+def bench_feeder(sizes: List[int], history_file: str, threshold: float,
+                 admin_db: str, options: List[str]) -> bool:
+    '''Runs populate() at each size into a throwaway database, appends
+       the results to the history file, and returns False when a stage
+       regressed compared to the history'''
+    history: List[Dict[str, Any]] = []
+    if os.path.exists(history_file):
+        with open(history_file) as f:
+            history = [json.loads(line) for line in f if line.strip()]
+    passed: bool = True
+    for size in sizes:
+        with throwaway_database(admin_db) as dbname:
+            entry: Dict[str, Any] = history_entry(
+                run_feeder(dbname, size, options)
+            )
+        print(f'size {size}: {entry["seconds"]:.2f} sec., '
+              f'{entry["max_rss_bytes"] / 1024 ** 2:.1f} MB')
+        for name, stage in entry['stages'].items():
+            print(f'  {name:<32} {stage["rows_per_second"]:>12.1f} rows/s')
+        for regression in regressions(entry, history, threshold):
+            print(f'  REGRESSION {regression}')
+            passed = False
+        history.append(entry)
+        with open(history_file, 'a') as f:
+            f.write(json.dumps(entry) + '\n')
+    return passed
+
+
+def example_queries(path: str = QUERIES_FILE) -> List[Tuple[str, str]]:
+    '''(title, query) pairs of a SQL file where each query follows its
+       -- comment'''
+    with open(path) as f:
+        content: str = f.read()
+    return [(title.strip(), query.strip()) for title, query in
+            re.findall(r'^--([^\n]*)\n+(.*?;)', content, re.M | re.S)]
+
+
+def connect(dbname: str) -> Any:
+    credentials: Dict[str, str] = {
+        name: os.environ[name] for name in ('user', 'password', 'host')
+        if os.environ.get(name)
+    }
+    return psycopg2.connect(dbname=dbname, **credentials)
+
+
+def plan_nodes(plan: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    yield plan
+    for child in plan.get('Plans', []):
+        yield from plan_nodes(child)
+
+
+def indexed_columns(cursor: Any) -> List[Tuple[str, str]]:
+    '''(table, column) leading an index of the database'''
+    cursor.execute(
+        '''SELECT t.relname, a.attname FROM pg_index i
+        JOIN pg_class t ON t.oid = i.indrelid
+        JOIN pg_attribute a ON a.attrelid = t.oid AND a.attnum = i.indkey[0]
+        WHERE t.relnamespace = current_schema()::regnamespace;'''
+    )
+    return cursor.fetchall()
+
+
+def suggested_indexes(plan: Dict[str, Any],
+                      indexed: List[Tuple[str, str]],
+                      min_rows: int = 1000) -> List[Tuple[str, str]]:
+    '''(table, column) of the join and filter conditions of plan on the
+       tables read by a sequential scan of at least min_rows rows, with
+       no index starting with the column'''
+    nodes: List[Dict[str, Any]] = list(plan_nodes(plan))
+    aliases: Dict[str, str] = {node['Alias']: node['Relation Name']
+                               for node in nodes if 'Relation Name' in node}
+    scanned: List[str] = [
+        node['Relation Name'] for node in nodes
+        if node['Node Type'] == 'Seq Scan'
+        and node['Actual Rows'] * node['Actual Loops'] +
+        node.get('Rows Removed by Filter', 0) >= min_rows
+    ]
+    found: List[Tuple[str, str]] = []
+    for node in nodes:
+        for key in CONDITION_KEYS:
+            for alias, column in re.findall(r'\b(\w+)\.(\w+)\b',
+                                            node.get(key, '')):
+                table: Optional[str] = aliases.get(alias)
+                if table in scanned and (table, column) not in indexed \
+                        and (table, column) not in found:
+                    found.append((table, column))
+    return found
+
+
+def explain(cursor: Any, query: str, runs: int = 3) -> Dict[str, Any]:
+    '''Fastest of runs plans of query, run once beforehand so that it
+       reads a warm cache'''
+    cursor.execute(query)
+    plans: List[Dict[str, Any]] = []
+    for _ in range(runs):
+        cursor.execute(f'EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {query}')
+        plans.append(cursor.fetchone()[0][0])
+    return min(plans, key=lambda plan: plan['Execution Time'])
+
+
+def run_queries(cursor: Any, queries: List[Tuple[str, str]],
+                plans: Optional[str], prefix: str) -> List[Dict[str, Any]]:
+    '''Execution time and buffers of each query, with its plan saved
+       into the plans directory'''
+    results: List[Dict[str, Any]] = []
+    for number, (title, query) in enumerate(queries, 1):
+        plan: Dict[str, Any] = explain(cursor, query)
+        if plans:
+            with open(os.path.join(plans, f'{prefix}-q{number}.json'),
+                      'w') as f:
+                json.dump(plan, f, indent=2)
+        results.append({
+            'title': title, 'plan': plan,
+            'ms': plan['Execution Time'],
+            'hit': plan['Plan'].get('Shared Hit Blocks', 0),
+            'read': plan['Plan'].get('Shared Read Blocks', 0),
+        })
+        print(f'  {title[:56]:<56} {plan["Execution Time"]:>10.2f} ms '
+              f'{results[-1]["hit"]:>8} hit {results[-1]["read"]:>6} read')
+    return results
+
+
+def bench_queries(sizes: List[int], admin_db: str, options: List[str],
+                  create_indexes: bool, plans: Optional[str]) -> None:
+    '''Runs the reports of example_queries.sql under EXPLAIN ANALYZE
+       against a dataset of each size, then suggests indexes for the
+       columns of their joins read by sequential scans. With
+       create_indexes, they are created and the reports run again'''
+    queries: List[Tuple[str, str]] = example_queries()
+    if plans:
+        os.makedirs(plans, exist_ok=True)
+    timings: Dict[str, List[str]] = {title: [] for title, _ in queries}
+    for size in sizes:
+        with throwaway_database(admin_db) as dbname:
+            run_feeder(dbname, size, options)
+            with closing(connect(dbname)) as connection, \
+                    connection.cursor() as cursor:
+                connection.autocommit = True
+                cursor.execute('ANALYZE;')
+                print(f'size {size}')
+                results: List[Dict[str, Any]] = run_queries(
+                    cursor, queries, plans, f'{size}-before'
+                )
+                indexed: List[Tuple[str, str]] = indexed_columns(cursor)
+                suggestions: List[Tuple[str, str]] = []
+                for result in results:
+                    for index in suggested_indexes(result['plan']['Plan'],
+                                                   indexed):
+                        if index not in suggestions:
+                            suggestions.append(index)
+                for table, column in suggestions:
+                    statement: str = f'CREATE INDEX idx_{table}_{column} ' \
+                        f'ON {table} ({column});'
+                    print(f'  SUGGESTED {statement}')
+                    if create_indexes:
+                        cursor.execute(statement)
+                for (title, _), result in zip(queries, results):
+                    timings[title].append(f'{result["ms"]:.2f}')
+                if create_indexes and suggestions:
+                    cursor.execute('ANALYZE;')
+                    print(f'size {size}, with the suggested indexes')
+                    for (title, _), result in zip(
+                            queries, run_queries(cursor, queries, plans,
+                                                 f'{size}-after')):
+                        timings[title][-1] += f' / {result["ms"]:.2f}'
+    print(f'\nms per size ({", ".join(map(str, sizes))})'
+          + (', before / after indexes' if create_indexes else ''))
+    for title, values in timings.items():
+        print(f'  {title[:56]:<56} {"  ".join(values)}')
+
+
+FEASIBILITY_REPORT: str = 'Recettes possibles à préparer par pizzeria'
+
+
+def per_call(call: Callable[[], Any], calls: int) -> float:
+    '''Microseconds per call of call'''
+    s: float = time.perf_counter()
+    for _ in range(calls):
+        call()
+    return (time.perf_counter() - s) / calls * 1e6
+
+
+def bench_feasibility(sizes: List[int], admin_db: str, options: List[str],
+                      calls: int) -> bool:
+    '''Compares the recipes per pizzeria report of example_queries.sql
+       with the answers of FeasibilityEngine, against a dataset of each
+       size, then times the engine queries and stock updates'''
+    query: str = next(query for title, query in example_queries()
+                      if title.strip().startswith(FEASIBILITY_REPORT))
+    passed: bool = True
+    print(f'{"size":>8} {"report ms":>10} {"load ms":>8} '
+          f'{"feasible us":>12} {"portions us":>12} {"update us":>10}')
+    for size in sizes:
+        with throwaway_database(admin_db) as dbname:
+            run_feeder(dbname, size, options)
+            with closing(connect(dbname)) as connection, \
+                    connection.cursor() as cursor:
+                report: float = explain(cursor, query)['Execution Time']
+                cursor.execute(query)
+                expected: List[Tuple[str, str, int]] = sorted(
+                    cursor.fetchall()
+                )
+                s: float = time.perf_counter()
+                engine: FeasibilityEngine = FeasibilityEngine.load(cursor)
+                load: float = (time.perf_counter() - s) * 1000
+                cursor.execute('''SELECT id, name FROM pizzeria;''')
+                pizzerias: Dict[int, str] = dict(cursor.fetchall())
+                cursor.execute('''SELECT id, name FROM recipe;''')
+                recipes: Dict[int, str] = dict(cursor.fetchall())
+                found: List[Tuple[str, str, int]] = sorted(
+                    (pizzerias[pizzeria_id], recipes[recipe_id],
+                     engine.portions(pizzeria_id, recipe_id))
+                    for pizzeria_id in pizzerias
+                    for recipe_id in engine.feasible(pizzeria_id)
+                )
+                if found != expected:
+                    print(f'  MISMATCH {len(found)} recipes found by the '
+                          f'engine, {len(expected)} by the report')
+                    passed = False
+                cursor.execute(
+                    '''SELECT pizzeria_id, product_id, quantity
+                    FROM has_product_in_stock;'''
+                )
+                stocks: List[Tuple[int, int, int]] = cursor.fetchall()
+                pizzeria_id: int = min(pizzerias)
+                recipe_id: int = next(iter(engine.requirements))
+                updates: Iterator[Tuple[int, int, int]] = itertools.cycle(
+                    [(p, product, 0) for p, product, _ in stocks] + stocks
+                )
+                timings: List[float] = [
+                    per_call(lambda: engine.feasible(pizzeria_id), calls),
+                    per_call(lambda: engine.portions(pizzeria_id, recipe_id),
+                             calls),
+                    per_call(lambda: engine.set_stock(*next(updates)),
+                             2 * len(stocks)),
+                ]
+                print(f'{size:>8} {report:>10.2f} {load:>8.2f} '
+                      + ' '.join(f'{t:>12.2f}' for t in timings[:2])
+                      + f' {timings[2]:>10.2f}')
+    return passed
+
+
+def main() -> None:
+    arg_parser: ArgumentParser = ArgumentParser(
+        description='Benchmarks of the OCP6 population script'
+    )
+    subparsers: Any = arg_parser.add_subparsers(dest='bench')
+    fakers_parser: ArgumentParser = subparsers.add_parser(
+        'fakers', help='Rows per second of each Fake* class, with one '
+        'Faker per row (before) and a shared GenerationContext (after)'
+    )
+    fakers_parser.add_argument('-r', '--rows', type=int, default=200,
+                               help='Number of rows built per measure')
+    fakers_parser.add_argument('--seed', type=int, default=0,
+                               help='Seed of the generation contexts')
+    hashing_parser: ArgumentParser = subparsers.add_parser(
+        'hashing', help='Throughput of each password hashing mode'
+    )
+    hashing_parser.add_argument('-r', '--rows', type=int, default=1000,
+                                help='Number of passwords hashed per mode')
+    hashing_parser.add_argument('--password-pool-size', type=int,
+                                default=100,
+                                help='Number of distinct hashes of the '
+                                'pool mode')
+    hashing_parser.add_argument('--password-rounds', type=int, default=1000,
+                                help='pbkdf2 rounds of the low-rounds mode')
+    columnar_parser: ArgumentParser = subparsers.add_parser(
+        'columnar', help='Rows per second of the generators, with '
+        'RandomDataGenerator (before) and ColumnarGenerator (after)'
+    )
+    columnar_parser.add_argument('-r', '--rows', type=int, default=100000,
+                                 help='Number of rows generated per measure')
+    columnar_parser.add_argument('--seed', type=int, default=0,
+                                 help='Seed of the generation contexts')
+    rows_parser: ArgumentParser = subparsers.add_parser(
+        'rows', help='Memory and COPY encoding throughput of TakenOrder '
+        'rows with a __dict__ (before) and slotted (after)'
+    )
+    rows_parser.add_argument('-r', '--rows', type=int, default=1000000,
+                             help='Number of rows held in memory')
+    feeder_parser: ArgumentParser = subparsers.add_parser(
+        'feeder', help='Stages of populate() at several sizes, against a '
+        'throwaway PostgreSQL database, compared to a history file'
+    )
+    feeder_parser.add_argument('--sizes', type=int, nargs='+',
+                               default=[10, 250, 10000, 100000],
+                               help='Sizes of the benchmarked datasets')
+    feeder_parser.add_argument('--history', default='bench_history.jsonl',
+                               help='JSON lines file of the previous results, '
+                               'appended with the new ones')
+    feeder_parser.add_argument('--threshold', type=float, default=0.2,
+                               help='Fail when the rows per second of a '
+                               'stage fall by more than this ratio')
+    feeder_parser.add_argument('--admin-db', default='postgres',
+                               help='Database connected to for creating '
+                               'and dropping the throwaway databases')
+    feeder_parser.add_argument('-l', '--loader', default='insert',
+                               help='Loader of pop_db.py')
+    feeder_parser.add_argument('-b', '--batch-size', type=int, default=500,
+                               help='Batch size of pop_db.py')
+    feeder_parser.add_argument('--password-hashing', default='pool',
+                               choices=PASSWORD_HASHING_MODES,
+                               help='Password hashing mode of pop_db.py')
+    queries_parser: ArgumentParser = subparsers.add_parser(
+        'queries', help='EXPLAIN ANALYZE of the reports of '
+        'example_queries.sql against datasets of several sizes, with '
+        'index suggestions'
+    )
+    queries_parser.add_argument('--sizes', type=int, nargs='+',
+                                default=[1000, 10000, 100000],
+                                help='Sizes of the queried datasets')
+    queries_parser.add_argument('--admin-db', default='postgres',
+                                help='Database connected to for creating '
+                                'and dropping the throwaway databases')
+    queries_parser.add_argument('-l', '--loader', default='copy',
+                                help='Loader of pop_db.py')
+    queries_parser.add_argument('--create-indexes', action='store_true',
+                                help='Create the suggested indexes, then '
+                                'run the reports again')
+    queries_parser.add_argument('--plans', default=None,
+                                help='Directory saving the JSON plans, '
+                                'SIZE-before|after-qN.json')
+    feasibility_parser: ArgumentParser = subparsers.add_parser(
+        'feasibility', help='Recipes per pizzeria report of '
+        'example_queries.sql against FeasibilityEngine (recipe_feasibility.py)'
+    )
+    feasibility_parser.add_argument('--sizes', type=int, nargs='+',
+                                    default=[1000, 100000],
+                                    help='Sizes of the queried datasets')
+    feasibility_parser.add_argument('--admin-db', default='postgres',
+                                    help='Database connected to for '
+                                    'creating and dropping the throwaway '
+                                    'databases')
+    feasibility_parser.add_argument('-r', '--calls', type=int,
+                                    default=100000,
+                                    help='Number of calls per engine query')
+    args: Namespace = arg_parser.parse_args()
+    if args.bench == 'fakers':
+        print(f'{"rows/s":<16} {"before":>12} {"after":>12} {"speedup":>9}')
+        bench_fakers(args.rows, args.seed)
+    elif args.bench == 'hashing':
+        bench_hashing(args.rows, args.password_pool_size,
+                      args.password_rounds)
+    elif args.bench == 'columnar':
+        print(f'{"rows/s":<16} {"before":>12} {"after":>12} {"speedup":>9}')
+        bench_columnar(args.rows, args.seed)
+    elif args.bench == 'rows':
+        print(f'{"":<8} {"MB":>10} {"built/s":>12} {"encoded/s":>12}')
+        bench_rows(args.rows)
+    elif args.bench == 'feeder':
+        if not bench_feeder(args.sizes, args.history, args.threshold,
+                            args.admin_db,
+                            ['--seed', '0', '--loader', args.loader,
+                             '--batch-size', str(args.batch_size),
+                             '--password-hashing', args.password_hashing]):
+            sys.exit(1)
+    elif args.bench == 'queries':
+        bench_queries(args.sizes, args.admin_db,
+                      ['--seed', '0', '--loader', args.loader,
+                       '--password-hashing', 'pool', '--summary'],
+                      args.create_indexes, args.plans)
+    elif args.bench == 'feasibility':
+        if not bench_feasibility(args.sizes, args.admin_db,
+                                 ['--seed', '0', '--loader', 'copy',
+                                  '--password-hashing', 'pool'],
+                                 args.calls):
+            sys.exit(1)
+    else:
+        arg_parser.print_help()
+
+
+if __name__ == '__main__':
+    main()
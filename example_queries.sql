@@ -11,8 +11,6 @@ GROUP BY pizzeria_name, item_name ORDER BY pizzeria_name, nb_sells DESC;
 
 SELECT piz.name pizzeria_name, count(*) nb_awaiting_orders
 FROM pizzeria piz JOIN taken_order t_o ON piz.id = t_o.pizzeria_id
-JOIN contains_item c_i ON t_o.id = c_i.order_id
-JOIN catalog_item item ON c_i.item_id = item.id
 JOIN order_status o_s ON t_o.status_id = o_s.id
 WHERE o_s.label IN ('En cours', 'En attente')
 GROUP BY pizzeria_name ORDER BY nb_awaiting_orders DESC;
@@ -29,10 +27,27 @@ ORDER BY pizzeria_name, employee_name, employee_firstname;
 
 -- Recettes possibles à préparer par pizzeria (stock disponible)
 
-SELECT piz.name pizzeria_name, recipe.name recipe_name
-FROM pizzeria piz JOIN has_product_in_stock has_pro ON piz.id = has_pro.pizzeria_id
-JOIN product pro ON has_pro.product_id = pro.id
-JOIN requires_product req_pro ON pro.id = req_pro.product_id
-JOIN recipe ON req_pro.recipe_id = recipe.id
-WHERE req_pro.gram_amount <= pro.gram_weight
-GROUP BY pizzeria_name, recipe_name;
+SELECT piz.name pizzeria_name, recipe.name recipe_name,
+min(coalesce(has_pro.quantity, 0) * pro.gram_weight / nullif(req_pro.gram_amount, 0)) nb_portions
+FROM pizzeria piz CROSS JOIN recipe
+JOIN requires_product req_pro ON recipe.id = req_pro.recipe_id
+JOIN product pro ON req_pro.product_id = pro.id
+LEFT JOIN has_product_in_stock has_pro ON has_pro.pizzeria_id = piz.id AND has_pro.product_id = pro.id
+GROUP BY piz.id, recipe.id
+HAVING bool_and(req_pro.gram_amount <= coalesce(has_pro.quantity, 0) * pro.gram_weight)
+ORDER BY pizzeria_name, recipe_name;
+
+-- Classement des ventes par pizzeria (tables de synthèse, OCP6_summary.sql)
+
+SELECT piz.name pizzeria_name, item.name item_name, sales.nb_sells
+FROM pizzeria_item_sales sales JOIN pizzeria piz ON piz.id = sales.pizzeria_id
+JOIN catalog_item item ON sales.item_id = item.id
+WHERE sales.nb_sells > 0
+ORDER BY pizzeria_name, nb_sells DESC;
+
+-- Nombre de commandes non finalisées par pizzeria (tables de synthèse, OCP6_summary.sql)
+
+SELECT piz.name pizzeria_name, awaiting.nb_awaiting_orders
+FROM pizzeria_awaiting_orders awaiting JOIN pizzeria piz ON piz.id = awaiting.pizzeria_id
+WHERE awaiting.nb_awaiting_orders > 0
+ORDER BY nb_awaiting_orders DESC;
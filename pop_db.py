@@ -9,21 +9,369 @@
                               between orders and pizzerias
 '''
 
-from dataclasses import dataclass
+from concurrent.futures import (
+    ProcessPoolExecutor, ThreadPoolExecutor, Future, wait, FIRST_COMPLETED
+)
+import cProfile
+from dataclasses import dataclass, fields
+import bisect
+import datetime
+import gzip
+import hashlib
+import io
+import itertools
+import json
+import math
+import operator
 import os
+import pstats
+import queue
 import random
 import re
+import shutil
+import sqlite3
+import threading
 import time
 import string
-from typing import Callable, List, Dict, Optional, Any, Iterator
+import sys
+import urllib.parse
+from typing import (
+    Callable, List, Dict, Optional, Any, Iterator, Iterable, Tuple, IO,
+    Sequence, Set
+)
 from argparse import ArgumentParser, Namespace
 from passlib.hash import pbkdf2_sha256
 from faker import Faker
+import psycopg2
 import records
-import sqlalchemy
+from sqlalchemy.exc import DBAPIError
+try:
+    import zstandard
+except ImportError:  # optional, for .zst output files only
+    zstandard = None
+try:
+    import numpy
+except ImportError:  # optional, for the columnar generation only
+    numpy = None
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+
+HASH_BATCH_SIZE: int = 256
+# Rows per batch of the columnar generation
+COLUMN_BATCH_SIZE: int = 4096
+# Generated rows are slotted dataclasses (no per-row __dict__) where
+# dataclasses support it
+ROW_OPTIONS: Dict[str, Any] = \
+    {'slots': True} if sys.version_info >= (3, 10) else {}
+SCHEMA_FILE: str = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), 'OCP6.sql'
+)
+# Translation of OCP6.sql for the embedded SQLite databases
+SQLITE_SCHEMA_FILE: str = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), 'OCP6_sqlite.sql'
+)
+# Summary tables of the dashboard reports and the triggers keeping them
+SUMMARY_SCHEMA_FILE: str = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), 'OCP6_summary.sql'
+)
+SUMMARY_TRIGGERS: Dict[str, List[str]] = {
+    table: [f'summarize_{table}_{op}' for op in ('insert', 'update', 'delete')]
+    for table in ('contains_item', 'taken_order')
+}
+# Bumped whenever the generation changes, to invalidate cached datasets
+CACHE_VERSION: int = 4
+# Bills are emitted within a fixed period rather than relative to the
+# current date, so that a seed always gives the same dates
+BILL_PERIOD: Tuple[datetime.datetime, datetime.datetime] = (
+    datetime.datetime(2020, 1, 1), datetime.datetime(2026, 1, 1)
+)
+
+
+def max_rss() -> Optional[int]:
+    '''Peak resident memory of the process so far, in bytes'''
+    if resource is None:
+        return None
+    peak: int = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def chunked(iterable: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    '''Splits an iterable into lists of at most size elements'''
+    iterator: Iterator[Any] = iter(iterable)
+    while True:
+        chunk: List[Any] = list(itertools.islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+class IdRanges(Sequence[int]):
+    '''Compact sequence of IDs, stored as ranges of consecutive IDs: the
+       blocks reserved from a table sequence take three integers whatever
+       their size, instead of one Python int per row'''
+    def __init__(self, ids: Iterable[int] = ()) -> None:
+        self.starts: List[int] = []
+        self.stops: List[int] = []
+        self.offsets: List[int] = []  # index of the first ID of each range
+        self.size: int = 0
+        self.extend(ids)
+
+    def extend(self, ids: Iterable[int]) -> None:
+        for row_id in ids:
+            if self.stops and row_id == self.stops[-1]:
+                self.stops[-1] += 1
+            else:
+                self.starts.append(row_id)
+                self.stops.append(row_id + 1)
+                self.offsets.append(self.size)
+            self.size += 1
+
+    def clear(self) -> None:
+        self.starts.clear()
+        self.stops.clear()
+        self.offsets.clear()
+        self.size = 0
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __getitem__(self, index: int) -> int:
+        if index < 0:
+            index += self.size
+        if not 0 <= index < self.size:
+            raise IndexError('IdRanges index out of range')
+        r: int = bisect.bisect_right(self.offsets, index) - 1
+        return self.starts[r] + index - self.offsets[r]
+
+    def __iter__(self) -> Iterator[int]:
+        for start, stop in zip(self.starts, self.stops):
+            yield from range(start, stop)
+
+    def __repr__(self) -> str:
+        return f'IdRanges({len(self)} ids in {len(self.starts)} ranges)'
+
+
+class Permutation(Sequence[int]):
+    '''Pseudo-random permutation of range(size) computed on the fly,
+       i -> (a * i + b) % size with a coprime to size. Far less random
+       than a shuffle, but takes constant memory'''
+    def __init__(self, size: int, rng: random.Random) -> None:
+        self.size = size
+        self.a: int = 1
+        self.b: int = 0
+        if size > 1:
+            self.a = rng.randrange(1, size)
+            while math.gcd(self.a, size) != 1:
+                self.a = rng.randrange(1, size)
+            self.b = rng.randrange(size)
 
+    def __len__(self) -> int:
+        return self.size
 
-@dataclass
+    def __getitem__(self, index: int) -> int:
+        if not 0 <= index < self.size:
+            raise IndexError('Permutation index out of range')
+        return (self.a * index + self.b) % self.size
+
+    def __iter__(self) -> Iterator[int]:
+        for index in range(self.size):
+            yield (self.a * index + self.b) % self.size
+
+
+class PermutedIds(Sequence[int]):
+    '''Shuffled view of an ID sequence, without copying it'''
+    def __init__(self, ids: Sequence[int], rng: random.Random) -> None:
+        self.ids = ids
+        self.permutation: Permutation = Permutation(len(ids), rng)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __getitem__(self, index: int) -> int:
+        return self.ids[self.permutation[index]]
+
+    def __iter__(self) -> Iterator[int]:
+        for index in self.permutation:
+            yield self.ids[index]
+
+
+def hash_password(password: str, salt: Optional[bytes] = None,
+                  handler: Any = pbkdf2_sha256) -> str:
+    '''pbkdf2_sha256 hash of the password, salted with salt (a random
+       salt if None): a salt drawn from a seeded generator keeps the hash
+       reproducible'''
+    if salt is not None:
+        handler = handler.using(salt=salt)
+    return handler.hash(password)
+
+
+class PasswordHasher:
+    '''Base class of the password hashing strategies of FakeUserAccount.
+       Keeps track of the hashed passwords and of the time spent, to
+       report the throughput of the strategy'''
+    mode: str = ''
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.elapsed = 0.0
+        # Stages running concurrently share the hasher
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def create(mode: str, pool_size: int = 100, rounds: int = 1000,
+               parallel: bool = True) -> 'PasswordHasher':
+        if mode == 'real':
+            return RealPasswordHasher(parallel)
+        elif mode == 'pool':
+            return PoolPasswordHasher(pool_size)
+        elif mode == 'low-rounds':
+            return LowRoundsPasswordHasher(rounds)
+        raise ValueError(f'Unknown password hashing mode "{mode}"')
+
+    def hash_many(self, passwords: List[str],
+                  salts: Optional[List[bytes]] = None) -> List[str]:
+        '''Hashes of the passwords, salted with salts when given'''
+        s: float = time.perf_counter()
+        hashes: List[str] = self._hash_many(
+            passwords, salts or [None] * len(passwords)
+        )
+        self.record(len(passwords), time.perf_counter() - s)
+        return hashes
+
+    def record(self, count: int, elapsed: float) -> None:
+        '''Counts hashes computed here, or by the hasher of a worker'''
+        with self.lock:
+            self.count += count
+            self.elapsed += elapsed
+
+    def _hash_many(self, passwords: List[str],
+                   salts: List[Optional[bytes]]) -> List[str]:
+        raise NotImplementedError
+
+    def report(self) -> str:
+        throughput: float = self.count / self.elapsed if self.elapsed else 0
+        return (f'PASSWORD HASHING ({self.mode}): {self.count} hashes, '
+                f'{throughput:.1f} hashes/sec.')
+
+    def close(self) -> None:
+        pass
+
+
+class RealPasswordHasher(PasswordHasher):
+    '''pbkdf2_sha256 hashes with passlib default rounds, computed by a
+       pool of processes (one per core) for batches of passwords, unless
+       parallel is False (generation shards are already one process each)'''
+    mode = 'real'
+
+    def __init__(self, parallel: bool = True) -> None:
+        super().__init__()
+        self.parallel = parallel
+        self.executor: Optional[ProcessPoolExecutor] = None
+
+    def _hash_many(self, passwords: List[str],
+                   salts: List[Optional[bytes]]) -> List[str]:
+        if not self.parallel or len(passwords) == 1:
+            return list(map(hash_password, passwords, salts))
+        with self.lock:
+            if self.executor is None:
+                self.executor = ProcessPoolExecutor()
+        return list(self.executor.map(
+            hash_password, passwords, salts,
+            chunksize=max(1, len(passwords) // (os.cpu_count() or 1))
+        ))
+
+    def close(self) -> None:
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+
+
+class PoolPasswordHasher(PasswordHasher):
+    '''Hashes the first pool_size passwords with passlib default rounds,
+       then reuses these valid hashes for the following accounts'''
+    mode = 'pool'
+
+    def __init__(self, pool_size: int = 100) -> None:
+        super().__init__()
+        self.pool_size = max(1, pool_size)
+        self.pool: List[str] = []
+        self.served = 0
+
+    def _hash_many(self, passwords: List[str],
+                   salts: List[Optional[bytes]]) -> List[str]:
+        with self.lock:
+            missing: int = self.pool_size - len(self.pool)
+            self.pool += list(map(hash_password, passwords[:missing],
+                                  salts[:missing]))
+            served: int = self.served
+            self.served += len(passwords)
+        return [self.pool[(served + i) % len(self.pool)]
+                for i in range(len(passwords))]
+
+
+class LowRoundsPasswordHasher(PasswordHasher):
+    '''Valid pbkdf2_sha256 hashes computed with a small number of rounds'''
+    mode = 'low-rounds'
+
+    def __init__(self, rounds: int = 1000) -> None:
+        super().__init__()
+        self.handler: Any = pbkdf2_sha256.using(rounds=rounds)
+
+    def _hash_many(self, passwords: List[str],
+                   salts: List[Optional[bytes]]) -> List[str]:
+        return [hash_password(p, salt, self.handler)
+                for p, salt in zip(passwords, salts)]
+
+
+PASSWORD_HASHING_MODES: List[str] = ['real', 'pool', 'low-rounds']
+
+
+class GenerationContext:
+    '''Owns the Faker instance and the random generator shared by every
+       Fake* object of a worker. A seed makes the generated data
+       reproducible. In streaming mode, ID lists are shuffled and sampled
+       through constant memory permutations instead of being copied. The
+       columnar mode adds a NumPy generator, for ColumnarGenerator'''
+    def __init__(self, seed: Optional[int] = None, locale: str = 'fr_FR',
+                 hasher: Optional[PasswordHasher] = None,
+                 streaming: bool = False, columnar: bool = False) -> None:
+        self.seed = seed
+        self.streaming = streaming
+        self.columnar = columnar
+        self.np_random: Optional[Any] = None
+        if columnar:
+            if numpy is None:
+                raise ImportError('numpy is required for the columnar '
+                                  'generation')
+            self.np_random = numpy.random.default_rng(seed)
+        self.fake: Faker = Faker(locale)
+        self.random: random.Random = random.Random(seed)
+        if seed is not None:
+            self.fake.seed_instance(seed)
+        self.hasher: PasswordHasher = hasher or RealPasswordHasher()
+
+    def shuffled(self, ids: Sequence[Any]) -> Sequence[Any]:
+        '''ids in random order: a shuffled copy for lists, a permuted
+           view otherwise (or in streaming mode). ids is left untouched,
+           as concurrent stages read the same lists'''
+        if isinstance(ids, list) and not self.streaming:
+            ids = list(ids)
+            self.random.shuffle(ids)
+            return ids
+        return PermutedIds(ids, self.random)
+
+    def sample_indexes(self, space: int, size: int) -> Iterable[int]:
+        '''size distinct indexes drawn from range(space)'''
+        size = min(size, space)
+        if self.streaming:
+            return itertools.islice(Permutation(space, self.random), size)
+        return self.random.sample(range(space), size)
+
+
+@dataclass(**ROW_OPTIONS)
 class Member:
     '''Class representing tuples for the Member table'''
     name: str
@@ -31,34 +379,44 @@ class Member:
     works_at_pizzeria_id: Optional[int]  # REFERENCES Pizzeria
     user_account_id: Optional[int]  # REFERENCES UserAccount
     address_id: int  # REFERENCES Address
+    role_id: Optional[int] = None  # REFERENCES Role
+    id: Optional[int] = None  # PRIMARY KEY
 
 
 class FakeMember(Member):
     '''Class for fake Member generation, by populating
        the table Member for test)'''
-    def __init__(self, pizzeria_id: int, address_id: int) -> None:
-        fake: Faker = Faker('fr_FR')
+    __slots__ = ()
+
+    def __init__(self, ctx: GenerationContext, pizzeria_id: int,
+                 address_id: int, role_id: Optional[int] = None) -> None:
+        fake: Faker = ctx.fake
         self.name = fake.last_name()
         self.firstname = fake.first_name()
         self.works_at_pizzeria_id = pizzeria_id
         self.address_id = address_id
         self.user_account_id = None
+        self.role_id = role_id
+        self.id = None
 
 
-@dataclass
+@dataclass(**ROW_OPTIONS)
 class Address:
     '''Class representing tuples for the Address table'''
     street_name: str
     home_number: str
     zip_code: str
     country: Optional[str] = 'France'
+    id: Optional[int] = None  # PRIMARY KEY
 
 
 class FakeAddress(Address):
     '''Class for fake Address generation, by populating
        the table Address for test)'''
-    def __init__(self) -> None:
-        fake: Faker = Faker('fr_FR')
+    __slots__ = ()
+
+    def __init__(self, ctx: GenerationContext) -> None:
+        fake: Faker = ctx.fake
         street: str = fake.address().split('\n')[0]
         m: Optional[Any] = re.match(r'^(\d+),?(.*)$', street)
         if m and len(m.groups()) == 2:
@@ -71,33 +429,50 @@ class FakeAddress(Address):
         self.home_number = home_number
         self.zip_code = fake.postcode().replace(' ', '')
         self.country = 'France'
+        self.id = None
 
 
-@dataclass
+@dataclass(**ROW_OPTIONS)
 class UserAccount:
     '''Class representing tuples for the UserAccount table'''
     email: str
     phone_nb: str
     member_id: int  # REFERENCES Member
     hashed_pwd: str
+    id: Optional[int] = None  # PRIMARY KEY
 
 
 class FakeUserAccount(UserAccount):
     '''Class for fake UserAccount generation, by populating
        the table UserAccount for test)'''
-    def __init__(self, member_id: int) -> None:
-        fake: Faker = Faker('fr_FR')
+    __slots__ = ()
+
+    def __init__(self, ctx: GenerationContext, member_id: int,
+                 hashed_pwd: Optional[str] = None) -> None:
+        fake: Faker = ctx.fake
         self.email = fake.email()
         self.phone_nb = re.sub(r'^\+33|\D', '', fake.phone_number())
         if len(self.phone_nb) < 10:
             self.phone_nb = '0' + self.phone_nb
         self.member_id = member_id
-        self.hashed_pwd = pbkdf2_sha256.hash(
-            ''.join(random.sample(string.printable, 15))
-        )
+        if hashed_pwd is None:
+            hashed_pwd = ctx.hasher.hash_many([self.password(ctx)],
+                                              [self.salt(ctx)])[0]
+        self.hashed_pwd = hashed_pwd
+        self.id = None
 
+    @staticmethod
+    def password(ctx: GenerationContext) -> str:
+        return ''.join(ctx.random.sample(string.printable, 15))
 
-@dataclass
+    @staticmethod
+    def salt(ctx: GenerationContext) -> bytes:
+        '''16 bytes salt (the passlib default size) drawn from the
+           generator of the context, so that a seed gives the same hashes'''
+        return ctx.random.getrandbits(128).to_bytes(16, 'big')
+
+
+@dataclass(**ROW_OPTIONS)
 class TakenOrder:
     '''Class representing tuples for the TakenOrder table'''
     member_id: int  # REFERENCES Member
@@ -106,102 +481,124 @@ class TakenOrder:
     pizzeria_id: int  # REFERENCES Pizzeria
     is_paid: bool
     bill_id: Optional[int] = None  # REFERENCES Bill
+    id: Optional[int] = None  # PRIMARY KEY
 
 
 class FakeTakenOrder(TakenOrder):
     '''Class for fake TakenOrder generation, by populating
        the table TakenOrder for test)'''
-    def __init__(self, member_id: int, address_id: int, pizzeria_id: int,
+    __slots__ = ()
+
+    def __init__(self, ctx: GenerationContext, member_id: int,
+                 address_id: int, pizzeria_id: int,
                  order_status_ids: List[int]) -> None:
         self.member_id = member_id
         self.address_id = address_id
         self.pizzeria_id = pizzeria_id
-        self.status_id = random.choice(order_status_ids)
-        self.is_paid = random.choice((True, False))
+        self.status_id = ctx.random.choice(order_status_ids)
+        self.is_paid = ctx.random.choice((True, False))
         self.bill_id = None
+        self.id = None
 
 
-@dataclass
+@dataclass(**ROW_OPTIONS)
 class Bill:
     '''Class representing tuples for the Bill table'''
     emission_date: str
     total_amout_ati: float
     order_id: int  # REFERENCES TakenOrder
+    id: Optional[int] = None  # PRIMARY KEY
 
 
 class FakeBill(Bill):
     '''Class for fake Bill generation, by populating
        the table Bill for test)'''
-    def __init__(self, order_id: int) -> None:
-        fake: Faker = Faker('fr_FR')
-        self.emission_date = fake.date_time_this_decade()
+    __slots__ = ()
+
+    def __init__(self, ctx: GenerationContext, order_id: int) -> None:
+        fake: Faker = ctx.fake
+        self.emission_date = fake.date_time_between(*BILL_PERIOD)
         self.total_amout_ati = fake.pyfloat(
             positive=True, left_digits=2, right_digits=2
         )
         self.order_id = order_id
+        self.id = None
 
 
-@dataclass
+@dataclass(**ROW_OPTIONS)
 class Product:
     '''Class representing tuples for the Product table'''
     name: str
     barcode: str
     gram_weight: int
     unit_price_ati: int
+    id: Optional[int] = None  # PRIMARY KEY
 
 
 class FakeProduct(Product):
     '''Class for fake Product generation, by populating
        the table Product for test)'''
-    def __init__(self, name: str) -> None:
-        fake: Faker = Faker('fr_FR')
+    __slots__ = ()
+
+    def __init__(self, ctx: GenerationContext, name: str) -> None:
+        fake: Faker = ctx.fake
         self.name = name
         self.barcode = fake.ean13()
-        self.gram_weight = random.randint(20, 2000) * 5
+        self.gram_weight = ctx.random.randint(20, 2000) * 5
         self.unit_price_ati = fake.pyfloat(
             positive=True, left_digits=2, right_digits=2
         )
+        self.id = None
 
 
-@dataclass
+@dataclass(**ROW_OPTIONS)
 class Pizzeria:
     '''Class representing tuples for the Pizzeria table'''
     name: str
     phone_nb: str
     address_id: Optional[int]
+    id: Optional[int] = None  # PRIMARY KEY
 
 
 class FakePizzeria(Pizzeria):
     '''Class for fake Pizzeria generation, by populating
        the table Pizzeria for test)'''
-    def __init__(self, name: str, address_id: int) -> None:
-        fake: Faker = Faker('fr_FR')
+    __slots__ = ()
+
+    def __init__(self, ctx: GenerationContext, name: str,
+                 address_id: int) -> None:
+        fake: Faker = ctx.fake
         self.name = name
         self.phone_nb = re.sub(r'\+33|\D', '', fake.phone_number())
         if len(self.phone_nb) < 10:
             self.phone_nb = '0' + self.phone_nb
         self.address_id = address_id
+        self.id = None
 
 
-@dataclass
+@dataclass(**ROW_OPTIONS)
 class Recipe:
     '''Class representing tuples for the Recipe table'''
     name: str
     description: str
     is_public: bool = False
+    id: Optional[int] = None  # PRIMARY KEY
 
 
 class FakeRecipe(Recipe):
     '''Class for fake Recipe generation, by populating
        the table Recipe for test)'''
-    def __init__(self, name: str) -> None:
-        fake: Faker = Faker('fr_FR')
+    __slots__ = ()
+
+    def __init__(self, ctx: GenerationContext, name: str) -> None:
+        fake: Faker = ctx.fake
         self.name = name
         self.description = fake.paragraphs()
-        self.is_public = random.choice((True, False))
+        self.is_public = ctx.random.choice((True, False))
+        self.id = None
 
 
-@dataclass
+@dataclass(**ROW_OPTIONS)
 class CatalogItem:
     '''Class representing tuples for the CatalogItem table'''
     name: str
@@ -212,21 +609,25 @@ class CatalogItem:
     is_displayed: bool
     recipe_id: Optional[int] = None
     product_id: Optional[int] = None
+    id: Optional[int] = None  # PRIMARY KEY
 
 
 class FakeCatalogItem(CatalogItem):
     '''Class for fake CatalogItem generation, by populating
        the table CatalogItem for test)'''
-    def __init__(self, name: str, parent: str, parent_id: int) -> None:
-        fake: Faker = Faker('fr_FR')
+    __slots__ = ()
+
+    def __init__(self, ctx: GenerationContext, name: str, parent: str,
+                 parent_id: int) -> None:
+        fake: Faker = ctx.fake
         self.name = name
         self.description = fake.sentences()
         self.picture_file = fake.file_name(extension='jpg')
         self.unit_price_ati = fake.pyfloat(
             positive=True, left_digits=2, right_digits=2
         )
-        self.is_available = random.choice((True, False))
-        self.is_displayed = random.choice((True, False))
+        self.is_available = ctx.random.choice((True, False))
+        self.is_displayed = ctx.random.choice((True, False))
         if parent == 'recipe':
             self.recipe_id = parent_id
             self.product_id = None
@@ -235,106 +636,125 @@ class FakeCatalogItem(CatalogItem):
             self.recipe_id = None
         else:
             raise AttributeError(f'Unknown parent "{parent}"')
+        self.id = None
 
 
-@dataclass
+@dataclass(**ROW_OPTIONS)
 class Role:
     '''Class representing tuples for the Role table'''
     name: str
+    id: Optional[int] = None  # PRIMARY KEY
 
 
-@dataclass
+@dataclass(**ROW_OPTIONS)
 class Permission:
     '''Class representing tuples for the Permission table'''
     label: str
+    id: Optional[int] = None  # PRIMARY KEY
 
 
-@dataclass
+@dataclass(**ROW_OPTIONS)
 class OrderStatus:
     '''Class representing tuples for the OrderStatus table'''
     label: str
+    id: Optional[int] = None  # PRIMARY KEY
 
 
-@dataclass
+@dataclass(**ROW_OPTIONS)
 class Keyword:
     '''Class representing tuples for the Keyword table'''
     name: str
+    id: Optional[int] = None  # PRIMARY KEY
 
 
 class RandomDataGenerator:
     '''Static class for random data generation. Holds a bunch of
        rendering methods iterators containing Fake* objects'''
+    product_names: List[str] = [
+        'farine de blé', 'tomate pelée', 'pulpe de tomate',
+        'mozzarella', 'ananas', 'parmesan', 'viande hachée de boeuf',
+        'saumon', 'fromage de chèvre', 'artichaut', 'poivron',
+        'thon', 'oignon', 'ail', 'pâte', 'oeuf', 'mélange fruits de mer',
+        'jambon', 'jambon sec', 'chorizo', 'truffe', 'petit pois',
+        'viande de boeuf', 'moule', 'palourde', 'coque',
+        "farine d'épeautre", 'langoustine', 'écrevisse', 'crevette rose',
+        'crevette grise', 'olive', 'roquette', 'basilic', 'champignon',
+    ]
+
     @staticmethod
-    def addresses(size: int = 10) -> Iterator[Address]:
+    def addresses(ctx: GenerationContext, size: int = 10) -> Iterator[Address]:
         for i in range(size):
-            yield FakeAddress()
+            yield FakeAddress(ctx)
 
     @staticmethod
-    def members(address_ids: List[int], pizzeria_ids: List[int],
+    def members(ctx: GenerationContext, address_ids: Sequence[int],
+                pizzeria_ids: List[int], role_ids: Optional[List[int]] = None,
                 size: int = 10) -> Iterator[Member]:
         if len(address_ids) < size:
             raise ValueError('Not enough address_ids')
-        pizzeria_ids = [random.choice((None, i)) for i in pizzeria_ids]
-        random.shuffle(address_ids)
+        pizzeria_ids = [ctx.random.choice((None, i)) for i in pizzeria_ids]
+        address_ids = ctx.shuffled(address_ids)
         for i in range(size):
-            yield FakeMember(
-                random.choice(pizzeria_ids),
-                address_ids[i]
-            )
+            pizzeria_id: Optional[int] = ctx.random.choice(pizzeria_ids)
+            # Only the employees of a pizzeria have a role
+            role_id: Optional[int] = None
+            if pizzeria_id is not None and role_ids:
+                role_id = ctx.random.choice(role_ids)
+            yield FakeMember(ctx, pizzeria_id, address_ids[i], role_id)
 
     @staticmethod
-    def user_accounts(member_ids: List[int], size: int = 10)\
-            -> Iterator[UserAccount]:
+    def user_accounts(ctx: GenerationContext, member_ids: Sequence[int],
+                      size: int = 10) -> Iterator[UserAccount]:
         if len(member_ids) < size:
             raise ValueError('Not enough member_ids')
-        random.shuffle(member_ids)
-        for i in range(size):
-            yield FakeUserAccount(member_ids[i])
+        member_ids = ctx.shuffled(member_ids)
+        # Passwords are hashed by batches, for the process pool of the
+        # real hashing mode
+        for batch in chunked(itertools.islice(member_ids, size),
+                             HASH_BATCH_SIZE):
+            passwords: List[str] = [FakeUserAccount.password(ctx)
+                                    for member_id in batch]
+            hashes: List[str] = ctx.hasher.hash_many(
+                passwords, [FakeUserAccount.salt(ctx) for _ in batch]
+            )
+            for member_id, hashed_pwd in zip(batch, hashes):
+                yield FakeUserAccount(ctx, member_id, hashed_pwd)
 
     @staticmethod
-    def taken_orders(member_ids: List[int], address_ids: List[int],
-                     pizzeria_ids: List[int], order_status_ids: List[int],
+    def taken_orders(ctx: GenerationContext, member_ids: Sequence[int],
+                     address_ids: Sequence[int], pizzeria_ids: List[int],
+                     order_status_ids: List[int],
                      size: int = 10) -> Iterator[TakenOrder]:
         if len(member_ids) < size:
             raise ValueError('Not enough member_ids')
         elif len(address_ids) < size:
             raise ValueError('Not enough address_ids')
-        random.shuffle(member_ids)
-        random.shuffle(address_ids)
+        member_ids = ctx.shuffled(member_ids)
+        address_ids = ctx.shuffled(address_ids)
         for i in range(size):
             yield FakeTakenOrder(
-                random.choice(member_ids),
-                random.choice(address_ids),
-                random.choice(pizzeria_ids),
+                ctx,
+                ctx.random.choice(member_ids),
+                ctx.random.choice(address_ids),
+                ctx.random.choice(pizzeria_ids),
                 order_status_ids
             )
 
     @staticmethod
-    def bills(taken_order_ids: List[int], size: int = 10)\
-            -> Iterator[Bill]:
+    def bills(ctx: GenerationContext, taken_order_ids: Sequence[int],
+              size: int = 10) -> Iterator[Bill]:
         if len(taken_order_ids) < size:
-            print(taken_order_ids)
             raise ValueError('Not enough taken_order_ids')
         for i in range(size):
-            yield FakeBill(taken_order_ids[i])
-
-    @staticmethod
-    def products() -> Iterator[Product]:
-        product_names: List[str] = [
-            'farine de blé', 'tomate pelée', 'pulpe de tomate',
-            'mozzarella', 'ananas', 'parmesan', 'viande hachée de boeuf',
-            'saumon', 'fromage de chèvre', 'artichaut', 'poivron',
-            'thon', 'oignon', 'ail', 'pâte', 'oeuf', 'mélange fruits de mer',
-            'jambon', 'jambon sec', 'chorizo', 'truffe', 'petit pois',
-            'viande de boeuf', 'moule', 'palourde', 'coque',
-            "farine d'épeautre", 'langoustine', 'écrevisse', 'crevette rose',
-            'crevette grise', 'olive', 'roquette', 'basilic', 'champignon',
-        ]
-        for product_name in product_names:
-            yield FakeProduct(product_name)
+            yield FakeBill(ctx, taken_order_ids[i])
+
+    @staticmethod
+    def products(ctx: GenerationContext) -> Iterator[Product]:
+        for product_name in RandomDataGenerator.product_names:
+            yield FakeProduct(ctx, product_name)
 
     @staticmethod
-    def pizzerias(address_ids: List[Optional[int]])\
+    def pizzerias(ctx: GenerationContext, address_ids: List[Optional[int]])\
             -> Iterator[Pizzeria]:
         # OC Pizza has currently 5 stores
         pizzeria_names: List[str] = [
@@ -342,13 +762,14 @@ class RandomDataGenerator:
             'OC Pizza Original', "OC Pizza's"
         ]
         if len(address_ids) < 5:
-            address_ids += [None] * 5
-            random.shuffle(address_ids)
+            # Fewer addresses than stores: some stores share one
+            address_ids = [address_ids[i % len(address_ids)]
+                           for i in range(5)]
         for i, name in enumerate(pizzeria_names):
-            yield FakePizzeria(name, address_ids[i])
+            yield FakePizzeria(ctx, name, address_ids[i])
 
     @staticmethod
-    def recipes() -> Iterator[Recipe]:
+    def recipes(ctx: GenerationContext) -> Iterator[Recipe]:
         recipe_names: List[str] = [
             'Spaghetti bolognaise', 'Pizza regina', 'Pizza calzone',
             'Pizza quatre saisons', 'Pizza de la mer', 'Ravioles au crabe',
@@ -361,14 +782,14 @@ class RandomDataGenerator:
             'Pizza napolitaine',
         ]
         for recipe_name in recipe_names:
-            yield FakeRecipe(recipe_name)
+            yield FakeRecipe(ctx, recipe_name)
 
     @staticmethod
-    def catalog_items(recipes: Dict[str, int])\
+    def catalog_items(ctx: GenerationContext, recipes: Dict[str, int])\
             -> Iterator[CatalogItem]:
         for recipe_name, recipe_id in recipes.items():
             yield FakeCatalogItem(
-                recipe_name, 'recipe', int(recipe_id)
+                ctx, recipe_name, 'recipe', int(recipe_id)
             )
 
     @staticmethod
@@ -412,394 +833,2651 @@ class RandomDataGenerator:
             yield Role(name)
 
     @staticmethod
-    def has_permission_to(role_ids: List[int],
-                          permission_ids: List[int]) -> Dict[str, int]:
-        return {'role_id': random.choice(role_ids),
-                'permission_id': random.choice(permission_ids)}
+    def shards(size: int, workers: int) -> List[int]:
+        '''Sizes of the shards of a table generated by several workers'''
+        return [size // workers + (1 if i < size % workers else 0)
+                for i in range(workers)]
+
+    @staticmethod
+    def pairs(ctx: GenerationContext, left_ids: Sequence[int],
+              right_ids: Sequence[int], size: int = 10)\
+            -> Iterator[Tuple[int, int]]:
+        '''Distinct (left, right) key pairs drawn without replacement.
+           At most size pairs, and never more than the key space holds'''
+        space: int = len(left_ids) * len(right_ids)
+        for index in ctx.sample_indexes(space, size):
+            yield left_ids[index // len(right_ids)], \
+                right_ids[index % len(right_ids)]
+
+    @staticmethod
+    def has_permission_to(ctx: GenerationContext, role_ids: List[int],
+                          permission_ids: List[int], size: int = 10)\
+            -> Iterator[Dict[str, int]]:
+        for role_id, permission_id in RandomDataGenerator.pairs(
+                ctx, role_ids, permission_ids, size):
+            yield {'role_id': role_id, 'permission_id': permission_id}
+
+    @staticmethod
+    def contains_item(ctx: GenerationContext,
+                      taken_order_ids: Sequence[int],
+                      catalog_item_ids: List[int], size: int = 10)\
+            -> Iterator[Dict[str, Any]]:
+        for order_id, item_id in RandomDataGenerator.pairs(
+                ctx, taken_order_ids, catalog_item_ids, size):
+            yield {'order_id': order_id,
+                   'item_id': item_id,
+                   'quantity': ctx.random.randint(1, 10),
+                   'unit_price_ati': ctx.random.uniform(5.00, 80.00)}
+
+    @staticmethod
+    def has_product_in_stock(ctx: GenerationContext, pizzeria_ids: List[int],
+                             product_ids: List[int], size: int = 10)\
+            -> Iterator[Dict[str, int]]:
+        for pizzeria_id, product_id in RandomDataGenerator.pairs(
+                ctx, pizzeria_ids, product_ids, size):
+            yield {'pizzeria_id': pizzeria_id,
+                   'product_id': product_id,
+                   'quantity': ctx.random.randint(1, 100)}
+
+    @staticmethod
+    def requires_product(ctx: GenerationContext, recipe_ids: List[int],
+                         product_ids: List[int], size: int = 10)\
+            -> Iterator[Dict[str, int]]:
+        for recipe_id, product_id in RandomDataGenerator.pairs(
+                ctx, recipe_ids, product_ids, size):
+            yield {'recipe_id': recipe_id,
+                   'product_id': product_id,
+                   'gram_amount': ctx.random.randint(1, 1000)}
+
+    @staticmethod
+    def has_keyword(ctx: GenerationContext, catalog_item_ids: List[int],
+                    keyword_ids: List[int], size: int = 10)\
+            -> Iterator[Dict[str, int]]:
+        for item_id, keyword_id in RandomDataGenerator.pairs(
+                ctx, catalog_item_ids, keyword_ids, size):
+            yield {'item_id': item_id, 'keyword_id': keyword_id}
+
+
+def take_ids(ids: Any, indexes: Any) -> Any:
+    '''NumPy array of the IDs at the given positions of ids, an IdRanges
+       or an array'''
+    if isinstance(ids, IdRanges):
+        offsets: Any = numpy.asarray(ids.offsets)
+        r: Any = numpy.searchsorted(offsets, indexes, side='right') - 1
+        return numpy.asarray(ids.starts)[r] + indexes - offsets[r]
+    return ids[indexes]
+
+
+def id_array(ids: Sequence[Any]) -> Any:
+    '''ids as accepted by take_ids: IdRanges are kept as is'''
+    if isinstance(ids, IdRanges):
+        return ids
+    if any(i is None for i in ids):
+        return numpy.array(ids, dtype=object)
+    return numpy.array(ids, dtype=numpy.int64)
+
+
+def column_batches(size: int) -> Iterator[int]:
+    '''Sizes of the batches of a columnar generation of size rows'''
+    for start in range(0, size, COLUMN_BATCH_SIZE):
+        yield min(COLUMN_BATCH_SIZE, size - start)
+
+
+def prices(ctx: GenerationContext, size: int) -> List[float]:
+    '''Positive prices with 2 digits on each side of the decimal point,
+       as generated by Faker.pyfloat()'''
+    return (ctx.np_random.integers(1, 10000, size) / 100).tolist()
+
+
+class ColumnarGenerator(RandomDataGenerator):
+    '''RandomDataGenerator drawing the numeric and categorical columns
+       of a whole batch at once as NumPy arrays (ctx.np_random), Faker
+       being only used for the text columns. Requires a columnar
+       GenerationContext'''
+    @staticmethod
+    def members(ctx: GenerationContext, address_ids: Sequence[int],
+                pizzeria_ids: List[int], role_ids: Optional[List[int]] = None,
+                size: int = 10) -> Iterator[Member]:
+        if len(address_ids) < size:
+            raise ValueError('Not enough address_ids')
+        rng: Any = ctx.np_random
+        pizzerias: Any = id_array(
+            [i if keep else None
+             for i, keep in zip(pizzeria_ids,
+                                rng.random(len(pizzeria_ids)) < 0.5)]
+        )
+        roles: Any = id_array(role_ids or [None])
+        address_ids = ctx.shuffled(address_ids)
+        row: int = 0
+        for n in column_batches(size):
+            pizzeria_column: List[Optional[int]] = take_ids(
+                pizzerias, rng.integers(0, len(pizzerias), n)
+            ).tolist()
+            role_column: List[Optional[int]] = take_ids(
+                roles, rng.integers(0, len(roles), n)
+            ).tolist()
+            fake: Faker = ctx.fake
+            for pizzeria_id, role_id in zip(pizzeria_column, role_column):
+                # Only the employees of a pizzeria have a role
+                yield Member(
+                    fake.last_name(), fake.first_name(), pizzeria_id, None,
+                    address_ids[row],
+                    role_id if pizzeria_id is not None else None
+                )
+                row += 1
+
+    @staticmethod
+    def taken_orders(ctx: GenerationContext, member_ids: Sequence[int],
+                     address_ids: Sequence[int], pizzeria_ids: List[int],
+                     order_status_ids: List[int],
+                     size: int = 10) -> Iterator[TakenOrder]:
+        if len(member_ids) < size:
+            raise ValueError('Not enough member_ids')
+        elif len(address_ids) < size:
+            raise ValueError('Not enough address_ids')
+        rng: Any = ctx.np_random
+        columns: List[Any] = [id_array(ids) for ids in (
+            member_ids, address_ids, order_status_ids, pizzeria_ids
+        )]
+        for n in column_batches(size):
+            values: List[List[Any]] = [
+                take_ids(ids, rng.integers(0, len(ids), n)).tolist()
+                for ids in columns
+            ]
+            values.append((rng.random(n) < 0.5).tolist())
+            for member_id, address_id, status_id, pizzeria_id, is_paid \
+                    in zip(*values):
+                yield TakenOrder(member_id, address_id, status_id,
+                                 pizzeria_id, is_paid)
+
+    @staticmethod
+    def bills(ctx: GenerationContext, taken_order_ids: Sequence[int],
+              size: int = 10) -> Iterator[Bill]:
+        if len(taken_order_ids) < size:
+            raise ValueError('Not enough taken_order_ids')
+        # Same period as FakeBill
+        start, end = BILL_PERIOD
+        span: float = (end - start).total_seconds()
+        row: int = 0
+        for n in column_batches(size):
+            seconds: List[float] = ctx.np_random.uniform(0, span, n).tolist()
+            for delta, total in zip(seconds, prices(ctx, n)):
+                yield Bill(start + datetime.timedelta(seconds=delta), total,
+                           taken_order_ids[row])
+                row += 1
+
+    @staticmethod
+    def products(ctx: GenerationContext) -> Iterator[Product]:
+        names: List[str] = RandomDataGenerator.product_names
+        weights: List[int] = (
+            ctx.np_random.integers(20, 2001, len(names)) * 5
+        ).tolist()
+        for name, weight, price in zip(names, weights,
+                                       prices(ctx, len(names))):
+            yield Product(name, ctx.fake.ean13(), weight, price)
+
+    @staticmethod
+    def catalog_items(ctx: GenerationContext, recipes: Dict[str, int])\
+            -> Iterator[CatalogItem]:
+        rng: Any = ctx.np_random
+        flags: List[List[bool]] = (rng.random((2, len(recipes))) < 0.5)\
+            .tolist()
+        for (name, recipe_id), price, is_available, is_displayed in zip(
+                recipes.items(), prices(ctx, len(recipes)), *flags):
+            yield CatalogItem(
+                name, ctx.fake.sentences(),
+                ctx.fake.file_name(extension='jpg'), price, is_available,
+                is_displayed, recipe_id=int(recipe_id)
+            )
+
+    @staticmethod
+    def pairs(ctx: GenerationContext, left_ids: Sequence[int],
+              right_ids: Sequence[int], size: int = 10)\
+            -> Iterator[Tuple[int, int]]:
+        space: int = len(left_ids) * len(right_ids)
+        batches: Iterator[Any]
+        if ctx.streaming:
+            batches = (numpy.array(batch) for batch in chunked(
+                ctx.sample_indexes(space, size), COLUMN_BATCH_SIZE
+            ))
+        else:
+            indexes: Any = ctx.np_random.choice(space, min(size, space),
+                                                replace=False)
+            batches = (indexes[start:start + COLUMN_BATCH_SIZE]
+                       for start in range(0, len(indexes), COLUMN_BATCH_SIZE))
+        left: Any = id_array(left_ids)
+        right: Any = id_array(right_ids)
+        for batch in batches:
+            yield from zip(take_ids(left, batch // len(right_ids)).tolist(),
+                           take_ids(right, batch % len(right_ids)).tolist())
+
+    @staticmethod
+    def contains_item(ctx: GenerationContext,
+                      taken_order_ids: Sequence[int],
+                      catalog_item_ids: List[int], size: int = 10)\
+            -> Iterator[Dict[str, Any]]:
+        pairs: Iterator[Tuple[int, int]] = ColumnarGenerator.pairs(
+            ctx, taken_order_ids, catalog_item_ids, size
+        )
+        for batch in chunked(pairs, COLUMN_BATCH_SIZE):
+            quantities: List[int] = ctx.np_random.integers(1, 11, len(batch))\
+                .tolist()
+            unit_prices: List[float] = ctx.np_random.uniform(
+                5.00, 80.00, len(batch)
+            ).tolist()
+            for (order_id, item_id), quantity, unit_price in zip(
+                    batch, quantities, unit_prices):
+                yield {'order_id': order_id, 'item_id': item_id,
+                       'quantity': quantity, 'unit_price_ati': unit_price}
+
+
+# RandomDataGenerator methods split into shards with --workers: index of
+# the ID list argument consumed once per row (sliced between the shards),
+# and whether the generator shuffles this list first
+SHARDED_GENERATORS: Dict[str, Tuple[Optional[int], bool]] = {
+    'addresses': (None, False),
+    'members': (0, True),
+    'user_accounts': (0, True),
+    'taken_orders': (None, False),
+    'bills': (0, False),
+}
+# Arguments of the generators holding the IDs of the large tables their
+# rows reference: with rows left out by the loader, a table gets no more
+# rows than these IDs
+PARENT_IDS: Dict[str, Tuple[int, ...]] = {
+    'members': (0,),
+    'user_accounts': (0,),
+    'taken_orders': (0, 1),
+    'bills': (0,),
+}
+
+
+def shard_seed(seed: Optional[int], method: str,
+               shard: int) -> Optional[int]:
+    '''Seed of a generation shard, derived from the global seed, the
+       generated table and the shard index'''
+    if seed is None:
+        return None
+    digest: bytes = hashlib.sha256(f'{seed}:{method}:{shard}'.encode())\
+        .digest()
+    return int.from_bytes(digest[:8], 'big')
+
+
+def generate_shard(method: str, seed: Optional[int], shard: int,
+                   hasher_options: Dict[str, Any], args: Tuple[Any, ...],
+                   size: int, columnar: bool = False)\
+        -> Tuple[List[Any], int, float]:
+    '''Generates one shard of a table in a worker process. Returns the
+       rows and the password hashing statistics of the shard'''
+    ctx: GenerationContext = GenerationContext(
+        shard_seed(seed, method, shard),
+        hasher=PasswordHasher.create(parallel=False, **hasher_options),
+        columnar=columnar
+    )
+    generator: type = ColumnarGenerator if columnar else RandomDataGenerator
+    rows: List[Any] = list(
+        getattr(generator, method)(ctx, *args, size=size)
+    )
+    return rows, ctx.hasher.count, ctx.hasher.elapsed
+
+
+def row_columns(row: Any) -> List[str]:
+    '''Column names of a generated row (dataclass object or dict)'''
+    if isinstance(row, dict):
+        return list(row)
+    return [f.name for f in fields(row)]
+
+
+def row_values(row: Any, columns: List[str]) -> List[Any]:
+    '''Values of a generated row, in the order of the given columns'''
+    if isinstance(row, dict):
+        return [row[column] for column in columns]
+    return [getattr(row, column) for column in columns]
+
+
+def row_getter(row: Any, columns: List[str])\
+        -> Callable[[Any], Tuple[Any, ...]]:
+    '''Function returning the values of the rows shaped like row, in the
+       order of the given columns. Built once per batch, it reads all the
+       columns of a row in a single call'''
+    getter: Callable[[Any], Any] = operator.itemgetter(*columns) \
+        if isinstance(row, dict) else operator.attrgetter(*columns)
+    if len(columns) == 1:
+        return lambda r: (getter(r),)
+    return getter
+
+
+class Loader:
+    '''Base class of the loaders writing generated rows to the database.
+       Primary keys are reserved from the table sequences before writing,
+       so that the IDs of the inserted rows are known without reading
+       the table back'''
+    def __init__(self, db: records.Database, batch_size: int = 500) -> None:
+        self.db = db
+        self.batch_size = batch_size
+        self.statements = 0
+        self.round_trips = 0
+        # Rows left out after failing to be written, and their IDs
+        self.rejected = 0
+        self.rejected_ids: Set[int] = set()
+
+    def load(self, table: str, rows: Iterable[Any],
+             on_conflict: Optional[str] = None) -> int:
+        raise NotImplementedError
+
+    def query(self, query: str, **params: Any) -> records.RecordCollection:
+        '''Runs one statement, in one round trip'''
+        self.statements += 1
+        self.round_trips += 1
+        return self.db.query(query, **params)
+
+    def counters(self) -> Dict[str, int]:
+        '''Statements sent, round trips to the database and rows rejected
+           so far'''
+        return {'statements': self.statements,
+                'round_trips': self.round_trips, 'rejected': self.rejected}
+
+    def take_rejected_ids(self) -> Set[int]:
+        '''IDs of the rows left out since the previous call'''
+        rejected_ids: Set[int] = self.rejected_ids
+        self.rejected_ids = set()
+        return rejected_ids
+
+    def close(self) -> None:
+        pass
+
+    def reserve_ids(self, table: str, size: int) -> List[int]:
+        rows: records.RecordCollection = self.query(
+            '''SELECT nextval(pg_get_serial_sequence(:table, 'id')) AS id
+            FROM generate_series(1, :size);''', table=table, size=size
+        )
+        return [r.id for r in rows]
+
+    def is_empty(self, table: str) -> bool:
+        rows: records.RecordCollection = self.query(
+            f'''SELECT NOT EXISTS (SELECT 1 FROM {table}) AS empty;'''
+        )
+        return bool(rows[0].empty)
+
+    def restore_sequence(self, table: str) -> None:
+        '''Moves the sequence of table after the IDs written explicitly'''
+        self.query(
+            f'''SELECT setval(pg_get_serial_sequence(:table, 'id'),
+            (SELECT max(id) FROM {table}));''', table=table
+        )
+
+    def update(self, table: str, column: str,
+               values: Iterable[Tuple[int, int]]) -> int:
+        '''Sets column from (id, value) pairs with one set-based
+           UPDATE ... FROM (VALUES ...) statement per batch'''
+        count: int = 0
+        for batch in chunked(values, self.batch_size):
+            self.query(self.update_query(table, column, batch))
+            count += len(batch)
+        return count
+
+    @staticmethod
+    def update_query(table: str, column: str,
+                     batch: List[Tuple[int, int]]) -> str:
+        pairs: str = ', '.join(
+            f'({int(row_id)}, {int(value)})' for row_id, value in batch
+        )
+        return f'''UPDATE {table} SET {column} = v.value
+                FROM (VALUES {pairs}) AS v (id, value)
+                WHERE {table}.id = v.id;'''
+
+    def update_join(self, table: str, column: str, source: str,
+                    foreign_key: str) -> None:
+        '''Sets column to the id of the source row referencing each row
+           through foreign_key, within the database'''
+        self.query(self.update_join_query(table, column, source,
+                                          foreign_key))
 
     @staticmethod
-    def contains_item(taken_order_ids: List[int],
-                      catalog_item_ids: List[int]) -> Dict[str, Any]:
-        return {'order_id': random.choice(taken_order_ids),
-                'item_id': random.choice(catalog_item_ids),
-                'quantity': random.randint(1, 10),
-                'unit_price_ati': random.uniform(5.00, 80.00)}
+    def update_join_query(table: str, column: str, source: str,
+                          foreign_key: str) -> str:
+        return f'''UPDATE {table} SET {column} = {source}.id
+                FROM {source} WHERE {source}.{foreign_key} = {table}.id
+                AND {table}.{column} IS NULL;'''
+
+    def load_entities(self, table: str, rows: Iterable[Any],
+                      on_batch: Optional[Callable] = None,
+                      ids: Optional[Any] = None) -> Any:
+        '''Loads rows having an id attribute and returns the reserved IDs,
+           appended to ids (a list by default, or an IdRanges), except
+           for the rows left out by the loader: rows referencing them
+           would be left out in turn. on_batch is called with each batch
+           once its IDs are set'''
+        if ids is None:
+            ids = []
+
+        def with_ids() -> Iterator[Any]:
+            for batch in chunked(rows, self.batch_size):
+                batch_ids: List[int] = self.reserve_ids(table, len(batch))
+                for row, row_id in zip(batch, batch_ids):
+                    row.id = row_id
+                if on_batch:
+                    on_batch(batch)
+                ids.extend(batch_ids)
+                yield from batch
+        self.load(table, with_ids())
+        rejected_ids: Set[int] = self.take_rejected_ids()
+        if rejected_ids:
+            kept: List[int] = [row_id for row_id in ids
+                               if row_id not in rejected_ids]
+            ids.clear()
+            ids.extend(kept)
+        return ids
+
+
+class InsertLoader(Loader):
+    '''Writes generated rows with multi-row INSERT statements, sending
+       batch_size rows per round trip instead of one row per query.
+       Statements commit on their own, or within explicit transactions
+       of commit_every rows on a connection of the loader. With bisect,
+       a batch failing to be inserted or updated is split in halves
+       written again, each under a savepoint within a transaction, down
+       to the faulty rows, which are reported and left out'''
+    def __init__(self, db: records.Database, batch_size: int = 500,
+                 commit_every: int = 0, bisect: bool = False) -> None:
+        super().__init__(db, batch_size)
+        self.commit_every = commit_every
+        self.bisect = bisect
+        self.session: Optional[records.Connection] = \
+            db.get_connection() if commit_every > 0 else None
+        self.transaction: Optional[Any] = None
+        self.pending = 0
+        self.savepoint = False
+
+    def query(self, query: str, **params: Any) -> records.RecordCollection:
+        if self.transaction is None:
+            return super().query(query, **params)
+        self.statements += 1
+        self.round_trips += 1
+        return self.session.query(query, **params)
+
+    def begin(self) -> None:
+        if self.session is not None and self.transaction is None:
+            self.transaction = self.session.transaction()
+
+    def written(self, rows: int) -> None:
+        '''Commits the transaction once commit_every rows are written'''
+        self.pending += rows
+        if self.pending >= self.commit_every > 0:
+            self.commit()
+
+    def commit(self) -> None:
+        if self.transaction is not None:
+            self.transaction.commit()
+        self.transaction = None
+        self.pending = 0
+        self.savepoint = False
+
+    def rollback(self) -> None:
+        if self.transaction is not None:
+            self.transaction.rollback()
+        self.transaction = None
+        self.pending = 0
+        self.savepoint = False
+
+    def load(self, table: str, rows: Iterable[Any],
+             on_conflict: Optional[str] = None) -> int:
+        count: int = 0
+        try:
+            for batch in chunked(rows, self.batch_size):
+                self.begin()
+                count += self._write(
+                    table, batch,
+                    lambda part: self._insert(table, part, on_conflict)
+                )
+                self.written(len(batch))
+            self.commit()
+        except BaseException:
+            self.rollback()
+            raise
+        return count
+
+    def update(self, table: str, column: str,
+               values: Iterable[Tuple[int, int]]) -> int:
+        count: int = 0
+        try:
+            for batch in chunked(values, self.batch_size):
+                self.begin()
+                count += self._write(
+                    table, batch,
+                    lambda part: self._update(table, column, part)
+                )
+                self.written(len(batch))
+            self.commit()
+        except BaseException:
+            self.rollback()
+            raise
+        return count
+
+    def close(self) -> None:
+        if self.session is not None:
+            self.rollback()
+            self.session.close()
+
+    def _write(self, table: str, batch: List[Any],
+               write: Callable[[List[Any]], int]) -> int:
+        '''Writes batch, or with bisect the rows of batch which can be'''
+        if not self.bisect:
+            return write(batch)
+        try:
+            return write(batch)
+        except DBAPIError as e:
+            if self.transaction is not None:
+                self.query('''ROLLBACK TO SAVEPOINT batch;''')
+            if len(batch) > 1:
+                middle: int = len(batch) // 2
+                return self._write(table, batch[:middle], write) + \
+                    self._write(table, batch[middle:], write)
+            self.rejected += 1
+            row: Any = batch[0]
+            if getattr(row, 'id', None) is not None:
+                self.rejected_ids.add(row.id)
+            if not isinstance(row, tuple):
+                columns: List[str] = row_columns(row)
+                row = dict(zip(columns, row_values(row, columns)))
+            print(f'  REJECTED {table} {row}: '
+                  f'{str(e.orig).splitlines()[0]}')
+            return 0
+
+    def _savepoint(self, query: str) -> str:
+        '''Sends along with query the release of the savepoint of the
+           previous batch and the one of this batch, when bisecting
+           within a transaction'''
+        if not self.bisect or self.transaction is None:
+            return query
+        prefix: str = 'RELEASE SAVEPOINT batch; ' if self.savepoint else ''
+        self.savepoint = True
+        return prefix + 'SAVEPOINT batch; ' + query
+
+    def _update(self, table: str, column: str,
+                batch: List[Tuple[int, int]]) -> int:
+        self.query(self._savepoint(self.update_query(table, column, batch)))
+        return len(batch)
+
+    def _insert(self, table: str, batch: List[Any],
+                on_conflict: Optional[str]) -> int:
+        columns: List[str] = row_columns(batch[0])
+        values_of: Callable = row_getter(batch[0], columns)
+        params: Dict[str, Any] = {}
+        values: List[str] = []
+        for i, row in enumerate(batch):
+            placeholders: List[str] = []
+            for column, value in zip(columns, values_of(row)):
+                params[f'{column}_{i}'] = value
+                placeholders.append(f':{column}_{i}')
+            values.append(f'({", ".join(placeholders)})')
+        query: str = (
+            f'INSERT INTO {table} ({", ".join(columns)}) '
+            f'VALUES {", ".join(values)}'
+        )
+        query = self._savepoint(query)
+        if on_conflict:
+            # Skipped rows are not returned: only inserted rows count
+            query += f' ON CONFLICT {on_conflict} RETURNING 1'
+            return len(self.query(query + ';', **params).all())
+        self.query(query + ';', **params)
+        return len(batch)
+
+
+class SqliteLoader(InsertLoader):
+    '''InsertLoader of the embedded SQLite databases (sqlite:///path, or
+       sqlite:// in memory), creating the OCP6_sqlite.sql tables in an
+       empty database. All statements run on a single connection, with
+       the foreign keys enforced, and every load or update is a single
+       transaction unless commit_every is set. IDs are reserved from
+       counters kept by the loader, started after the highest ID of each
+       table, as SQLite has no sequences'''
+    def __init__(self, db: records.Database, batch_size: int = 500,
+                 commit_every: int = 0, bisect: bool = False) -> None:
+        super().__init__(db, batch_size, commit_every, bisect)
+        # Stored as the same text as in PostgreSQL
+        sqlite3.register_adapter(list, array_literal)
+        if self.session is None:
+            self.session = db.get_connection()
+        self.sequences: Dict[str, int] = {}
+        self.query('''PRAGMA foreign_keys = ON;''')
+        if not self.query('''SELECT name FROM sqlite_master
+                          WHERE name = 'address';''').all():
+            with open(SQLITE_SCHEMA_FILE) as f:
+                schema: str = re.sub(r'--[^\n]*', '', f.read())
+            for statement in schema.split(';'):
+                if statement.strip():
+                    self.query(statement + ';')
+
+    def query(self, query: str, **params: Any) -> records.RecordCollection:
+        self.statements += 1
+        self.round_trips += 1
+        return self.session.query(query, **params)
+
+    def written(self, rows: int) -> None:
+        # Without commit_every, the transaction lasts the whole load
+        if self.commit_every > 0:
+            super().written(rows)
+
+    def reserve_ids(self, table: str, size: int) -> List[int]:
+        if table not in self.sequences:
+            self.sequences[table] = self.query(
+                f'''SELECT coalesce(max(id), 0) AS id FROM {table};'''
+            )[0].id
+        start: int = self.sequences[table] + 1
+        self.sequences[table] = start + size - 1
+        return list(range(start, start + size))
+
+    def restore_sequence(self, table: str) -> None:
+        # Rowids follow the highest ID: counters restart from it
+        self.sequences.pop(table, None)
 
     @staticmethod
-    def has_product_in_stock(pizzeria_ids: List[int],
-                             product_ids: List[int]) -> Dict[str, int]:
-        return {'pizzeria_id': random.choice(pizzeria_ids),
-                'product_id': random.choice(product_ids),
-                'quantity': random.randint(1, 100)}
+    def update_query(table: str, column: str,
+                     batch: List[Tuple[int, int]]) -> str:
+        # The columns of a VALUES subquery cannot be named in SQLite
+        pairs: str = ', '.join(
+            f'({int(row_id)}, {int(value)})' for row_id, value in batch
+        )
+        return f'''UPDATE {table} SET {column} = v.column2
+                FROM (VALUES {pairs}) AS v
+                WHERE {table}.id = v.column1;'''
+
+    def _savepoint(self, query: str) -> str:
+        # SQLite runs a single statement per call
+        if self.bisect and self.transaction is not None:
+            if self.savepoint:
+                self.query('''RELEASE SAVEPOINT batch;''')
+            self.query('''SAVEPOINT batch;''')
+            self.savepoint = True
+        return query
+
+
+def dbapi_url(url: str) -> str:
+    '''libpq URL of a SQLAlchemy PostgreSQL URL, without its driver'''
+    return re.sub(r'^postgresql\+\w+://', 'postgresql://', url)
+
+
+def array_literal(values: Iterable[Any]) -> str:
+    '''Text of a PostgreSQL array, as Faker paragraphs/sentences are
+       stored'''
+    return '{' + ','.join(
+        '"' + str(v).replace('\\', '\\\\').replace('"', '\\"') + '"'
+        for v in values
+    ) + '}'
+
+
+def copy_value(value: Any) -> str:
+    '''Encodes a value in the text format of COPY'''
+    if value is None:
+        return '\\N'
+    if isinstance(value, bool):
+        return 't' if value else 'f'
+    if isinstance(value, (list, tuple)):
+        value = array_literal(value)
+    return str(value).replace('\\', '\\\\').replace('\t', '\\t')\
+        .replace('\n', '\\n').replace('\r', '\\r')
+
+
+class CopyBuffer:
+    '''File-like object feeding COPY ... FROM STDIN: rows are encoded
+       batch_size at a time, so that only one chunk is held in memory'''
+    def __init__(self, rows: Iterable[Any], columns: List[str],
+                 batch_size: int = 500) -> None:
+        self.batches: Iterator[List[Any]] = chunked(rows, batch_size)
+        self.columns = columns
+        self.buffer = io.StringIO()
+        self.count = 0
+        self.values_of: Optional[Callable] = None
+
+    def _encode(self, batch: List[Any]) -> None:
+        self.buffer = io.StringIO()
+        if self.values_of is None:
+            self.values_of = row_getter(batch[0], self.columns)
+        for row in batch:
+            self.buffer.write('\t'.join(
+                copy_value(v) for v in self.values_of(row)
+            ) + '\n')
+        self.buffer.seek(0)
+        self.count += len(batch)
+
+    def read(self, size: int = -1) -> str:
+        data: str = self.buffer.read(size)
+        while not data:
+            batch: Optional[List[Any]] = next(self.batches, None)
+            if batch is None:
+                return ''
+            self._encode(batch)
+            data = self.buffer.read(size)
+        return data
+
+    readline = read
+
+
+class CopyLoader(Loader):
+    '''Streams generated rows through COPY ... FROM STDIN on the
+       underlying psycopg2 connection (PostgreSQL only)'''
+    def __init__(self, db: records.Database, batch_size: int = 500) -> None:
+        super().__init__(db, batch_size)
+        self.connection = psycopg2.connect(dbapi_url(db.db_url))
+
+    def load(self, table: str, rows: Iterable[Any],
+             on_conflict: Optional[str] = None) -> int:
+        iterator: Iterator[Any] = iter(rows)
+        first: Optional[Any] = next(iterator, None)
+        if first is None:
+            return 0
+        columns: List[str] = row_columns(first)
+        stream: CopyBuffer = CopyBuffer(
+            itertools.chain([first], iterator), columns, self.batch_size
+        )
+        with self.connection.cursor() as cursor:
+            if on_conflict:
+                # COPY has no ON CONFLICT clause: rows go through a
+                # staging table first
+                cursor.execute(
+                    f'''CREATE TEMP TABLE staging_{table}
+                    (LIKE {table} INCLUDING DEFAULTS) ON COMMIT DROP;'''
+                )
+                self._copy(cursor, f'staging_{table}', columns, stream)
+                cursor.execute(
+                    f'''INSERT INTO {table} ({", ".join(columns)})
+                    SELECT {", ".join(columns)} FROM staging_{table}
+                    ON CONFLICT {on_conflict};'''
+                )
+                count: int = cursor.rowcount
+            else:
+                self._copy(cursor, table, columns, stream)
+                count = stream.count
+        self.connection.commit()
+        self.statements += 4 if on_conflict else 2
+        self.round_trips += 4 if on_conflict else 2
+        return count
+
+    def close(self) -> None:
+        self.connection.close()
 
     @staticmethod
-    def requires_product(recipe_ids: List[int],
-                         product_ids: List[int]) -> Dict[str, int]:
-        return {'recipe_id': random.choice(recipe_ids),
-                'product_id': random.choice(product_ids),
-                'gram_amount': random.randint(1, 1000)}
+    def _copy(cursor: Any, table: str, columns: List[str],
+              stream: CopyBuffer) -> None:
+        cursor.copy_expert(
+            f'COPY {table} ({", ".join(columns)}) FROM STDIN;', stream
+        )
+
+
+class FileLoader(Loader):
+    '''Writes no row to a live database: the whole dataset is streamed
+       into a plain SQL script restorable with psql, like the ones of
+       pg_dump. Tables come from OCP6.sql, rows from COPY blocks, and
+       foreign key constraints are only added once all rows are loaded.
+       The script is compressed if its name ends with .gz or .zst'''
+    def __init__(self, path: str, batch_size: int = 500) -> None:
+        super().__init__(None, batch_size)
+        self.file: IO[str] = self.open(path)
+        self.sequences: Dict[str, int] = {}
+        with open(SCHEMA_FILE) as f:
+            schema: str = f.read()
+        tables, _, self.constraints = schema.partition(
+            '-- FOREIGN CONSTRAINTS'
+        )
+        self.file.write(
+            '\\set ON_ERROR_STOP on\n'
+            "SET client_encoding = 'UTF8';\n"
+            'SET standard_conforming_strings = on;\n\n'
+            f'{tables}\n'
+        )
 
     @staticmethod
-    def has_keyword(catalog_item_ids: List[int],
-                    keyword_ids: List[int]) -> Dict[str, int]:
-        return {'item_id': random.choice(catalog_item_ids),
-                'keyword_id': random.choice(keyword_ids)}
+    def open(path: str) -> IO[str]:
+        if path.endswith('.gz'):
+            return gzip.open(path, 'wt', encoding='utf-8')
+        elif path.endswith('.zst'):
+            if zstandard is None:
+                raise ImportError('zstandard is required for .zst output')
+            return io.TextIOWrapper(
+                zstandard.ZstdCompressor().stream_writer(open(path, 'wb')),
+                encoding='utf-8'
+            )
+        return open(path, 'w', encoding='utf-8')
+
+    def load(self, table: str, rows: Iterable[Any],
+             on_conflict: Optional[str] = None) -> int:
+        iterator: Iterator[Any] = iter(rows)
+        first: Optional[Any] = next(iterator, None)
+        if first is None:
+            return 0
+        columns: List[str] = row_columns(first)
+        iterator = itertools.chain([first], iterator)
+        if 'id' in columns:
+            iterator = self._track_ids(table, iterator)
+        self.file.write(f'COPY {table} ({", ".join(columns)}) FROM stdin;\n')
+        stream: CopyBuffer = CopyBuffer(iterator, columns, self.batch_size)
+        data: str = stream.read()
+        while data:
+            self.file.write(data)
+            data = stream.read()
+        self.file.write('\\.\n\n')
+        self.statements += 1
+        return stream.count
+
+    def _track_ids(self, table: str, rows: Iterator[Any]) -> Iterator[Any]:
+        '''Keeps the sequence after the IDs written, as replayed rows come
+           with their IDs instead of reserved ones'''
+        for row in rows:
+            row_id: int = int(row_values(row, ['id'])[0])
+            if row_id > self.sequences.get(table, 0):
+                self.sequences[table] = row_id
+            yield row
+
+    def reserve_ids(self, table: str, size: int) -> List[int]:
+        start: int = self.sequences.get(table, 0) + 1
+        self.sequences[table] = start + size - 1
+        return list(range(start, start + size))
+
+    def is_empty(self, table: str) -> bool:
+        return True
+
+    def restore_sequence(self, table: str) -> None:
+        pass
+
+    def update(self, table: str, column: str,
+               values: Iterable[Tuple[int, int]]) -> int:
+        count: int = 0
+        for batch in chunked(values, self.batch_size):
+            self.file.write(self.update_query(table, column, batch) + '\n')
+            self.statements += 1
+            count += len(batch)
+        self.file.write('\n')
+        return count
+
+    def update_join(self, table: str, column: str, source: str,
+                    foreign_key: str) -> None:
+        self.file.write(self.update_join_query(table, column, source,
+                                               foreign_key) + '\n\n')
+        self.statements += 1
+
+    def close(self) -> None:
+        for table, last_id in self.sequences.items():
+            self.file.write(
+                f"SELECT pg_catalog.setval("
+                f"pg_get_serial_sequence('{table}', 'id'), {last_id});\n"
+            )
+        self.file.write(f'\n-- FOREIGN CONSTRAINTS{self.constraints}')
+        self.file.close()
+
+
+LOADERS: Dict[str, Callable] = {
+    'insert': InsertLoader,
+    'copy': CopyLoader,
+}
+
+
+def merge_intervals(intervals: List[Tuple[float, float]])\
+        -> List[Tuple[float, float]]:
+    '''Union of (start, end) time intervals, as sorted disjoint intervals'''
+    merged: List[Tuple[float, float]] = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def overlap(left: List[Tuple[float, float]],
+            right: List[Tuple[float, float]]) -> float:
+    '''Total time during which both sets of intervals are running'''
+    total: float = 0.0
+    left, right = merge_intervals(left), merge_intervals(right)
+    i: int = 0
+    j: int = 0
+    while i < len(left) and j < len(right):
+        total += max(0.0, min(left[i][1], right[j][1])
+                     - max(left[i][0], right[j][0]))
+        if left[i][1] < right[j][1]:
+            i += 1
+        else:
+            j += 1
+    return total
+
+
+# Column splitting the rows of the large tables between partitioned
+# writers, and whether it is split by ranges of batch_size consecutive
+# values (IDs) or value by value (pizzerias)
+PARTITION_KEYS: Dict[str, Tuple[str, bool]] = {
+    'taken_order': ('id', True),
+    'bill': ('id', True),
+    'contains_item': ('order_id', True),
+    'has_product_in_stock': ('pizzeria_id', False),
+}
+
+
+class PipelineLoader(Loader):
+    '''Overlaps generation with database writes: the calling thread
+       generates batches of rows into a bounded queue, which blocks it when
+       the writers fall behind, while writer threads drain the queue, each
+       one through its own loader and connection. With partition, the rows
+       of the large tables are split between the writers by PARTITION_KEYS
+       instead, each writer loading its disjoint slice in a single load
+       (one COPY or one series of transactions per connection)'''
+    def __init__(self, db: records.Database, batch_size: int = 500,
+                 loader: str = 'insert', writers: int = 1,
+                 queue_size: int = 4, partition: bool = False,
+                 **options: Any) -> None:
+        super().__init__(db, batch_size)
+        self.loaders: List[Loader] = [
+            LOADERS[loader](records.Database(db.db_url), batch_size,
+                            **options)
+            for i in range(writers)
+        ]
+        self.queue_size = queue_size
+        self.partition = partition
+        self.generation = 0.0
+        self.writes = 0.0
+        self.overlap = 0.0
+        # Rows written and seconds spent by each partitioned writer
+        self.writer_rows: List[int] = [0] * writers
+        self.writer_seconds: List[float] = [0.0] * writers
+
+    def load(self, table: str, rows: Iterable[Any],
+             on_conflict: Optional[str] = None) -> int:
+        if self.partition and table in PARTITION_KEYS:
+            return self._load_partitioned(table, rows, on_conflict)
+        batches: queue.Queue = queue.Queue(self.queue_size)
+        counts: List[int] = [0] * len(self.loaders)
+        errors: List[Exception] = []
+        generated: List[Tuple[float, float]] = []
+        written: List[Tuple[float, float]] = []
+
+        def write(index: int, loader: Loader) -> None:
+            while True:
+                batch: Optional[List[Any]] = batches.get()
+                if batch is None:
+                    return
+                elif errors:
+                    continue
+                s: float = time.perf_counter()
+                try:
+                    counts[index] += loader.load(table, batch, on_conflict)
+                except Exception as e:
+                    errors.append(e)
+                written.append((s, time.perf_counter()))
+
+        writers: List[threading.Thread] = [
+            threading.Thread(target=write, args=(index, loader))
+            for index, loader in enumerate(self.loaders)
+        ]
+        for writer in writers:
+            writer.start()
+        iterator: Iterator[Any] = iter(rows)
+        try:
+            while not errors:
+                s: float = time.perf_counter()
+                batch: List[Any] = list(
+                    itertools.islice(iterator, self.batch_size)
+                )
+                generated.append((s, time.perf_counter()))
+                if not batch:
+                    break
+                batches.put(batch)
+        finally:
+            for writer in writers:
+                batches.put(None)
+            for writer in writers:
+                writer.join()
+        if errors:
+            raise errors[0]
+        self._report(table, generated, written)
+        return sum(counts)
+
+    def _load_partitioned(self, table: str, rows: Iterable[Any],
+                          on_conflict: Optional[str]) -> int:
+        '''Sends each row to the writer of its slice, through one bounded
+           queue of batches per writer'''
+        slices: List[queue.Queue] = [
+            queue.Queue(self.queue_size) for _ in self.loaders
+        ]
+        counts: List[int] = [0] * len(self.loaders)
+        seconds: List[float] = [0.0] * len(self.loaders)
+        errors: List[Exception] = []
+        generated: List[Tuple[float, float]] = []
+        written: List[Tuple[float, float]] = []
+
+        def write(index: int, loader: Loader) -> None:
+            drained: List[bool] = [False]
+
+            def slice_rows() -> Iterator[Any]:
+                while True:
+                    batch: Optional[List[Any]] = slices[index].get()
+                    if batch is None:
+                        drained[0] = True
+                        return
+                    yield from batch
+            s: float = time.perf_counter()
+            try:
+                counts[index] = loader.load(table, slice_rows(), on_conflict)
+            except Exception as error:
+                errors.append(error)
+                # Unblocks the generation until it notices the error
+                while not drained[0]:
+                    drained[0] = slices[index].get() is None
+            end: float = time.perf_counter()
+            seconds[index] = end - s
+            written.append((s, end))
+
+        writers: List[threading.Thread] = [
+            threading.Thread(target=write, args=(index, loader))
+            for index, loader in enumerate(self.loaders)
+        ]
+        for writer in writers:
+            writer.start()
+        column, by_range = PARTITION_KEYS[table]
+        width: int = self.batch_size if by_range else 1
+        key_of: Optional[Callable] = None
+        buffers: List[List[Any]] = [[] for _ in self.loaders]
+        iterator: Iterator[Any] = iter(rows)
+        try:
+            while not errors:
+                s: float = time.perf_counter()
+                batch: List[Any] = list(
+                    itertools.islice(iterator, self.batch_size)
+                )
+                generated.append((s, time.perf_counter()))
+                if not batch:
+                    break
+                if key_of is None:
+                    key_of = row_getter(batch[0], [column])
+                for row in batch:
+                    # Replayed rows hold the COPY text of their values
+                    index: int = int(key_of(row)[0]) // width \
+                        % len(buffers)
+                    buffers[index].append(row)
+                    if len(buffers[index]) >= self.batch_size:
+                        slices[index].put(buffers[index])
+                        buffers[index] = []
+            for index, buffer in enumerate(buffers):
+                if buffer and not errors:
+                    slices[index].put(buffer)
+        finally:
+            for slice_queue in slices:
+                slice_queue.put(None)
+            for writer in writers:
+                writer.join()
+        if errors:
+            raise errors[0]
+        self._report(table, generated, written)
+        for index, (count, duration) in enumerate(zip(counts, seconds)):
+            self.writer_rows[index] += count
+            self.writer_seconds[index] += duration
+            rate: float = count / duration if duration else 0.0
+            print(f'  writer {index} {table}: {count} rows, '
+                  f'{duration:.2f} sec., {rate:.1f} rows/sec.')
+        return sum(counts)
+
+    def writer_report(self) -> List[Dict[str, Any]]:
+        '''Rows, seconds and throughput of each partitioned writer'''
+        return [
+            {'writer': index, 'rows': count, 'seconds': duration,
+             'rows_per_second': count / duration if duration else 0.0}
+            for index, (count, duration) in enumerate(
+                zip(self.writer_rows, self.writer_seconds)
+            )
+        ]
+
+    def _report(self, table: str, generated: List[Tuple[float, float]],
+                written: List[Tuple[float, float]]) -> None:
+        generation: float = sum(e - s for s, e in generated)
+        writes: float = sum(e - s for s, e in merge_intervals(written))
+        both: float = overlap(generated, written)
+        self.generation += generation
+        self.writes += writes
+        self.overlap += both
+        print(f'  pipeline {table}: generation {generation:.2f} sec., '
+              f'writes {writes:.2f} sec., overlap {both:.2f} sec.')
+
+    def report(self) -> str:
+        shortest: float = min(self.generation, self.writes)
+        ratio: float = 100 * self.overlap / shortest if shortest else 0
+        report: str = (
+            f'PIPELINE: generation {self.generation:.2f} sec., '
+            f'writes {self.writes:.2f} sec., overlap '
+            f'{self.overlap:.2f} sec. ({ratio:.0f}% of the shortest)'
+        )
+        if self.partition:
+            report += ''.join(
+                f'\n  writer {writer["writer"]}: {writer["rows"]} rows, '
+                f'{writer["seconds"]:.2f} sec., '
+                f'{writer["rows_per_second"]:.1f} rows/sec.'
+                for writer in self.writer_report()
+            )
+        return report
+
+    def counters(self) -> Dict[str, int]:
+        counters: Dict[str, int] = super().counters()
+        for loader in self.loaders:
+            for name, value in loader.counters().items():
+                counters[name] += value
+        return counters
+
+    def take_rejected_ids(self) -> Set[int]:
+        return set().union(*(loader.take_rejected_ids()
+                             for loader in self.loaders))
+
+    def close(self) -> None:
+        for loader in self.loaders:
+            loader.close()
+            # Each writer has its own database, holding pooled connections
+            loader.db.close()
+
+
+COPY_ESCAPES: Dict[str, str] = {'t': '\t', 'n': '\n', 'r': '\r'}
+
+
+def copy_unescape(field: str) -> Optional[str]:
+    '''Decodes a field encoded by copy_value'''
+    if field == '\\N':
+        return None
+    return re.sub(r'\\(.)', lambda m: COPY_ESCAPES.get(m[1], m[1]), field)
+
+
+class DatasetWriter:
+    '''Records the writes of a populate() run into a cache entry. Rows
+       are stored per operation, gzip-compressed in the COPY text format'''
+    def __init__(self, directory: str) -> None:
+        self.directory = directory
+        os.makedirs(directory)
+        self.operations: List[Dict[str, Any]] = []
+        # Stages running concurrently share the writer
+        self.lock = threading.Lock()
+
+    def _write(self, operation: Dict[str, Any],
+               columns: Optional[List[str]],
+               rows: Iterable[Any]) -> Iterator[Any]:
+        with self.lock:
+            operation['file'] = f'{len(self.operations):03d}-' \
+                f'{operation["table"]}.copy.gz'
+            self.operations.append(operation)
+        with gzip.open(os.path.join(self.directory, operation['file']),
+                       'wt', encoding='utf-8') as f:
+            values_of: Optional[Callable] = None
+            for row in rows:
+                if values_of is None:
+                    # Rows without columns are (id, value) pairs
+                    values_of = row_getter(row, columns) if columns \
+                        else tuple
+                f.write('\t'.join(copy_value(v) for v in values_of(row))
+                        + '\n')
+                yield row
+
+    def rows(self, table: str, rows: Iterable[Any],
+             on_conflict: Optional[str] = None) -> Iterator[Any]:
+        iterator: Iterator[Any] = iter(rows)
+        first: Optional[Any] = next(iterator, None)
+        if first is None:
+            return
+        columns: List[str] = row_columns(first)
+        yield from self._write(
+            {'operation': 'load', 'table': table, 'columns': columns,
+             'on_conflict': on_conflict},
+            columns, itertools.chain([first], iterator)
+        )
+
+    def pairs(self, table: str, column: str,
+              values: Iterable[Tuple[int, int]]) -> Iterator[Any]:
+        yield from self._write(
+            {'operation': 'update', 'table': table, 'column': column},
+            None, values
+        )
+
+    def join(self, table: str, column: str, source: str,
+             foreign_key: str) -> None:
+        '''Records an update_join(), which has no rows to store'''
+        with self.lock:
+            self.operations.append({
+                'operation': 'update_join', 'table': table,
+                'column': column, 'source': source,
+                'foreign_key': foreign_key,
+            })
+
+    def commit(self, params: Dict[str, Any]) -> None:
+        with open(os.path.join(self.directory, 'manifest.json'), 'w') as f:
+            json.dump({'params': params, 'operations': self.operations}, f)
+
+
+class CachingLoader(Loader):
+    '''Loader writing through another one, while recording every row
+       into a DatasetWriter'''
+    def __init__(self, loader: Loader, writer: DatasetWriter) -> None:
+        super().__init__(loader.db, loader.batch_size)
+        self.loader = loader
+        self.writer = writer
+
+    def load(self, table: str, rows: Iterable[Any],
+             on_conflict: Optional[str] = None) -> int:
+        return self.loader.load(
+            table, self.writer.rows(table, rows, on_conflict), on_conflict
+        )
+
+    def reserve_ids(self, table: str, size: int) -> List[int]:
+        return self.loader.reserve_ids(table, size)
+
+    def update(self, table: str, column: str,
+               values: Iterable[Tuple[int, int]]) -> int:
+        return self.loader.update(
+            table, column, self.writer.pairs(table, column, values)
+        )
+
+    def update_join(self, table: str, column: str, source: str,
+                    foreign_key: str) -> None:
+        self.writer.join(table, column, source, foreign_key)
+        self.loader.update_join(table, column, source, foreign_key)
+
+    def counters(self) -> Dict[str, int]:
+        return self.loader.counters()
+
+    def take_rejected_ids(self) -> Set[int]:
+        return self.loader.take_rejected_ids()
+
+
+class MeteredLoader(Loader):
+    '''Loader writing through another one, while measuring the rows
+       it is given: rows generated and written, and the time spent
+       generating them (Faker, hashing) apart from the database'''
+    def __init__(self, loader: Loader) -> None:
+        super().__init__(loader.db, loader.batch_size)
+        self.loader = loader
+        self.generation = 0.0
+        self.generated = 0
+        self.written = 0
+        # Database time spent while generating, reserving IDs
+        self.reserving = 0.0
+
+    def metered(self, rows: Iterable[Any]) -> Iterator[Any]:
+        iterator: Iterator[Any] = iter(rows)
+        while True:
+            s: float = time.perf_counter()
+            row: Any = next(iterator, None)
+            self.generation += time.perf_counter() - s
+            if row is None:
+                return
+            self.generated += 1
+            yield row
+
+    def query(self, query: str, **params: Any) -> records.RecordCollection:
+        return self.loader.query(query, **params)
+
+    def load(self, table: str, rows: Iterable[Any],
+             on_conflict: Optional[str] = None) -> int:
+        count: int = self.loader.load(table, self.metered(rows), on_conflict)
+        self.written += count
+        return count
+
+    def reserve_ids(self, table: str, size: int) -> List[int]:
+        s: float = time.perf_counter()
+        ids: List[int] = self.loader.reserve_ids(table, size)
+        self.reserving += time.perf_counter() - s
+        return ids
+
+    def is_empty(self, table: str) -> bool:
+        return self.loader.is_empty(table)
+
+    def restore_sequence(self, table: str) -> None:
+        self.loader.restore_sequence(table)
+
+    def update(self, table: str, column: str,
+               values: Iterable[Tuple[int, int]]) -> int:
+        count: int = self.loader.update(table, column, self.metered(values))
+        self.written += count
+        return count
+
+    def update_join(self, table: str, column: str, source: str,
+                    foreign_key: str) -> None:
+        self.loader.update_join(table, column, source, foreign_key)
+
+    def counters(self) -> Dict[str, int]:
+        return self.loader.counters()
+
+    def take_rejected_ids(self) -> Set[int]:
+        return self.loader.take_rejected_ids()
+
+    def snapshot(self) -> Dict[str, float]:
+        return {'generation': self.generation - self.reserving,
+                'generated': self.generated, 'written': self.written,
+                **self.counters()}
+
+
+class DatasetCache:
+    '''On-disk cache of generated datasets, one directory per key (seed,
+       size, schema and generation options). Entries are evicted least
+       recently used first once the cache exceeds limit bytes'''
+    def __init__(self, directory: str, limit: int = 1024 ** 3) -> None:
+        self.directory = directory
+        self.limit = limit
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def key(params: Dict[str, Any]) -> str:
+        return hashlib.sha256(
+            json.dumps(params, sort_keys=True).encode()
+        ).hexdigest()[:16]
+
+    def path(self, key: str, *names: str) -> str:
+        return os.path.join(self.directory, key, *names)
+
+    def exists(self, key: str) -> bool:
+        return os.path.isfile(self.path(key, 'manifest.json'))
+
+    def writer(self, key: str) -> DatasetWriter:
+        shutil.rmtree(self.path(key + '.tmp'), ignore_errors=True)
+        return DatasetWriter(self.path(key + '.tmp'))
+
+    def commit(self, key: str, writer: DatasetWriter,
+               params: Dict[str, Any]) -> List[str]:
+        '''Publishes the entry written by writer, then evicts the least
+           recently used entries beyond the limit'''
+        writer.commit(params)
+        shutil.rmtree(self.path(key), ignore_errors=True)
+        os.rename(writer.directory, self.path(key))
+        return self.prune()
+
+    def replay(self, key: str, loader: Loader) -> None:
+        '''Writes a cached dataset with loader, into an empty database:
+           rows are replayed with the IDs they were generated with'''
+        with open(self.path(key, 'manifest.json')) as f:
+            operations: List[Dict[str, Any]] = json.load(f)['operations']
+        tables: List[str] = [o['table'] for o in operations
+                             if o['operation'] == 'load']
+        if not all(loader.is_empty(table) for table in tables):
+            raise ValueError('Cached datasets can only be replayed '
+                             'into an empty database')
+        for operation in operations:
+            print(f'REPLAYING {operation["table"].upper()}')
+            if operation['operation'] == 'update_join':
+                loader.update_join(operation['table'], operation['column'],
+                                   operation['source'],
+                                   operation['foreign_key'])
+                continue
+            rows: Iterator[List[Optional[str]]] = self._read(
+                key, operation['file']
+            )
+            if operation['operation'] == 'load':
+                columns: List[str] = operation['columns']
+                loader.load(operation['table'],
+                            (dict(zip(columns, row)) for row in rows),
+                            operation['on_conflict'])
+            else:
+                loader.update(operation['table'], operation['column'],
+                              ((int(row[0]), int(row[1])) for row in rows))
+        for operation in operations:
+            if 'id' in operation.get('columns', []):
+                loader.restore_sequence(operation['table'])
+        os.utime(self.path(key, 'manifest.json'))
+
+    def _read(self, key: str, filename: str) -> Iterator[List[Optional[str]]]:
+        with gzip.open(self.path(key, filename), 'rt', encoding='utf-8') as f:
+            for line in f:
+                yield [copy_unescape(field)
+                       for field in line.rstrip('\n').split('\t')]
+
+    def entries(self) -> List[Dict[str, Any]]:
+        '''Cached datasets, most recently used first'''
+        entries: List[Dict[str, Any]] = []
+        for key in os.listdir(self.directory):
+            if not self.exists(key):
+                continue
+            with open(self.path(key, 'manifest.json')) as f:
+                params: Dict[str, Any] = json.load(f)['params']
+            entries.append({
+                'key': key,
+                'params': params,
+                'bytes': sum(os.path.getsize(self.path(key, name))
+                             for name in os.listdir(self.path(key))),
+                'last_used': os.path.getmtime(
+                    self.path(key, 'manifest.json')
+                ),
+            })
+        return sorted(entries, key=lambda e: e['last_used'], reverse=True)
+
+    def prune(self, limit: Optional[int] = None) -> List[str]:
+        '''Evicts the least recently used entries beyond limit bytes.
+           Returns the keys of the evicted entries'''
+        limit = self.limit if limit is None else limit
+        evicted: List[str] = []
+        total: int = 0
+        for entry in self.entries():
+            total += entry['bytes']
+            if total > limit:
+                shutil.rmtree(self.path(entry['key']))
+                evicted.append(entry['key'])
+        return evicted
+
+
+class DeferredConstraints:
+    '''Foreign keys, and primary keys of the associative tables, dropped
+       before a bulk load then added back once every row is written, with
+       one ALTER TABLE per table: each constraint is checked in one pass
+       over the table instead of once per row. The rows violating a
+       constraint that cannot be added back are reported'''
+    def __init__(self, loader: Loader, sample: int = 10) -> None:
+        self.loader = loader
+        self.sample = sample
+        self.constraints: List[Dict[str, Any]] = []
+
+    def drop(self) -> None:
+        # Primary keys first, as they are added back first
+        self.constraints = [row.as_dict() for row in self.loader.query(
+            '''SELECT conrelid::regclass::text AS "table", conname AS name,
+            pg_get_constraintdef(oid) AS definition
+            FROM pg_constraint
+            WHERE connamespace = current_schema()::regnamespace
+            AND (contype = 'f'
+                 OR (contype = 'p' AND array_length(conkey, 1) > 1))
+            ORDER BY contype DESC, conname;'''
+        )]
+        for table, constraints in self.per_table().items():
+            self.loader.query(f'''ALTER TABLE {table} {", ".join(
+                f'DROP CONSTRAINT {c["name"]}' for c in constraints
+            )};''')
+
+    def per_table(self) -> Dict[str, List[Dict[str, Any]]]:
+        tables: Dict[str, List[Dict[str, Any]]] = {}
+        for constraint in self.constraints:
+            tables.setdefault(constraint['table'], []).append(constraint)
+        return tables
+
+    def restore(self) -> None:
+        '''Adds the dropped constraints back, or raises ValueError after
+           printing a sample of the rows violating each one left out'''
+        failed: List[Dict[str, Any]] = []
+        for table, constraints in self.per_table().items():
+            try:
+                self._add(table, constraints)
+            except DBAPIError:
+                # Adds them one by one, to find out the faulty ones
+                for constraint in constraints:
+                    try:
+                        self._add(table, [constraint])
+                    except DBAPIError:
+                        failed.append(constraint)
+        for constraint in failed:
+            print(f'CONSTRAINT {constraint["name"]} VIOLATED: '
+                  f'{constraint["definition"]}')
+            for row in self.violations(constraint):
+                print(f'  {constraint["table"]} {row}')
+        self.constraints = []
+        if failed:
+            raise ValueError('Constraints left out after the load: ' +
+                             ', '.join(c['name'] for c in failed))
+
+    def _add(self, table: str, constraints: List[Dict[str, Any]]) -> None:
+        self.loader.query(f'''ALTER TABLE {table} {", ".join(
+            f'ADD CONSTRAINT {c["name"]} {c["definition"]}'
+            for c in constraints
+        )};''')
+
+    def violations(self, constraint: Dict[str, Any]) -> List[Dict[str, Any]]:
+        '''Sample of the rows of the table violating constraint: the
+           duplicated keys, or the dangling references'''
+        table: str = constraint['table']
+        definition: str = constraint['definition']
+        primary: Optional[Any] = re.match(r'PRIMARY KEY \((.*)\)', definition)
+        if primary:
+            return [row.as_dict() for row in self.loader.query(
+                f'''SELECT {primary[1]}, count(*) AS copies FROM {table}
+                GROUP BY {primary[1]} HAVING count(*) > 1
+                LIMIT {self.sample};'''
+            )]
+        column, target, key = re.match(
+            r'FOREIGN KEY \((\w+)\) REFERENCES (\w+)\((\w+)\)', definition
+        ).groups()
+        return [row.as_dict() for row in self.loader.query(
+            f'''SELECT t.* FROM {table} t
+            LEFT JOIN {target} r ON r.{key} = t.{column}
+            WHERE t.{column} IS NOT NULL AND r.{key} IS NULL
+            LIMIT {self.sample};'''
+        )]
+
+
+class Checkpoint:
+    '''Progress of a populate() run, saved to a JSON file after every
+       chunk of loaded rows and every stage. A run started again with the
+       same file and parameters skips the completed stages, restoring the
+       IDs they produced, and the chunks already loaded by the interrupted
+       one, regenerated from its seed then dropped. The highest ID saved
+       for a table is its watermark: rows above it were written by a chunk
+       left unfinished'''
+    def __init__(self, path: str, params: Dict[str, Any],
+                 every: int = 10000) -> None:
+        self.path = path
+        self.every = every
+        self.lock = threading.Lock()
+        self.state: Dict[str, Any] = {'params': params, 'stages': {}}
+        if os.path.exists(path):
+            with open(path) as f:
+                state: Dict[str, Any] = json.load(f)
+            if state['params'] != params:
+                raise ValueError(f'Checkpoint {path} was written by a run '
+                                 'with other parameters')
+            self.state = state
+
+    @staticmethod
+    def encode(value: Any) -> Dict[str, Any]:
+        if isinstance(value, IdRanges):
+            return {'ranges': list(zip(value.starts, value.stops))}
+        return {'value': value}
+
+    @staticmethod
+    def decode(value: Dict[str, Any]) -> Any:
+        if 'ranges' in value:
+            return IdRanges(itertools.chain.from_iterable(
+                range(start, stop) for start, stop in value['ranges']
+            ))
+        return value['value']
+
+    def done(self, stage: str) -> bool:
+        return self.state['stages'].get(stage, {}).get('done', False)
+
+    def loaded(self, stage: str) -> Tuple[IdRanges, Optional[int], int]:
+        '''IDs of the rows loaded so far by an interrupted stage, the
+           watermark of its table, and the number of rows it generated
+           (more than the IDs when rows were left out)'''
+        progress: Dict[str, Any] = self.state['stages'].get(stage, {})
+        if 'ids' not in progress:
+            return IdRanges(), None, 0
+        ids: IdRanges = self.decode(progress['ids'])
+        return ids, progress['watermark'], progress.get('rows', len(ids))
+
+    def values(self, stage: str) -> Dict[str, Any]:
+        '''Attributes set by a completed stage'''
+        return {name: self.decode(value) for name, value in
+                self.state['stages'][stage]['values'].items()}
+
+    def progress(self, stage: str, ids: IdRanges, watermark: int,
+                 rows: int) -> None:
+        with self.lock:
+            self.state['stages'][stage] = {
+                'done': False, 'ids': self.encode(ids), 'watermark': watermark,
+                'rows': rows,
+            }
+            self.save()
+
+    def complete(self, stage: str, values: Dict[str, Any]) -> None:
+        with self.lock:
+            self.state['stages'][stage] = {
+                'done': True,
+                'values': {name: self.encode(value)
+                           for name, value in values.items()},
+            }
+            self.save()
+
+    def save(self) -> None:
+        # Written aside then renamed: an interruption leaves either file
+        with open(self.path + '.tmp', 'w') as f:
+            json.dump(self.state, f)
+        os.replace(self.path + '.tmp', self.path)
+
+    def remove(self) -> None:
+        os.remove(self.path)
+
+
+@dataclass
+class Stage:
+    '''Stage of populate(): inserts the rows of its tables, or sets the
+       column of the rows of its only table (back-references)'''
+    label: str
+    run: Callable[[], Any]
+    tables: Tuple[str, ...]
+    column: Optional[str] = None
+    # Attributes of DatabaseFeeder set by the stage, for later stages
+    state: Tuple[str, ...] = ()
+
+    @property
+    def name(self) -> str:
+        return self.run.__name__.lstrip('_')
+
+
+def schema_references(path: str = SCHEMA_FILE) -> Dict[str, Dict[str, str]]:
+    '''Foreign keys of the schema: referenced table of each column, per
+       table, from inline REFERENCES and ALTER TABLE constraints'''
+    with open(path) as f:
+        schema: str = f.read()
+    references: Dict[str, Dict[str, str]] = {}
+    for table, body in re.findall(r'CREATE TABLE (\w+) \((.*?)\n\);',
+                                  schema, re.S):
+        for column, target in re.findall(r'^\s*(\w+) \w+ REFERENCES (\w+)',
+                                         body, re.M):
+            references.setdefault(table, {})[column] = target
+    for table, column, target in re.findall(
+            r'ALTER TABLE (\w+)\s+ADD CONSTRAINT \w+\s+'
+            r'FOREIGN KEY \((\w+)\)\s+REFERENCES (\w+)', schema):
+        references.setdefault(table, {})[column] = target
+    return references
+
+
+def stage_dependencies(stages: List[Stage],
+                       references: Dict[str, Dict[str, str]])\
+        -> Dict[str, Set[str]]:
+    '''Stages each stage waits for: the ones inserting the tables its
+       rows reference, except for the back-references left NULL until an
+       update stage sets them'''
+    inserted_by: Dict[str, str] = {table: stage.name for stage in stages
+                                   if stage.column is None
+                                   for table in stage.tables}
+    deferred: Set[Tuple[str, str]] = {(stage.tables[0], stage.column)
+                                      for stage in stages if stage.column}
+    dependencies: Dict[str, Set[str]] = {}
+    for stage in stages:
+        if stage.column is None:
+            targets: Set[str] = {
+                target for table in stage.tables
+                for column, target in references.get(table, {}).items()
+                if (table, column) not in deferred
+            }
+        else:
+            targets = {stage.tables[0],
+                       references[stage.tables[0]][stage.column]}
+        dependencies[stage.name] = {
+            inserted_by[t] for t in targets if t in inserted_by
+        } - {stage.name}
+    return dependencies
+
+
+def critical_path(metrics: List[Dict[str, Any]],
+                  dependencies: Dict[str, Set[str]])\
+        -> Tuple[List[str], float]:
+    '''Longest chain of dependent stages, weighted by their durations:
+       the shortest populate() possible with unlimited concurrency.
+       metrics are in a valid execution order'''
+    finish: Dict[str, float] = {}
+    previous: Dict[str, Optional[str]] = {}
+    for stage in metrics:
+        # Stages restored from a checkpoint took no time
+        before: Optional[str] = max(
+            (name for name in dependencies[stage['stage']] if name in finish),
+            key=finish.__getitem__, default=None
+        )
+        finish[stage['stage']] = stage['seconds'] + \
+            (finish[before] if before else 0.0)
+        previous[stage['stage']] = before
+    if not finish:
+        return [], 0.0
+    last: Optional[str] = max(finish, key=finish.__getitem__)
+    total: float = finish[last]
+    path: List[str] = []
+    while last:
+        path.append(last)
+        last = previous[last]
+    return path[::-1], total
 
 
 class DatabaseFeeder:
-    '''Main class used to feed all tables in the database'''
-    address_ids: List[int]
-    member_ids: List[int]
+    '''Main class used to feed all tables in the database. In streaming
+       mode, the IDs of the large tables are kept as IdRanges and no
+       per-row state outlives its batch, so that memory stays bounded by
+       the batch size whatever the size. With several stage workers, the
+       stages independent from each other run concurrently, each one with
+       its own connection and generation context. In append mode, the
+       rows of the reference tables already present are reused, and new
+       rows only reference them or the rows of the same run'''
+    address_ids: Sequence[int]
+    member_ids: Sequence[int]
     pizzeria_ids: List[int]
     user_accounts: Dict[int, int]
+    user_account_ids: Sequence[int]
+    taken_order_ids: Sequence[int]
     recipes: Dict[str, int]
     product_ids: List[int]
     catalog_item_ids: List[int]
     order_status_ids: List[int]
     keyword_ids: List[int]
     permission_ids: List[int]
-    bill_ids: List[int]
+    bill_ids: Sequence[int]
 
     def __init__(self, user: str, password: str,
-                 host: str, dbname: str, size: int = 10) -> None:
-        self.db = records.Database(
-            f'postgresql://{user}:{password}@{host}/{dbname}'
-        )
+                 host: str, dbname: str, size: int = 10,
+                 batch_size: int = 500, loader: str = 'insert',
+                 seed: Optional[int] = None,
+                 password_hashing: str = 'real',
+                 password_pool_size: int = 100,
+                 password_rounds: int = 1000, workers: int = 1,
+                 cache: Optional[DatasetCache] = None,
+                 output: Optional[str] = None, pipeline_writers: int = 0,
+                 queue_size: int = 4, partition: bool = False,
+                 streaming: bool = False,
+                 columnar: bool = False, report: Optional[str] = None,
+                 profile: Optional[List[str]] = None,
+                 stage_workers: int = 1, fast_load: bool = False,
+                 summary: bool = False, append: bool = False,
+                 checkpoint: Optional[str] = None,
+                 checkpoint_every: int = 10000, commit_every: int = 0,
+                 bisect: bool = False,
+                 session_settings: Optional[List[str]] = None,
+                 url: Optional[str] = None) -> None:
+        sqlite: bool = bool(url) and url.startswith('sqlite')
+        if url and output:
+            raise ValueError('Offline scripts need no database URL')
+        if sqlite and (loader != 'insert' or pipeline_writers > 0
+                       or stage_workers > 1 or fast_load or summary
+                       or session_settings or cache):
+            raise ValueError('SQLite databases are written by a single '
+                             'insert loader, without cache, fast load, '
+                             'summaries nor session settings')
+        if streaming and workers > 1:
+            raise ValueError('Streaming mode generates the tables in a '
+                             'single process, without --workers')
+        if stage_workers > 1 and (output or pipeline_writers > 0):
+            raise ValueError('Concurrent stages need their own database '
+                             'connections: no --output nor --pipeline-writers')
+        if partition and pipeline_writers < 1:
+            raise ValueError('Partitions are written by the pipeline '
+                             'writers')
+        if fast_load and output:
+            raise ValueError('Offline scripts already add the constraints '
+                             'after the rows')
+        if fast_load and append:
+            raise ValueError('Fast load drops the primary keys the appended '
+                             'rows are deduplicated against')
+        if summary and output:
+            raise ValueError('Summary tables are built in a live database')
+        if append and output:
+            raise ValueError('Offline scripts restore into empty databases')
+        if append and cache:
+            raise ValueError('Appended rows depend on the rows already in '
+                             'the database: they cannot be cached')
+        if (commit_every > 0 or bisect) and (loader != 'insert' or output):
+            raise ValueError('Explicit transactions and bisection are '
+                             'those of the insert loader')
+        if checkpoint and (seed is None or cache or output):
+            raise ValueError('Resuming from a checkpoint regenerates the '
+                             'rows already loaded: it needs a seed, and '
+                             'neither the cache nor --output')
         self.size = size
+        self.streaming = streaming
+        self.hasher_options: Dict[str, Any] = {
+            'mode': password_hashing,
+            'pool_size': password_pool_size,
+            'rounds': password_rounds,
+        }
+        self.main_ctx = GenerationContext(
+            seed, hasher=PasswordHasher.create(**self.hasher_options),
+            streaming=streaming, columnar=columnar
+        )
+        # Generation context and loader of the stage run by each thread
+        self.local = threading.local()
+        self.generator: type = \
+            ColumnarGenerator if columnar else RandomDataGenerator
+        self.loader_options: Dict[str, Any] = {
+            'commit_every': commit_every, 'bisect': bisect,
+        } if loader == 'insert' else {}
+        if output:
+            # Offline mode: no database connection at all
+            self.db: Optional[records.Database] = None
+            self.main_loader: Loader = FileLoader(output,
+                                                  batch_size=batch_size)
+        else:
+            url = url or f'postgresql://{user}:{password}@{host}/{dbname}'
+            if session_settings:
+                # Set by the server on every connection of the run
+                url += ('&' if '?' in url else '?') + 'options=' + \
+                    urllib.parse.quote(' '.join(
+                        f'-c {setting}' for setting in session_settings
+                    ))
+            self.db = records.Database(url)
+            if sqlite:
+                self.main_loader = SqliteLoader(
+                    self.db, batch_size=batch_size, **self.loader_options
+                )
+            elif pipeline_writers > 0:
+                self.main_loader = PipelineLoader(
+                    self.db, batch_size, loader, pipeline_writers,
+                    queue_size, partition, **self.loader_options
+                )
+            else:
+                self.main_loader = LOADERS[loader](
+                    self.db, batch_size=batch_size, **self.loader_options
+                )
+        self.loader_name = loader
+        self.batch_size = batch_size
+        self.workers = workers
+        self.stage_workers = stage_workers
+        self.fast_load = fast_load
+        self.summary = summary
+        self.append = append
+        self.executor: Optional[ProcessPoolExecutor] = None
+        self.executor_lock = threading.Lock()
+        self.cache = cache
+        with open(SCHEMA_FILE, 'rb') as f:
+            schema: str = hashlib.sha256(f.read()).hexdigest()
+        # Everything the generated dataset depends on
+        self.cache_params: Dict[str, Any] = {
+            'version': CACHE_VERSION, 'schema': schema, 'seed': seed,
+            'size': size, 'workers': workers, 'streaming': streaming,
+            'columnar': columnar, **self.hasher_options,
+            # Concurrent or resumable stages draw from their own seeds
+            'stage_seeds': stage_workers > 1 or checkpoint is not None,
+        }
+        self.report = report
+        self.profile: List[str] = profile or []
+        self.run_params: Dict[str, Any] = {
+            **self.cache_params, 'loader': loader, 'batch_size': batch_size,
+            'pipeline_writers': pipeline_writers, 'partition': partition,
+            'output': output,
+            'stage_workers': stage_workers, 'fast_load': fast_load,
+            'summary': summary, 'append': append,
+            'commit_every': commit_every, 'bisect': bisect,
+            'session_settings': session_settings or [],
+        }
+        self.checkpoint: Optional[Checkpoint] = Checkpoint(
+            checkpoint, {**self.cache_params, 'append': append},
+            checkpoint_every
+        ) if checkpoint else None
+        if fast_load and not all(
+                self.main_loader.is_empty(table)
+                for stage in self.stages() for table in stage.tables):
+            self.main_loader.close()
+            self.db.close()
+            raise ValueError('Fast load drops the primary keys the rows '
+                             'are deduplicated against: it needs an empty '
+                             'database')
+
+    @property
+    def join_user_accounts(self) -> bool:
+        return self.streaming or self.checkpoint is not None
+
+    @property
+    def ctx(self) -> GenerationContext:
+        return getattr(self.local, 'ctx', self.main_ctx)
+
+    @property
+    def loader(self) -> Loader:
+        return getattr(self.local, 'loader', self.main_loader)
+
+    def _generate(self, method: str, *args: Any) -> Iterator[Any]:
+        '''Rows of the RandomDataGenerator method for self.size rows, or
+           fewer when rows they reference were left out. With several
+           workers, the table is split into shards generated in separate
+           processes, each one seeded from the global seed and its index,
+           and merged in shard order'''
+        size: int = min([self.size, *(
+            len(args[index]) for index in PARENT_IDS.get(method, ())
+        )])
+        if self.workers <= 1 or method not in SHARDED_GENERATORS:
+            yield from getattr(self.generator, method)(
+                self.ctx, *args, size=size
+            )
+            return
+        with self.executor_lock:
+            if self.executor is None:
+                self.executor = ProcessPoolExecutor(self.workers)
+        index, shuffle = SHARDED_GENERATORS[method]
+        sizes: List[int] = RandomDataGenerator.shards(size, self.workers)
+        shard_args: List[Tuple[Any, ...]] = [args] * self.workers
+        if index is not None:
+            ids: List[int] = list(args[index])
+            if len(ids) < size:
+                raise ValueError(f'Not enough ids to generate {method}')
+            if shuffle:
+                self.ctx.random.shuffle(ids)
+            offset: int = 0
+            for shard, size in enumerate(sizes):
+                shard_args[shard] = args[:index] \
+                    + (ids[offset:offset + size],) + args[index + 1:]
+                offset += size
+        results: Iterator[Tuple[List[Any], int, float]] = self.executor.map(
+            generate_shard, [method] * self.workers,
+            [self.ctx.seed] * self.workers, range(self.workers),
+            [self.hasher_options] * self.workers, shard_args, sizes,
+            [self.ctx.columnar] * self.workers
+        )
+        for rows, hashes, elapsed in results:
+            self.ctx.hasher.record(hashes, elapsed)
+            yield from rows
+
+    def _ids(self) -> Any:
+        '''Container of the IDs of a large table. IdRanges are never
+           shuffled in place, so a resumed stage sees the same IDs'''
+        return IdRanges() if self.streaming or self.checkpoint else []
+
+    def _load_entities(self, table: str, rows: Iterable[Any],
+                       on_batch: Optional[Callable] = None) -> Any:
+        '''Loads the rows of a large table. With a checkpoint, they are
+           loaded by chunks, each one saved once written, and the chunks
+           already loaded by an interrupted run are skipped'''
+        if self.checkpoint is None:
+            return self.loader.load_entities(table, rows, on_batch,
+                                             ids=self._ids())
+        stage: str = self.local.stage.name
+        ids: IdRanges
+        watermark: Optional[int]
+        ids, watermark, generated = self.checkpoint.loaded(stage)
+        if watermark is None:
+            # Primary key lookup, whatever the size of the table
+            watermark = self.loader.query(
+                f'''SELECT coalesce(max(id), 0) AS id FROM {table};'''
+            )[0].id
+            self.checkpoint.progress(stage, ids, watermark, 0)
+        else:
+            print(f'  resuming after {generated} rows')
+            self.loader.query(
+                f'''DELETE FROM {table} WHERE id > :watermark;''',
+                watermark=watermark
+            )
+        # Rows are counted as generated rather than by their IDs, as the
+        # rows left out by the loader have none
+        counted: List[int] = [generated]
+
+        def counting() -> Iterator[Any]:
+            for row in itertools.islice(rows, generated, None):
+                counted[0] += 1
+                yield row
+        iterator: Iterator[Any] = counting()
+        while True:
+            generated = counted[0]
+            self.loader.load_entities(
+                table, itertools.islice(iterator, self.checkpoint.every),
+                on_batch, ids=ids
+            )
+            if counted[0] == generated:
+                return ids
+            if ids:
+                watermark = max(watermark, ids[-1])
+            self.checkpoint.progress(stage, ids, watermark, counted[0])
+
+    def _existing_ids(self, table: str) -> Optional[List[int]]:
+        '''In append mode, IDs of the rows of a reference table already
+           filled, reused instead of inserting the same rows again'''
+        if not self.append or self.loader.is_empty(table):
+            return None
+        return [row.id for row in self.loader.query(
+            f'''SELECT id FROM {table} ORDER BY id;'''
+        )]
+
+    def stages(self) -> List[Stage]:
+        '''Stages of populate(), in sequential execution order, with the
+           tables they write'''
+        return [
+            Stage('INSERTING ADDRESS', self._insert_addresses, ('address',),
+                  state=('address_ids',)),
+            Stage('INSERTING PIZZERIAS', self._insert_pizzerias,
+                  ('pizzeria',), state=('pizzeria_ids',)),
+            Stage('INSERTING ROLES', self._insert_roles, ('role',),
+                  state=('role_ids',)),
+            Stage('INSERTING MEMBERS', self._insert_members, ('member',),
+                  state=('member_ids',)),
+            Stage('INSERTING USER ACCOUNTS', self._insert_user_accounts,
+                  ('user_account',), state=('user_account_ids',)),
+            Stage('UPDATING MEMBERS USER ACCOUNTS',
+                  self._update_members_user_account, ('member',),
+                  'user_account_id'),
+            Stage('INSERTING RECIPES', self._insert_recipes, ('recipe',),
+                  state=('recipes',)),
+            Stage('INSERTING PRODUCTS', self._insert_products, ('product',),
+                  state=('product_ids',)),
+            Stage('INSERTING CATALOG ITEMS', self._insert_catalog_items,
+                  ('catalog_item',), state=('catalog_item_ids',)),
+            Stage('INSERTING ORDER STATUS', self._insert_order_status,
+                  ('order_status',), state=('order_status_ids',)),
+            Stage('INSERTING TAKEN ORDERS', self._insert_taken_orders,
+                  ('taken_order',), state=('taken_order_ids',)),
+            Stage('INSERTING BILLS', self._insert_bills, ('bill',),
+                  state=('bill_ids',)),
+            Stage('INSERTING KEYWORDS', self._insert_keywords, ('keyword',),
+                  state=('keyword_ids',)),
+            Stage('INSERTING PERMISSIONS', self._insert_permissions,
+                  ('permission',), state=('permission_ids',)),
+            Stage('UPDATING ORDERS BILLS', self._update_order_bill,
+                  ('taken_order',), 'bill_id'),
+            Stage('POPULATING ASSOCIATIVE ENTITIES',
+                  self._insert_relations_many_to_many,
+                  ('has_permission_to', 'contains_item', 'requires_product',
+                   'has_product_in_stock', 'has_keyword'),
+                  state=('relation_counts',)),
+        ]
+
+    def _run_stage(self, stage: Stage, loader: Loader,
+                   ctx: Optional[GenerationContext] = None) -> Dict[str, Any]:
+        '''Runs a stage of populate() through loader and returns its
+           metrics. Generation covers the time spent producing rows (Faker,
+           hashing), database the rest of the stage (encoding, writes,
+           waits)'''
+        metered: MeteredLoader = MeteredLoader(loader)
+        self.local.loader = metered
+        self.local.stage = stage
+        if ctx is not None:
+            self.local.ctx = ctx
+        before: Dict[str, float] = metered.snapshot()
+        hashing: float = self.ctx.hasher.elapsed
+        profile: Optional[cProfile.Profile] = \
+            cProfile.Profile() if stage.name in self.profile else None
+        s: float = time.perf_counter()
+        try:
+            if profile:
+                profile.runcall(stage.run)
+            else:
+                stage.run()
+        finally:
+            del self.local.loader
+            del self.local.stage
+            if ctx is not None:
+                del self.local.ctx
+        seconds: float = time.perf_counter() - s
+        after: Dict[str, float] = metered.snapshot()
+        delta: Dict[str, float] = {k: after[k] - before[k] for k in after}
+        metrics: Dict[str, Any] = {
+            'stage': stage.name,
+            'label': stage.label,
+            'seconds': seconds,
+            'generation_seconds': delta['generation'],
+            'hashing_seconds': self.main_ctx.hasher.elapsed - hashing,
+            'database_seconds': max(seconds - delta['generation'], 0.0),
+            'rows_generated': int(delta['generated']),
+            'rows_written': int(delta['written']),
+            'statements': int(delta['statements']),
+            'round_trips': int(delta['round_trips']),
+            'rows_rejected': int(delta['rejected']),
+            'rows_per_second': delta['written'] / seconds if seconds else 0.0,
+            'max_rss_bytes': max_rss(),
+        }
+        # Concurrent stages finish out of order: name them
+        prefix: str = f'  {stage.name}:' if self.stage_workers > 1 else ' '
+        print(f'{prefix} {seconds:.2f} sec. (generation '
+              f'{delta["generation"]:.2f} sec.), '
+              f'{metrics["rows_written"]} rows written, '
+              f'{metrics["statements"]} statements')
+        if profile:
+            metrics['profile'] = f'pop_db-{stage.name}.prof'
+            profile.dump_stats(metrics['profile'])
+            pstats.Stats(profile).sort_stats('cumulative').print_stats(15)
+        if self.checkpoint:
+            self.checkpoint.complete(stage.name, {
+                name: getattr(self, name) for name in stage.state
+            })
+        return metrics
+
+    def _restore_stage(self, stage: Stage) -> bool:
+        '''Restores the attributes of a stage completed by an interrupted
+           run, instead of running it again'''
+        if self.checkpoint is None or not self.checkpoint.done(stage.name):
+            return False
+        print(f'{stage.label} (checkpoint)')
+        for name, value in self.checkpoint.values(stage.name).items():
+            setattr(self, name, value)
+        return True
+
+    def _stage_context(self, stage: Stage) -> GenerationContext:
+        '''Generation context of a stage alone, seeded from the seed and
+           its name: the same whatever the stages run before'''
+        return GenerationContext(
+            shard_seed(self.main_ctx.seed, stage.name, 0),
+            hasher=self.main_ctx.hasher, streaming=self.streaming,
+            columnar=self.main_ctx.columnar
+        )
+
+    def _run_stages(self, writer: Optional[DatasetWriter])\
+            -> List[Dict[str, Any]]:
+        '''Runs the stages in declared order, or as soon as the stages
+           they depend on are done with several stage workers. Concurrent
+           stages each get a pooled connection and a generation context
+           seeded from the seed and their name'''
+        stages: List[Stage] = self.stages()
+        loader: Loader = self.main_loader
+        if writer:
+            loader = CachingLoader(loader, writer)
+        if self.stage_workers <= 1:
+            metrics: List[Dict[str, Any]] = []
+            for stage in stages:
+                if self._restore_stage(stage):
+                    continue
+                print(stage.label)
+                metrics.append(self._run_stage(
+                    stage, loader,
+                    self._stage_context(stage) if self.checkpoint else None
+                ))
+            return metrics
+        dependencies: Dict[str, Set[str]] = \
+            stage_dependencies(stages, schema_references())
+        loaders: List[Loader] = [
+            LOADERS[self.loader_name](records.Database(self.db.db_url),
+                                      self.batch_size, **self.loader_options)
+            for _ in range(self.stage_workers)
+        ]
+        pool: queue.Queue = queue.Queue()
+        for pooled in loaders:
+            pool.put(CachingLoader(pooled, writer) if writer else pooled)
+
+        def run(stage: Stage) -> Dict[str, Any]:
+            stage_loader: Loader = pool.get()
+            try:
+                print(stage.label)
+                return self._run_stage(stage, stage_loader,
+                                       self._stage_context(stage))
+            finally:
+                pool.put(stage_loader)
+
+        metrics = []
+        done: Set[str] = {stage.name for stage in stages
+                          if self._restore_stage(stage)}
+        pending: List[Stage] = [stage for stage in stages
+                                if stage.name not in done]
+        running: Dict[Future, Stage] = {}
+        try:
+            with ThreadPoolExecutor(self.stage_workers) as executor:
+                while pending or running:
+                    for stage in [st for st in pending
+                                  if dependencies[st.name] <= done]:
+                        pending.remove(stage)
+                        running[executor.submit(run, stage)] = stage
+                    if not running:
+                        raise ValueError('Cyclic dependencies between '
+                                         'stages: ' + ', '.join(
+                                             st.name for st in pending))
+                    finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        metrics.append(future.result())
+                        done.add(running.pop(future).name)
+        finally:
+            for pooled in loaders:
+                pooled.close()
+                pooled.db.close()
+        return metrics
 
     def populate(self) -> Any:
         s = time.time()
         print('START')
-        print('INSERTING ADDRESS')
-        self._insert_addresses()
-        print('INSERTING PIZZERIAS')
-        self._insert_pizzerias()
-        print('INSERTING MEMBERS')
-        self._insert_members()
-        print('INSERTING USER ACCOUNTS')
-        self._insert_user_accounts()
-        print('UPDATING MEMBERS USER ACCOUNTS')
-        self._update_members_user_account()
-        print('INSERTING RECIPES')
-        self._insert_recipes()
-        print('INSERTING PRODUCTS')
-        self._insert_products()
-        print('INSERTING CATALOG ITEMS')
-        self._insert_catalog_items()
-        print('INSERTING ORDER STATUS')
-        self._insert_order_status()
-        print('INSERTING TAKEN ORDERS')
-        self._insert_taken_orders()
-        print('INSERTING BILLS')
-        self._insert_bills()
-        print('INSERTING KEYWORDS')
-        self._insert_keywords()
-        print('INSERTING PERMISSIONS')
-        self._insert_permissions()
-        print('INSERTING ROLES')
-        self._insert_roles()
-        print('UPDATING MEMBERS ROLES')
-        self._update_members_role()
-        print('UPDATING ORDERS BILLS')
-        self._update_order_bill()
-        print('POPULATING ASSOCIATIVE ENTITIES')
-        self._insert_relations_many_to_many()
+        stages: List[Dict[str, Any]] = []
+        replayed: bool = False
+        # Datasets are only reproducible, hence cacheable, with a seed
+        cache: Optional[DatasetCache] = \
+            self.cache if self.ctx.seed is not None else None
+        key: str = cache.key(self.cache_params) if cache else ''
+        deferred: Optional[DeferredConstraints] = \
+            DeferredConstraints(self.loader) if self.fast_load else None
+        if deferred:
+            print('DROPPING CONSTRAINTS')
+            deferred.drop()
+        if self.summary:
+            print('INSTALLING SUMMARY TABLES')
+            self._install_summaries()
+        constraints: float = 0.0
+        summaries: float = 0.0
+        try:
+            if cache and cache.exists(key):
+                print(f'REPLAYING CACHED DATASET {key}')
+                cache.replay(key, self.loader)
+                replayed = True
+            else:
+                writer: Optional[DatasetWriter] = \
+                    cache.writer(key) if cache else None
+                stages = self._run_stages(writer)
+                if cache and writer:
+                    print(f'CACHING DATASET {key}')
+                    for evicted in cache.commit(key, writer,
+                                                self.cache_params):
+                        print(f'EVICTED CACHED DATASET {evicted}')
+        finally:
+            if self.summary:
+                print('REFRESHING SUMMARY TABLES')
+                summaries = time.perf_counter()
+                self._refresh_summaries()
+                summaries = time.perf_counter() - summaries
+                print(f'  {summaries:.2f} sec.')
+            if deferred:
+                print('RESTORING CONSTRAINTS')
+                constraints = time.perf_counter()
+                deferred.restore()
+                constraints = time.perf_counter() - constraints
+                print(f'  {constraints:.2f} sec.')
+        if isinstance(self.loader, PipelineLoader):
+            print(self.loader.report())
+        self.loader.close()
+        self.ctx.hasher.close()
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+        if self.checkpoint:
+            self.checkpoint.remove()
         e = time.time()
         print(f'END ({e - s:.2f} sec.)')
-
-    def _insert_addresses(self) -> List[int]:
-        for address in RandomDataGenerator.addresses(size=self.size):
-            self.db.query(
-                '''INSERT INTO address
-                (street_name, home_number, zip_code, country)
-                VALUES (:street_name, :home_number,
-                :zip_code, :country);''', **address.__dict__
+        report: Dict[str, Any] = {
+            'params': self.run_params, 'replayed': replayed,
+            'seconds': e - s, 'max_rss_bytes': max_rss(), 'stages': stages,
+            'constraints_seconds': constraints,
+            'summary_seconds': summaries,
+        }
+        if stages:
+            path, seconds = critical_path(
+                stages, stage_dependencies(self.stages(), schema_references())
             )
-        rows: records.RecordCollection = self.db.query(
-            '''SELECT id FROM address;'''
+            print(f'CRITICAL PATH: {" -> ".join(path)} ({seconds:.2f} sec.)')
+            report['critical_path'] = {'stages': path, 'seconds': seconds}
+        if isinstance(self.loader, PipelineLoader) and self.loader.partition:
+            report['writers'] = self.loader.writer_report()
+        if self.report:
+            with open(self.report, 'w') as f:
+                json.dump(report, f, indent=2)
+        return report
+
+    def _install_summaries(self) -> None:
+        '''Creates the summary tables and their triggers, left disabled
+           during the load: the rows loaded are summarized at once by
+           _refresh_summaries()'''
+        with open(SUMMARY_SCHEMA_FILE) as f:
+            self._execute_summaries(f.read() + self._summary_triggers(False))
+
+    def _refresh_summaries(self) -> None:
+        self._execute_summaries('''SELECT refresh_summaries();'''
+                                + self._summary_triggers(True))
+
+    @staticmethod
+    def _summary_triggers(enabled: bool) -> str:
+        action: str = 'ENABLE' if enabled else 'DISABLE'
+        return ''.join(
+            f'''ALTER TABLE {table} {", ".join(
+                f'{action} TRIGGER {trigger}' for trigger in triggers
+            )};''' for table, triggers in SUMMARY_TRIGGERS.items()
+        )
+
+    def _execute_summaries(self, statements: str) -> None:
+        '''Runs statements in one transaction. records would not commit
+           the SELECT of a function call, nor parse the PL/pgSQL bodies'''
+        connection: Any = psycopg2.connect(dbapi_url(self.db.db_url))
+        try:
+            with connection, connection.cursor() as cursor:
+                cursor.execute(statements)
+        finally:
+            connection.close()
+
+    @staticmethod
+    def _written(mapping: Dict[Any, int],
+                 ids: Sequence[int]) -> Dict[Any, int]:
+        '''mapping to the IDs set by on_batch, without the rows the
+           loader left out afterwards'''
+        if len(mapping) == len(ids):
+            return mapping
+        written: Set[int] = set(ids)
+        return {key: row_id for key, row_id in mapping.items()
+                if row_id in written}
+
+    def _insert_addresses(self) -> Sequence[int]:
+        self.address_ids = self._load_entities(
+            'address', self._generate('addresses')
         )
-        self.address_ids = [r.id for r in rows]
         return self.address_ids
 
     def _insert_pizzerias(self) -> List[int]:
-        for pizzeria in RandomDataGenerator.pizzerias(self.address_ids):
-            self.db.query(
-                '''INSERT INTO pizzeria (name, phone_nb, address_id)
-                VALUES (:name, :phone_nb, :address_id);''',
-                **pizzeria.__dict__
+        self.pizzeria_ids = self._existing_ids('pizzeria') or \
+            self.loader.load_entities(
+                'pizzeria',
+                self.generator.pizzerias(self.ctx, self.address_ids)
             )
-        rows: records.RecordCollection = self.db.query(
-            '''SELECT id FROM pizzeria;'''
-        )
-        self.pizzeria_ids = [r.id for r in rows]
         return self.pizzeria_ids
 
-    def _insert_members(self) -> List[int]:
-        gen_members: Iterator[Member] = RandomDataGenerator\
-            .members(self.address_ids, self.pizzeria_ids, size=self.size)
-        for member in gen_members:
-            self.db.query(
-                '''INSERT INTO member
-                (name, firstname, works_at_pizzeria_id,
-                user_account_id, address_id)
-                VALUES
-                (:name, :firstname, :works_at_pizzeria_id,
-                :user_account_id, :address_id);''',
-                **member.__dict__
-            )
-        rows: records.RecordCollection = self.db.query(
-            '''SELECT id FROM member;'''
+    def _insert_members(self) -> Sequence[int]:
+        gen_members: Iterator[Member] = self._generate(
+            'members', self.address_ids, self.pizzeria_ids, self.role_ids
         )
-        self.member_ids = [r.id for r in rows]
+        self.member_ids = self._load_entities('member', gen_members)
         return self.member_ids
 
-    def _insert_user_accounts(self) -> Dict[int, int]:
-        gen_user_accounts: Iterator[UserAccount] = \
-            RandomDataGenerator.user_accounts(self.member_ids, size=self.size)
-        for user_account in gen_user_accounts:
-            self.db.query(
-                '''INSERT INTO user_account (member_id, email,
-                phone_nb, hashed_pwd) VALUES (:member_id, :email,
-                :phone_nb, :hashed_pwd);''',
-                **user_account.__dict__
-            )
-        rows: records.RecordCollection = self.db.query(
-            '''SELECT id, member_id FROM user_account;'''
-        )
-        self.user_accounts = {r.member_id: r.id for r in rows}
-        return self.user_accounts
-
-    def _insert_taken_orders(self) -> List[int]:
-        taken_orders: Iterator[TakenOrder] = RandomDataGenerator\
-            .taken_orders(self.member_ids, self.address_ids,
-                          self.pizzeria_ids, self.order_status_ids,
-                          size=self.size)
-        for taken_order in taken_orders:
-            self.db.query(
-                '''INSERT INTO taken_order (member_id, address_id,
-                pizzeria_id, status_id, is_paid, bill_id) VALUES (:member_id,
-                :address_id, :pizzeria_id, :status_id, :is_paid, :bill_id)''',
-                **taken_order.__dict__
+    def _insert_user_accounts(self) -> Sequence[int]:
+        gen_user_accounts: Iterator[UserAccount] = self._generate(
+            'user_accounts', self.member_ids
+        )
+        self.user_accounts = {}
+        # In streaming mode, or when a resumed run would miss some, the
+        # back-references are joined in the database instead of being
+        # kept here
+        on_batch: Optional[Callable] = None if self.join_user_accounts \
+            else lambda batch: self.user_accounts.update(
+                (ua.member_id, ua.id) for ua in batch
             )
-        rows: records.RecordCollection = self.db.query(
-            '''SELECT id FROM taken_order;'''
+        self.user_account_ids = self._load_entities(
+            'user_account', gen_user_accounts, on_batch
+        )
+        self.user_accounts = self._written(self.user_accounts,
+                                           self.user_account_ids)
+        print(self.ctx.hasher.report())
+        return self.user_account_ids
+
+    def _insert_taken_orders(self) -> Sequence[int]:
+        taken_orders: Iterator[TakenOrder] = self._generate(
+            'taken_orders', self.member_ids, self.address_ids,
+            self.pizzeria_ids, self.order_status_ids
         )
-        self.taken_order_ids = [r.id for r in rows]
+        self.taken_order_ids = self._load_entities('taken_order',
+                                                   taken_orders)
         return self.taken_order_ids
 
-    def _insert_bills(self) -> List[int]:
-        bills: Iterator[Bill] = RandomDataGenerator\
-                .bills(self.taken_order_ids, size=self.size)
-        for bill in bills:
-            self.db.query(
-                '''INSERT INTO bill (emission_date, total_amout_ati,
-                order_id) VALUES (:emission_date, :total_amout_ati,
-                :order_id);''', **bill.__dict__
-            )
-        rows: records.RecordCollection = self.db.query(
-            '''SELECT id FROM bill;'''
-        )
-        self.bill_ids = [r.id for r in rows]
+    def _insert_bills(self) -> Sequence[int]:
+        bills: Iterator[Bill] = self._generate('bills', self.taken_order_ids)
+        self.bill_ids = self._load_entities('bill', bills)
         return self.bill_ids
 
     def _insert_recipes(self) -> Dict[str, int]:
-        for recipe in RandomDataGenerator.recipes():
-            self.db.query(
-                '''INSERT INTO recipe (name, description, is_public)
-                VALUES (:name, :description, :is_public);''',
-                **recipe.__dict__
+        if self.append and not self.loader.is_empty('recipe'):
+            self.recipes = {row.name: row.id for row in self.loader.query(
+                '''SELECT id, name FROM recipe ORDER BY id;'''
+            )}
+            return self.recipes
+        self.recipes = {}
+        recipe_ids: List[int] = self.loader.load_entities(
+            'recipe', self.generator.recipes(self.ctx),
+            on_batch=lambda batch: self.recipes.update(
+                (recipe.name, recipe.id) for recipe in batch
             )
-        rows: records.RecordCollection = self.db.query(
-            '''SELECT name, id FROM recipe;'''
         )
-        self.recipes = {r.name: r.id for r in rows}
+        self.recipes = self._written(self.recipes, recipe_ids)
         return self.recipes
 
     def _insert_products(self) -> Any:
-        for product in RandomDataGenerator.products():
-            self.db.query(
-                '''INSERT INTO product
-                (name, barcode, gram_weight, unit_price_ati)
-                VALUES (:name, :barcode, :gram_weight, :unit_price_ati);''',
-                **product.__dict__
-            )
-            rows: records.RecordCollection = self.db.query(
-                '''SELECT id FROM product;'''
+        self.product_ids = self._existing_ids('product') or \
+            self.loader.load_entities(
+                'product', self.generator.products(self.ctx)
             )
-            self.product_ids = [r.id for r in rows]
         return self.product_ids
 
     def _insert_catalog_items(self) -> List[int]:
-        for item in RandomDataGenerator.catalog_items(self.recipes):
-            self.db.query(
-                '''INSERT INTO catalog_item
-                (name, description, picture_file,
-                unit_price_ati, is_available, is_displayed,
-                recipe_id, product_id) VALUES
-                (:name, :description, :picture_file,
-                :unit_price_ati, :is_available, :is_displayed,
-                :recipe_id, :product_id);''',
-                **item.__dict__
+        self.catalog_item_ids = self._existing_ids('catalog_item') or \
+            self.loader.load_entities(
+                'catalog_item',
+                self.generator.catalog_items(self.ctx, self.recipes)
             )
-        rows: records.RecordCollection = self.db.query(
-            '''SELECT id FROM catalog_item;'''
-        )
-        self.catalog_item_ids = [r.id for r in rows]
         return self.catalog_item_ids
 
+    # member/user_account and taken_order/bill reference each other:
+    # the back-references can only be set once both rows exist
     def _update_members_user_account(self) -> None:
-        for member_id, ua_id in self.user_accounts.items():
-            self.db.query(
-                '''UPDATE member SET user_account_id = :ua_id
-                WHERE id = :member_id;''',
-                **{'member_id': member_id, 'ua_id': ua_id}
-            )
-
-    def _update_members_role(self) -> None:
-        rows: records.RecordCollection = self.db.query(
-            '''SELECT id FROM member WHERE
-            works_at_pizzeria_id IS NOT NULL;'''
-        )
-        for r in rows:
-            self.db.query(
-                '''UPDATE member set role_id = :role_id
-                WHERE id = :member_id''',
-                **{'member_id': r.id,
-                   'role_id': random.choice(self.role_ids)}
-            )
+        if self.join_user_accounts:
+            self.loader.update_join('member', 'user_account_id',
+                                    'user_account', 'member_id')
+            return
+        self.loader.update(
+            'member', 'user_account_id', self.user_accounts.items()
+        )
 
     def _update_order_bill(self) -> None:
-        rows: records.RecordCollection = self.db.query(
-            '''SELECT id FROM taken_order;'''
-        )
-        for r in rows:
-            self.db.query(
-                '''UPDATE taken_order set bill_id = :bill_id
-                WHERE id = :order_id''',
-                **{'order_id': r.id,
-                   'bill_id': random.choice(self.bill_ids)}
-            )
+        self.loader.update(
+            'taken_order', 'bill_id',
+            ((order_id, self.ctx.random.choice(self.bill_ids))
+             for order_id in self.taken_order_ids)
+        )
 
     def _insert_order_status(self) -> List[int]:
-        for status in RandomDataGenerator.order_status():
-            self.db.query(
-                '''INSERT INTO order_status (label) VALUES (:label);''',
-                **status.__dict__
+        self.order_status_ids = self._existing_ids('order_status') or \
+            self.loader.load_entities(
+                'order_status', self.generator.order_status()
             )
-        rows: records.RecordCollection = self.db.query(
-            '''SELECT id FROM order_status;'''
-        )
-        self.order_status_ids = [r.id for r in rows]
         return self.order_status_ids
 
     def _insert_keywords(self) -> Any:
-        for keyword in RandomDataGenerator.keywords():
-            self.db.query(
-                '''INSERT INTO keyword (name) VALUES (:name);''',
-                **keyword.__dict__
+        self.keyword_ids = self._existing_ids('keyword') or \
+            self.loader.load_entities(
+                'keyword', self.generator.keywords()
             )
-        rows: records.RecordCollection = self.db.query(
-            '''SELECT id FROM keyword;'''
-        )
-        self.keyword_ids = [r.id for r in rows]
         return self.keyword_ids
 
     def _insert_permissions(self) -> List[int]:
-        for permission in RandomDataGenerator.permissions():
-            self.db.query(
-                '''INSERT INTO permission (label) VALUES (:label);''',
-                **permission.__dict__
+        self.permission_ids = self._existing_ids('permission') or \
+            self.loader.load_entities(
+                'permission', self.generator.permissions()
             )
-        rows: records.RecordCollection = self.db.query(
-            '''SELECT id FROM permission;'''
-        )
-        self.permission_ids = [r.id for r in rows]
         return self.permission_ids
 
     def _insert_roles(self) -> List[int]:
-        for role in RandomDataGenerator.roles():
-            self.db.query(
-                '''INSERT INTO role (name) VALUES (:name);''',
-                **role.__dict__
+        self.role_ids = self._existing_ids('role') or \
+            self.loader.load_entities(
+                'role', self.generator.roles()
             )
-        rows: records.RecordCollection = self.db.query(
-            '''SELECT id FROM role;'''
-        )
-        self.role_ids = [r.id for r in rows]
         return self.role_ids
 
-    def _insert_relations_many_to_many(self) -> None:
-        callbacks: List[Callable] = [
-            self._insert_has_permission_to,
-            self._insert_contains_item,
-            self._insert_requires_product,
-            self._insert_has_product_in_stock,
-            self._insert_has_keyword,
-        ]
-        for callback in callbacks:
-            for i in range(self.size):
-                try:
-                    callback()
-                except sqlalchemy.exc.IntegrityError:
-                    pass
-
-    def _insert_has_permission_to(self) -> None:
-        self.db.query(
-            '''INSERT INTO has_permission_to VALUES
-                (:role_id, :permission_id);''',
-            **RandomDataGenerator.has_permission_to(
-                self.role_ids, self.permission_ids
-            )
+    def _insert_relations_many_to_many(self) -> Dict[str, int]:
+        callbacks: Dict[str, Callable] = {
+            'has_permission_to': self._insert_has_permission_to,
+            'contains_item': self._insert_contains_item,
+            'requires_product': self._insert_requires_product,
+            'has_product_in_stock': self._insert_has_product_in_stock,
+            'has_keyword': self._insert_has_keyword,
+        }
+        self.relation_counts: Dict[str, int] = {}
+        for table, callback in callbacks.items():
+            self.relation_counts[table] = callback()
+            print(f'  {table}: {self.relation_counts[table]} rows inserted')
+        return self.relation_counts
+
+    # Pairs are distinct, ON CONFLICT DO NOTHING only skips the pairs
+    # already present in a non-empty database
+    def _insert_has_permission_to(self) -> int:
+        return self.loader.load(
+            'has_permission_to',
+            self.generator.has_permission_to(
+                self.ctx, self.role_ids, self.permission_ids, size=self.size
+            ),
+            on_conflict='DO NOTHING'
         )
 
-    def _insert_contains_item(self) -> None:
-        self.db.query(
-            '''INSERT INTO contains_item VALUES
-            (:order_id, :item_id, :quantity, :unit_price_ati);''',
-            **RandomDataGenerator.contains_item(
-                self.taken_order_ids, self.catalog_item_ids
-            )
+    def _insert_contains_item(self) -> int:
+        return self.loader.load(
+            'contains_item',
+            self.generator.contains_item(
+                self.ctx, self.taken_order_ids, self.catalog_item_ids,
+                size=self.size
+            ),
+            on_conflict='DO NOTHING'
         )
 
-    def _insert_has_product_in_stock(self) -> None:
-        self.db.query(
-            '''INSERT INTO has_product_in_stock VALUES
-            (:pizzeria_id, :product_id, :quantity);''',
-            **RandomDataGenerator.has_product_in_stock(
-                self.pizzeria_ids, self.product_ids
-            )
+    def _insert_has_product_in_stock(self) -> int:
+        return self.loader.load(
+            'has_product_in_stock',
+            self.generator.has_product_in_stock(
+                self.ctx, self.pizzeria_ids, self.product_ids, size=self.size
+            ),
+            on_conflict='DO NOTHING'
         )
 
-    def _insert_requires_product(self) -> None:
-        self.db.query(
-            '''INSERT INTO requires_product VALUES
-            (:recipe_id, :product_id, :gram_amount);''',
-            **RandomDataGenerator.requires_product(
-                list(self.recipes.values()), self.product_ids
-            )
+    def _insert_requires_product(self) -> int:
+        return self.loader.load(
+            'requires_product',
+            self.generator.requires_product(
+                self.ctx, list(self.recipes.values()), self.product_ids,
+                size=self.size
+            ),
+            on_conflict='DO NOTHING'
         )
 
-    def _insert_has_keyword(self) -> None:
-        self.db.query(
-            '''INSERT INTO has_keyword VALUES (:item_id, :keyword_id)''',
-            **RandomDataGenerator.has_keyword(
-                self.catalog_item_ids, self.keyword_ids
-            )
+    def _insert_has_keyword(self) -> int:
+        return self.loader.load(
+            'has_keyword',
+            self.generator.has_keyword(
+                self.ctx, self.catalog_item_ids, self.keyword_ids,
+                size=self.size
+            ),
+            on_conflict='DO NOTHING'
         )
 
 
+def build_sqlite_fixture(path: str, size: int = 10, seed: int = 0,
+                         **options: Any) -> str:
+    '''Builds a seeded dataset into the SQLite database file at path,
+       replaced if present. Meant to be built once per test session, then
+       copied per test with copy_sqlite_fixture()'''
+    if os.path.exists(path):
+        os.remove(path)
+    options = {'password_hashing': 'low-rounds', **options}
+    DatabaseFeeder('', '', '', '', size=size, seed=seed,
+                   url=f'sqlite:///{path}', **options).populate()
+    return path
+
+
+def copy_sqlite_fixture(path: str,
+                        target: str = ':memory:') -> sqlite3.Connection:
+    '''Copy of the SQLite database at path, in memory by default, made
+       page by page with the SQLite online backup API'''
+    source: sqlite3.Connection = sqlite3.connect(path)
+    copy: sqlite3.Connection = sqlite3.connect(target)
+    try:
+        source.backup(copy)
+    finally:
+        source.close()
+    copy.execute('''PRAGMA foreign_keys = ON;''')
+    return copy
+
+
 def main() -> None:
     arg_parser: ArgumentParser = ArgumentParser(
         description='Script populating an OCP6 Database with fake data'
     )
     arg_parser.add_argument('-s', '--size', type=int, default=10,
                             help='Size of batch of inserted data')
+    arg_parser.add_argument('-b', '--batch-size', type=int, default=500,
+                            help='Number of rows sent per INSERT statement '
+                            'or encoded per COPY chunk')
+    arg_parser.add_argument('-l', '--loader', choices=sorted(LOADERS),
+                            default='insert',
+                            help='Write rows with multi-row INSERT '
+                            'statements or with COPY ... FROM STDIN')
+    arg_parser.add_argument('--seed', type=int, default=None,
+                            help='Seed of the random data generation, '
+                            'for reproducible datasets')
+    arg_parser.add_argument('--password-hashing',
+                            choices=PASSWORD_HASHING_MODES, default='real',
+                            help='real: default pbkdf2 rounds on all cores, '
+                            'pool: reuse a pool of valid hashes, '
+                            'low-rounds: pbkdf2 with few rounds')
+    arg_parser.add_argument('--password-pool-size', type=int, default=100,
+                            help='Number of distinct hashes of the pool mode')
+    arg_parser.add_argument('--password-rounds', type=int, default=1000,
+                            help='pbkdf2 rounds of the low-rounds mode')
+    arg_parser.add_argument('-w', '--workers', type=int, default=1,
+                            help='Number of processes generating the large '
+                            'tables, split into one shard per worker')
+    arg_parser.add_argument('--cache-dir', default=None,
+                            help='Directory caching the generated datasets '
+                            '(requires --seed), replayed by later runs')
+    arg_parser.add_argument('--cache-limit', type=int, default=1024,
+                            help='Maximum disk usage of the cache, in MB')
+    arg_parser.add_argument('--cache-list', action='store_true',
+                            help='List the cached datasets and exit')
+    arg_parser.add_argument('--cache-prune', action='store_true',
+                            help='Evict the least recently used datasets '
+                            'beyond --cache-limit and exit')
+    arg_parser.add_argument('-o', '--output', default=None,
+                            help='Write no row to a database, but a plain '
+                            'SQL script (.gz/.zst compressed) to restore '
+                            'with psql into an empty database')
+    arg_parser.add_argument('--pipeline-writers', type=int, default=0,
+                            help='Number of writer threads, each with its '
+                            'own connection, loading the batches generated '
+                            'meanwhile (0: no pipeline)')
+    arg_parser.add_argument('--queue-size', type=int, default=4,
+                            help='Number of generated batches waiting for '
+                            'the pipeline writers before generation blocks')
+    arg_parser.add_argument('--partition', action='store_true',
+                            help='Split the rows of the large tables '
+                            'between the pipeline writers by ID ranges '
+                            '(pizzerias for the stocks), each one loading '
+                            'its slice on its own connection')
+    arg_parser.add_argument('--streaming', action='store_true',
+                            help='Constant memory generation for very large '
+                            'sizes: compact ID ranges and on the fly '
+                            'permutations instead of ID lists')
+    arg_parser.add_argument('--columnar', action='store_true',
+                            help='Draw the numeric and categorical columns '
+                            'of each batch as NumPy arrays (requires numpy)')
+    arg_parser.add_argument('--report', default=None,
+                            help='Write the metrics of each stage (times, '
+                            'rows, statements, memory) to this JSON file')
+    arg_parser.add_argument('--profile', action='append', default=[],
+                            metavar='STAGE',
+                            help='Run this stage (e.g. insert_members) under '
+                            'cProfile, saved to pop_db-STAGE.prof')
+    arg_parser.add_argument('--stage-workers', type=int, default=1,
+                            help='Number of stages run concurrently, each '
+                            'with its own connection, once the stages '
+                            'inserting the tables they reference are done')
+    arg_parser.add_argument('--fast-load', action='store_true',
+                            help='Drop the foreign keys and the primary keys '
+                            'of the associative tables during the load, '
+                            'then add them back, reporting faulty rows')
+    arg_parser.add_argument('--summary', action='store_true',
+                            help='Create the summary tables of '
+                            'OCP6_summary.sql, built once all rows are '
+                            'loaded, then kept current by triggers')
+    arg_parser.add_argument('--commit-every', type=int, default=0,
+                            help='Rows written per explicit transaction of '
+                            'the insert loader (0: every statement commits '
+                            'on its own)')
+    arg_parser.add_argument('--bisect-errors', action='store_true',
+                            help='Split the batches failing to be inserted '
+                            'down to the faulty rows, reported and left out '
+                            '(under savepoints with --commit-every)')
+    arg_parser.add_argument('--url', default=os.environ.get('DATABASE_URL'),
+                            help='SQLAlchemy URL of the database, e.g. '
+                            'sqlite:///ocp6.db (default: DATABASE_URL, else '
+                            'PostgreSQL from the user, password, host and '
+                            'dbname environment variables)')
+    arg_parser.add_argument('--session-setting', action='append', default=[],
+                            metavar='NAME=VALUE',
+                            help='Server setting of the load connections, '
+                            'e.g. synchronous_commit=off')
+    arg_parser.add_argument('--append', action='store_true',
+                            help='Add --size rows on top of the existing '
+                            'data, reusing the rows of the reference tables')
+    arg_parser.add_argument('--checkpoint', default=None,
+                            help='JSON file saving the progress of the run '
+                            '(requires --seed): an interrupted run started '
+                            'again with it resumes where it stopped')
+    arg_parser.add_argument('--checkpoint-every', type=int, default=10000,
+                            help='Rows of a large table loaded between two '
+                            'saves of the checkpoint')
     args: Namespace = arg_parser.parse_args()
-    dbfeeder: DatabaseFeeder = DatabaseFeeder(
-        os.environ['user'], os.environ['password'],
-        os.environ['host'], os.environ['dbname'],
-        size=args.size
-    )
+    cache: Optional[DatasetCache] = None
+    if args.cache_dir:
+        cache = DatasetCache(args.cache_dir, args.cache_limit * 1024 ** 2)
+    if args.cache_list or args.cache_prune:
+        if cache is None:
+            arg_parser.error('--cache-dir is required')
+        elif args.cache_prune:
+            for key in cache.prune():
+                print(f'EVICTED CACHED DATASET {key}')
+        else:
+            for entry in cache.entries():
+                print(f'{entry["key"]}  {entry["bytes"] / 1024 ** 2:8.2f} MB'
+                      f'  {time.ctime(entry["last_used"])}  '
+                      f'seed={entry["params"]["seed"]} '
+                      f'size={entry["params"]["size"]}')
+        return
+    # The offline mode and database URLs need no database credentials
+    credentials: List[str] = [
+        os.environ.get(name, '') if args.output or args.url
+        else os.environ[name]
+        for name in ('user', 'password', 'host', 'dbname')
+    ]
+    try:
+        dbfeeder: DatabaseFeeder = DatabaseFeeder(
+            *credentials,
+            size=args.size, batch_size=args.batch_size, loader=args.loader,
+            seed=args.seed, password_hashing=args.password_hashing,
+            password_pool_size=args.password_pool_size,
+            password_rounds=args.password_rounds, workers=args.workers,
+            cache=cache, output=args.output,
+            pipeline_writers=args.pipeline_writers, queue_size=args.queue_size,
+            partition=args.partition,
+            streaming=args.streaming, columnar=args.columnar,
+            report=args.report, profile=args.profile,
+            stage_workers=args.stage_workers, fast_load=args.fast_load,
+            summary=args.summary, append=args.append,
+            checkpoint=args.checkpoint, checkpoint_every=args.checkpoint_every,
+            commit_every=args.commit_every, bisect=args.bisect_errors,
+            session_settings=args.session_setting, url=args.url
+        )
+    except ValueError as e:
+        # Incompatible options are rejected by DatabaseFeeder itself
+        arg_parser.error(str(e))
+    names: List[str] = [stage.name for stage in dbfeeder.stages()]
+    for name in args.profile:
+        if name not in names:
+            arg_parser.error(f'Unknown stage {name}, choose from '
+                             f'{", ".join(names)}')
     dbfeeder.populate()
 
 
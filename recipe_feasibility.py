@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+'''
+@desc    In-memory feasibility of the OCP6 recipes: which recipes each
+         pizzeria can make from its stock, and how many portions, kept
+         current incrementally along the stock changes
+@author  SDQ <sdq@afnor.org>
+@version 1.0.0
+@date    2026-10-16
+'''
+
+from array import array
+import os
+import time
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+from argparse import ArgumentParser, Namespace
+import psycopg2
+
+
+class FeasibilityEngine:
+    '''Recipes each pizzeria can make from its stock. The stock of a
+       pizzeria is an array of grams indexed by product ID (quantity times
+       the gram weight of the product), and each recipe keeps, per
+       pizzeria, the number of its products in short supply: a stock
+       change only revisits the recipes requiring the product, and a
+       recipe is feasible once none is missing. Like the report of
+       example_queries.sql, recipes requiring no product are left out'''
+    def __init__(self, weights: Dict[int, int],
+                 requirements: Iterable[Tuple[int, int, int]],
+                 items: Iterable[Tuple[int, Optional[int], Optional[int]]]
+                 = ()) -> None:
+        self.weights: array = array('q', [0] * (max(weights, default=0) + 1))
+        for product_id, weight in weights.items():
+            self.weights[product_id] = weight
+        # (product, grams) required by each recipe, and the reverse
+        self.requirements: Dict[int, List[Tuple[int, int]]] = {}
+        self.required_by: Dict[int, List[Tuple[int, int]]] = {}
+        for recipe_id, product_id, grams in requirements:
+            self.requirements.setdefault(recipe_id, []).append(
+                (product_id, grams)
+            )
+            self.required_by.setdefault(product_id, []).append(
+                (recipe_id, grams)
+            )
+        self.stocks: Dict[int, array] = {}
+        self.missing: Dict[int, Dict[int, int]] = {}
+        self.feasible_recipes: Dict[int, Set[int]] = {}
+        # Pizzerias able to make each recipe, or having each product
+        self.makers: Dict[int, int] = dict.fromkeys(self.requirements, 0)
+        self.suppliers: Dict[int, int] = dict.fromkeys(weights, 0)
+        # Catalog items of each recipe, or of each product with no recipe
+        self.recipe_items: Dict[int, List[int]] = {}
+        self.product_items: Dict[int, List[int]] = {}
+        for item_id, recipe_id, product_id in items:
+            if recipe_id is not None:
+                self.recipe_items.setdefault(recipe_id, []).append(item_id)
+            elif product_id is not None:
+                self.product_items.setdefault(product_id, []).append(item_id)
+        # Recipes and products whose availability changed since the last
+        # call of availability_changes()
+        self.changed_recipes: Set[int] = set()
+        self.changed_products: Set[int] = set()
+
+    @classmethod
+    def load(cls, cursor: Any) -> 'FeasibilityEngine':
+        '''Engine built from the tables of the database'''
+        cursor.execute('''SELECT id, gram_weight FROM product;''')
+        weights: Dict[int, int] = dict(cursor.fetchall())
+        cursor.execute(
+            '''SELECT recipe_id, product_id, gram_amount
+            FROM requires_product;'''
+        )
+        requirements: List[Tuple[int, int, int]] = cursor.fetchall()
+        cursor.execute('''SELECT id, recipe_id, product_id
+                       FROM catalog_item;''')
+        engine: FeasibilityEngine = cls(weights, requirements,
+                                        cursor.fetchall())
+        cursor.execute('''SELECT id FROM pizzeria;''')
+        for pizzeria_id, in cursor.fetchall():
+            engine.add_pizzeria(pizzeria_id)
+        cursor.execute(
+            '''SELECT pizzeria_id, product_id, quantity
+            FROM has_product_in_stock;'''
+        )
+        for pizzeria_id, product_id, quantity in cursor.fetchall():
+            engine.set_stock(pizzeria_id, product_id, quantity)
+        return engine
+
+    def add_pizzeria(self, pizzeria_id: int) -> None:
+        '''Adds a pizzeria with an empty stock'''
+        self.stocks[pizzeria_id] = array('q', [0]) * len(self.weights)
+        self.missing[pizzeria_id] = {
+            recipe_id: sum(grams > 0 for _, grams in products)
+            for recipe_id, products in self.requirements.items()
+        }
+        self.feasible_recipes[pizzeria_id] = set()
+        for recipe_id, missing in self.missing[pizzeria_id].items():
+            if missing == 0:
+                self.feasible_recipes[pizzeria_id].add(recipe_id)
+                self._count(self.makers, self.changed_recipes, recipe_id, 1)
+
+    def feasible(self, pizzeria_id: int) -> FrozenSet[int]:
+        '''IDs of the recipes the pizzeria can make right now'''
+        return frozenset(self.feasible_recipes[pizzeria_id])
+
+    def portions(self, pizzeria_id: int, recipe_id: int) -> int:
+        '''Number of portions of the recipe the pizzeria can make'''
+        stock: array = self.stocks[pizzeria_id]
+        return min((stock[product_id] // grams for product_id, grams
+                    in self.requirements.get(recipe_id, ()) if grams > 0),
+                   default=0)
+
+    def set_stock(self, pizzeria_id: int, product_id: int,
+                  quantity: int) -> None:
+        '''Applies the change of a has_product_in_stock row (a deleted
+           row is a quantity of 0)'''
+        self._set_grams(pizzeria_id, product_id,
+                        quantity * self.weights[product_id])
+
+    def consume(self, pizzeria_id: int, recipe_id: int,
+                portions: int = 1) -> None:
+        '''Takes the products of portions of the recipe from the stock'''
+        if self.portions(pizzeria_id, recipe_id) < portions:
+            raise ValueError(f'Pizzeria {pizzeria_id} cannot make '
+                             f'{portions} portions of recipe {recipe_id}')
+        stock: array = self.stocks[pizzeria_id]
+        for product_id, grams in self.requirements[recipe_id]:
+            self._set_grams(pizzeria_id, product_id,
+                            stock[product_id] - grams * portions)
+
+    def _set_grams(self, pizzeria_id: int, product_id: int,
+                   grams: int) -> None:
+        stock: array = self.stocks[pizzeria_id]
+        before: int = stock[product_id]
+        stock[product_id] = grams
+        missing: Dict[int, int] = self.missing[pizzeria_id]
+        feasible: Set[int] = self.feasible_recipes[pizzeria_id]
+        for recipe_id, required in self.required_by.get(product_id, ()):
+            enough: bool = grams >= required
+            if (before >= required) == enough:
+                continue
+            missing[recipe_id] += -1 if enough else 1
+            if enough and missing[recipe_id] == 0:
+                feasible.add(recipe_id)
+                self._count(self.makers, self.changed_recipes, recipe_id, 1)
+            elif not enough and missing[recipe_id] == 1:
+                feasible.discard(recipe_id)
+                self._count(self.makers, self.changed_recipes, recipe_id, -1)
+        if (before > 0) != (grams > 0):
+            self._count(self.suppliers, self.changed_products, product_id,
+                        1 if grams > 0 else -1)
+
+    @staticmethod
+    def _count(counts: Dict[int, int], changed: Set[int], key: int,
+               step: int) -> None:
+        '''Counts a pizzeria more or less, noting the availability change
+           when the count leaves or reaches 0'''
+        counts[key] += step
+        if counts[key] == (1 if step > 0 else 0):
+            changed.add(key)
+
+    def availability(self) -> Dict[int, bool]:
+        '''is_available of every catalog item: its recipe can be made, or
+           its product is in stock, in at least one pizzeria'''
+        available: Dict[int, bool] = {}
+        for recipe_id, items in self.recipe_items.items():
+            available.update(
+                dict.fromkeys(items, self.makers.get(recipe_id, 0) > 0)
+            )
+        for product_id, items in self.product_items.items():
+            available.update(
+                dict.fromkeys(items, self.suppliers.get(product_id, 0) > 0)
+            )
+        return available
+
+    def availability_changes(self) -> Dict[int, bool]:
+        '''is_available of the catalog items whose recipe or product
+           changed availability since the previous call'''
+        available: Dict[int, bool] = {}
+        for recipe_id in self.changed_recipes:
+            available.update(dict.fromkeys(
+                self.recipe_items.get(recipe_id, ()),
+                self.makers[recipe_id] > 0
+            ))
+        for product_id in self.changed_products:
+            available.update(dict.fromkeys(
+                self.product_items.get(product_id, ()),
+                self.suppliers[product_id] > 0
+            ))
+        self.changed_recipes.clear()
+        self.changed_products.clear()
+        return available
+
+
+def sync_availability(cursor: Any, available: Dict[int, bool]) -> int:
+    '''Sets catalog_item.is_available with one set-based UPDATE, and
+       returns the number of items which changed'''
+    if not available:
+        return 0
+    pairs: str = ', '.join(f'({int(item_id)}, {bool(value)})'
+                           for item_id, value in available.items())
+    cursor.execute(
+        f'''UPDATE catalog_item SET is_available = v.value
+        FROM (VALUES {pairs}) AS v (id, value)
+        WHERE catalog_item.id = v.id
+        AND catalog_item.is_available <> v.value;'''
+    )
+    return cursor.rowcount
+
+
+def connect() -> Any:
+    '''Connection from the user, password, host and dbname environment
+       variables, like pop_db.py'''
+    credentials: Dict[str, str] = {
+        name: os.environ[name] for name in ('user', 'password', 'host')
+        if os.environ.get(name)
+    }
+    return psycopg2.connect(dbname=os.environ['dbname'], **credentials)
+
+
+def main() -> None:
+    arg_parser: ArgumentParser = ArgumentParser(
+        description='Recipes each OCP6 pizzeria can make from its stock'
+    )
+    arg_parser.add_argument('--pizzeria', type=int, default=None,
+                            help='Only report the recipes of this pizzeria')
+    arg_parser.add_argument('--sync', action='store_true',
+                            help='Set catalog_item.is_available from the '
+                            'recipes and products available somewhere')
+    args: Namespace = arg_parser.parse_args()
+    connection: Any = connect()
+    with connection, connection.cursor() as cursor:
+        s: float = time.perf_counter()
+        engine: FeasibilityEngine = FeasibilityEngine.load(cursor)
+        print(f'LOADED ({time.perf_counter() - s:.2f} sec.)')
+        cursor.execute('''SELECT id, name FROM pizzeria ORDER BY name;''')
+        pizzerias: List[Tuple[int, str]] = cursor.fetchall()
+        cursor.execute('''SELECT id, name FROM recipe;''')
+        recipes: Dict[int, str] = dict(cursor.fetchall())
+        for pizzeria_id, name in pizzerias:
+            if args.pizzeria not in (None, pizzeria_id):
+                continue
+            print(name)
+            for recipe_id in sorted(engine.feasible(pizzeria_id),
+                                    key=recipes.__getitem__):
+                print(f'  {recipes[recipe_id]}: '
+                      f'{engine.portions(pizzeria_id, recipe_id)} portions')
+        if args.sync:
+            changed: int = sync_availability(cursor, engine.availability())
+            print(f'SYNCED is_available ({changed} items changed)')
+    connection.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+'''
+@desc    Throwaway PostgreSQL databases of the integration tests, skipped
+         when no server is reachable with the user, password and host
+         environment variables of pop_db.py
+'''
+
+import io
+import os
+import unittest
+from contextlib import closing, redirect_stdout
+from typing import Any, Dict, List, Tuple
+import psycopg2
+from bench_pop_db import connect, throwaway_database
+from pop_db import DatabaseFeeder
+
+
+# Database connected to for creating and dropping the test databases
+ADMIN_DB: str = os.environ.get('OCP6_TEST_ADMIN_DB', 'postgres')
+# Fast password hashing: valid hashes, computed once
+FEEDER_OPTIONS: Dict[str, Any] = {
+    'password_hashing': 'pool', 'password_pool_size': 2,
+}
+TABLES: List[str] = [
+    'address', 'role', 'permission', 'user_account', 'member', 'bill',
+    'order_status', 'taken_order', 'product', 'pizzeria', 'recipe',
+    'catalog_item', 'keyword', 'has_permission_to', 'contains_item',
+    'has_product_in_stock', 'requires_product', 'has_keyword',
+]
+
+
+class DatabaseTestCase(unittest.TestCase):
+    '''Test case given a fresh database with the OCP6.sql schema'''
+    def setUp(self) -> None:
+        database: Any = throwaway_database(ADMIN_DB)
+        try:
+            self.dbname: str = database.__enter__()
+        except psycopg2.OperationalError as e:
+            self.skipTest(f'no PostgreSQL server: {e}')
+        self.addCleanup(database.__exit__, None, None, None)
+
+    def feeder(self, **options: Any) -> DatabaseFeeder:
+        return DatabaseFeeder(
+            os.environ.get('user', ''), os.environ.get('password', ''),
+            os.environ.get('host', ''), self.dbname,
+            **{**FEEDER_OPTIONS, **options}
+        )
+
+    def populate(self, **options: Any) -> Dict[str, Any]:
+        '''Report of a populate() run, its output silenced'''
+        feeder: DatabaseFeeder = self.feeder(**options)
+        try:
+            with redirect_stdout(io.StringIO()):
+                return feeder.populate()
+        finally:
+            # Pooled connections would keep the database from being dropped
+            if feeder.db is not None:
+                feeder.db.close()
+
+    def fetch(self, query: str) -> List[Tuple[Any, ...]]:
+        with closing(connect(self.dbname)) as connection, \
+                connection.cursor() as cursor:
+            cursor.execute(query)
+            return cursor.fetchall()
+
+    def execute(self, statements: str) -> None:
+        with closing(connect(self.dbname)) as connection:
+            connection.autocommit = True
+            with connection.cursor() as cursor:
+                cursor.execute(statements)
+
+    def truncate(self) -> None:
+        '''Empties every table, the IDs starting over from 1'''
+        self.execute(f'TRUNCATE {", ".join(TABLES)} RESTART IDENTITY;')
+
+    def dump(self) -> Dict[str, List[Tuple[Any, ...]]]:
+        '''Rows of every table, in a stable order'''
+        return {table: self.fetch(f'SELECT t::text FROM {table} t '
+                                  f'ORDER BY 1;')
+                for table in TABLES}
+
+    def count(self, table: str) -> int:
+        return self.fetch(f'SELECT count(*) FROM {table};')[0][0]
+
+    def assertIntegrity(self) -> None:
+        '''Every member has its own user account, and the reverse'''
+        self.assertEqual(self.fetch(
+            '''SELECT count(*) FROM member m
+            LEFT JOIN user_account u ON u.id = m.user_account_id
+            WHERE u.member_id IS DISTINCT FROM m.id;'''
+        ), [(0,)])
+        self.assertEqual(self.fetch(
+            '''SELECT count(DISTINCT member_id) FROM user_account;'''
+        ), [(self.count('member'),)])
@@ -0,0 +1,57 @@
+import os
+import shutil
+import tempfile
+import unittest
+from typing import Any, Dict, Iterator
+from unittest import mock
+from pop_db import RandomDataGenerator
+from tests.database import DatabaseTestCase
+
+SIZE: int = 100
+addresses = RandomDataGenerator.addresses
+
+
+def addresses_with_a_faulty_one(*args: Any, **kwargs: Any) -> Iterator[Any]:
+    for i, address in enumerate(addresses(*args, **kwargs)):
+        if i == 42:
+            address.zip_code = None  # NOT NULL
+        yield address
+
+
+class BisectTest(DatabaseTestCase):
+    def populate_with_a_faulty_address(self,
+                                       **options: Any) -> Dict[str, Any]:
+        with mock.patch.object(RandomDataGenerator, 'addresses',
+                               staticmethod(addresses_with_a_faulty_one)):
+            return self.populate(size=SIZE, seed=2, bisect=True, **options)
+
+    def assertOnlyRejected(self, report: Dict[str, Any]) -> None:
+        # The rows referencing the faulty address are never generated,
+        # rather than rejected in turn
+        self.assertEqual({stage['stage']: stage['rows_rejected']
+                          for stage in report['stages']
+                          if stage['rows_rejected']},
+                         {'insert_addresses': 1})
+        self.assertEqual(self.count('address'), SIZE - 1)
+        for table in ('member', 'user_account', 'taken_order', 'bill'):
+            with self.subTest(table=table):
+                self.assertEqual(self.count(table), SIZE - 1)
+        self.assertIntegrity()
+
+    def test_rejected_ids_left_out(self) -> None:
+        directory: str = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        for run, options in enumerate((
+                {}, {'commit_every': 30}, {'pipeline_writers': 2},
+                {'checkpoint': os.path.join(directory, 'checkpoint.json'),
+                 'checkpoint_every': 30})):
+            with self.subTest(**options):
+                if run:
+                    self.truncate()
+                self.assertOnlyRejected(
+                    self.populate_with_a_faulty_address(**options)
+                )
+
+
+if __name__ == '__main__':
+    unittest.main()
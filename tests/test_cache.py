@@ -0,0 +1,33 @@
+import shutil
+import tempfile
+import unittest
+from typing import Any, Dict
+from pop_db import DatasetCache
+from tests.database import DatabaseTestCase
+
+
+class DatasetCacheTest(DatabaseTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        directory: str = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        self.cache: DatasetCache = DatasetCache(directory)
+
+    def test_replay_partitioned(self) -> None:
+        # Replayed rows are decoded from COPY text: their partition keys
+        # are strings
+        options: Dict[str, Any] = {
+            'size': 100, 'seed': 9, 'cache': self.cache,
+            'pipeline_writers': 2, 'partition': True,
+        }
+        self.populate(**options)
+        self.assertEqual(len(self.cache.entries()), 1)
+        generated = self.dump()
+        self.truncate()
+        self.populate(**options)
+        self.assertEqual(self.dump(), generated)
+        self.assertIntegrity()
+
+
+if __name__ == '__main__':
+    unittest.main()
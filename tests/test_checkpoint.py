@@ -0,0 +1,54 @@
+import itertools
+import os
+import shutil
+import tempfile
+import unittest
+from typing import Any, Dict, Iterator, List, Tuple
+from unittest import mock
+from pop_db import RandomDataGenerator
+from tests.database import DatabaseTestCase
+
+SIZE: int = 200
+# Orders loaded before the interruption: two saved chunks, and a batch of
+# the third one written but not saved
+INTERRUPTED_AFTER: int = 120
+ORDERS: str = '''SELECT member_id, address_id, pizzeria_id, status_id, is_paid
+              FROM taken_order ORDER BY id;'''
+
+
+class CheckpointTest(DatabaseTestCase):
+    def populate_orders(self, **options: Any) -> List[Tuple[Any, ...]]:
+        self.populate(size=SIZE, seed=5, batch_size=20, **options)
+        self.assertEqual(self.count('taken_order'), SIZE)
+        self.assertEqual(self.count('bill'), SIZE)
+        self.assertIntegrity()
+        return self.fetch(ORDERS)
+
+    def test_resume_interrupted_stage(self) -> None:
+        directory: str = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        path: str = os.path.join(directory, 'checkpoint.json')
+        options: Dict[str, Any] = {'checkpoint': path, 'checkpoint_every': 50}
+        taken_orders = RandomDataGenerator.taken_orders
+
+        def interrupted(*args: Any, **kwargs: Any) -> Iterator[Any]:
+            yield from itertools.islice(taken_orders(*args, **kwargs),
+                                        INTERRUPTED_AFTER)
+            raise KeyboardInterrupt
+
+        with mock.patch.object(RandomDataGenerator, 'taken_orders',
+                               staticmethod(interrupted)), \
+                self.assertRaises(KeyboardInterrupt):
+            self.populate(size=SIZE, seed=5, batch_size=20, **options)
+        self.assertTrue(os.path.exists(path))
+        self.assertEqual(self.count('taken_order'), INTERRUPTED_AFTER)
+        # The resumed run drops the rows above the watermark, then loads
+        # the same orders as an uninterrupted run
+        resumed: List[Tuple[Any, ...]] = self.populate_orders(**options)
+        self.assertFalse(os.path.exists(path))
+        self.truncate()
+        self.assertEqual(resumed, self.populate_orders(**options))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,34 @@
+import unittest
+from tests.database import DatabaseTestCase
+
+
+class FastLoadTest(DatabaseTestCase):
+    def primary_keys(self) -> int:
+        return self.fetch(
+            '''SELECT count(*) FROM pg_constraint
+            WHERE connamespace = current_schema()::regnamespace
+            AND contype = 'p';'''
+        )[0][0]
+
+    def test_empty_target(self) -> None:
+        keys: int = self.primary_keys()
+        self.populate(size=100, seed=1, loader='copy', fast_load=True)
+        self.assertEqual(self.count('member'), 100)
+        self.assertEqual(self.primary_keys(), keys)
+        self.assertIntegrity()
+
+    def test_populated_target(self) -> None:
+        self.populate(size=100, seed=1, loader='copy')
+        keys: int = self.primary_keys()
+        with self.assertRaises(ValueError):
+            self.populate(size=100, seed=2, loader='copy', fast_load=True)
+        with self.assertRaises(ValueError):
+            self.populate(size=100, seed=2, loader='copy', fast_load=True,
+                          append=True)
+        # Nothing was dropped nor written
+        self.assertEqual(self.primary_keys(), keys)
+        self.assertEqual(self.count('member'), 100)
+
+
+if __name__ == '__main__':
+    unittest.main()
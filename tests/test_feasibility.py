@@ -0,0 +1,67 @@
+import unittest
+from typing import Any, Dict, List, Tuple
+from bench_pop_db import FEASIBILITY_REPORT, connect, example_queries
+from recipe_feasibility import FeasibilityEngine, sync_availability
+from tests.database import DatabaseTestCase
+
+# Recipes per pizzeria report of example_queries.sql
+REPORT: str = next(query for title, query in example_queries()
+                   if title.strip().startswith(FEASIBILITY_REPORT))
+
+
+class FeasibilityEngineTest(DatabaseTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.populate(size=100, seed=11)
+        self.connection: Any = connect(self.dbname)
+        self.addCleanup(self.connection.close)
+        self.cursor: Any = self.connection.cursor()
+        self.engine: FeasibilityEngine = FeasibilityEngine.load(self.cursor)
+
+    def assertSameAsReport(self) -> None:
+        self.cursor.execute('''SELECT id, name FROM pizzeria;''')
+        pizzerias: Dict[int, str] = dict(self.cursor.fetchall())
+        self.cursor.execute('''SELECT id, name FROM recipe;''')
+        recipes: Dict[int, str] = dict(self.cursor.fetchall())
+        self.cursor.execute(REPORT)
+        expected: List[Tuple[str, str, int]] = sorted(self.cursor.fetchall())
+        self.assertTrue(expected)
+        self.assertEqual(sorted(
+            (pizzerias[pizzeria_id], recipes[recipe_id],
+             self.engine.portions(pizzeria_id, recipe_id))
+            for pizzeria_id in pizzerias
+            for recipe_id in self.engine.feasible(pizzeria_id)
+        ), expected)
+
+    def test_loaded(self) -> None:
+        self.assertSameAsReport()
+
+    def test_stock_changes(self) -> None:
+        # Runs out of the products of a feasible recipe, in the database
+        # and incrementally in the engine
+        pizzeria_id: int = next(pizzeria for pizzeria, feasible
+                                in self.engine.feasible_recipes.items()
+                                if feasible)
+        recipe_id: int = min(self.engine.feasible(pizzeria_id))
+        for product_id, _ in self.engine.requirements[recipe_id]:
+            self.cursor.execute(
+                '''UPDATE has_product_in_stock SET quantity = 0
+                WHERE pizzeria_id = %s AND product_id = %s;''',
+                (pizzeria_id, product_id)
+            )
+            self.engine.set_stock(pizzeria_id, product_id, 0)
+        self.assertNotIn(recipe_id, self.engine.feasible(pizzeria_id))
+        self.assertSameAsReport()
+
+    def test_sync_availability(self) -> None:
+        sync_availability(self.cursor, self.engine.availability())
+        self.cursor.execute('''SELECT id, is_available FROM catalog_item;''')
+        self.assertEqual(dict(self.cursor.fetchall()),
+                         self.engine.availability())
+        self.assertEqual(
+            sync_availability(self.cursor, self.engine.availability()), 0
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
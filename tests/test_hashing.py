@@ -0,0 +1,24 @@
+import threading
+import unittest
+from pop_db import PasswordHasher
+
+
+class PasswordHasherTest(unittest.TestCase):
+    def test_shared_by_threads(self) -> None:
+        # Concurrent stages share the hasher of the feeder
+        hasher: PasswordHasher = PasswordHasher.create('pool', pool_size=2)
+
+        def hash_passwords() -> None:
+            for _ in range(1000):
+                hasher.hash_many(['password', 'drowssap'])
+        threads = [threading.Thread(target=hash_passwords) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(hasher.count, 16000)
+        self.assertEqual(len(hasher.pool), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
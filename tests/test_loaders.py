@@ -0,0 +1,57 @@
+import io
+import os
+import sqlite3
+import tempfile
+import unittest
+from contextlib import closing, redirect_stdout
+from typing import Dict, List
+from pop_db import build_sqlite_fixture
+from tests.database import DatabaseTestCase, FEEDER_OPTIONS, TABLES
+
+SIZE: int = 100
+# Tables given exactly SIZE rows
+SIZED_TABLES: List[str] = [
+    'address', 'member', 'user_account', 'taken_order', 'bill',
+]
+
+
+class LoaderRowCountsTest(DatabaseTestCase):
+    def counts(self) -> Dict[str, int]:
+        return {table: self.count(table) for table in TABLES}
+
+    def test_same_counts_whatever_the_loader(self) -> None:
+        # The same seed gives the same rows, whichever loader writes them
+        expected: Dict[str, int] = {}
+        for options in ({}, {'commit_every': 64}, {'bisect': True},
+                        {'loader': 'copy'}, {'pipeline_writers': 2},
+                        {'pipeline_writers': 2, 'partition': True},
+                        {'loader': 'copy', 'pipeline_writers': 2,
+                         'partition': True}):
+            with self.subTest(**options):
+                if expected:
+                    self.truncate()
+                self.populate(size=SIZE, seed=3, **options)
+                counts: Dict[str, int] = self.counts()
+                if not expected:
+                    expected = counts
+                    for table in SIZED_TABLES:
+                        self.assertEqual(counts[table], SIZE, table)
+                self.assertEqual(counts, expected)
+                self.assertIntegrity()
+        with self.subTest(loader='sqlite'), \
+                tempfile.TemporaryDirectory() as directory:
+            path: str = os.path.join(directory, 'fixture.db')
+            with redirect_stdout(io.StringIO()):
+                build_sqlite_fixture(path, size=SIZE, seed=3,
+                                     **FEEDER_OPTIONS)
+            with closing(sqlite3.connect(path)) as connection:
+                self.assertEqual({
+                    table: connection.execute(
+                        f'SELECT count(*) FROM {table};'
+                    ).fetchone()[0]
+                    for table in TABLES
+                }, expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,28 @@
+import shutil
+import tempfile
+import unittest
+from pop_db import DatabaseFeeder, DatasetCache
+
+
+class IncompatibleOptionsTest(unittest.TestCase):
+    def test_rejected_before_connecting(self) -> None:
+        # main() reports these ValueErrors as usage errors: no database is
+        # needed to reject them
+        directory: str = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        for options in ({'streaming': True, 'workers': 2},
+                        {'stage_workers': 2, 'pipeline_writers': 2},
+                        {'partition': True},
+                        {'fast_load': True, 'append': True},
+                        {'fast_load': True, 'output': 'dump'},
+                        {'bisect': True, 'loader': 'copy'},
+                        {'checkpoint': 'checkpoint.json'},
+                        {'append': True, 'cache': DatasetCache(directory)},
+                        {'url': 'sqlite://', 'output': 'dump'}):
+            with self.subTest(**options):
+                with self.assertRaises(ValueError):
+                    DatabaseFeeder('', '', '', '', **options)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,31 @@
+import unittest
+from pop_db import (
+    FakeAddress, FakeBill, FakeCatalogItem, FakeMember, FakePizzeria,
+    FakeProduct, FakeRecipe, FakeTakenOrder, FakeUserAccount,
+    GenerationContext, PasswordHasher,
+)
+
+
+class FakeRowsTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.ctx = GenerationContext(
+            0, hasher=PasswordHasher.create('pool', pool_size=2)
+        )
+
+    def test_id_before_loading(self) -> None:
+        # Slotted rows have no class-level default: the loaders set the
+        # IDs, until then they must read as None
+        ctx: GenerationContext = self.ctx
+        for row in (FakeMember(ctx, 1, 2), FakeAddress(ctx),
+                    FakeUserAccount(ctx, 1), FakeTakenOrder(ctx, 1, 2, 3, [1]),
+                    FakeBill(ctx, 1), FakeProduct(ctx, 'Tomate'),
+                    FakePizzeria(ctx, 'OC Pizza', 1), FakeRecipe(ctx, 'Reine'),
+                    FakeCatalogItem(ctx, 'Reine', 'recipe', 1)):
+            with self.subTest(row=type(row).__name__):
+                self.assertIsNone(row.id)
+                self.assertIn('id=None', repr(row))
+                self.assertEqual(row, row)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,29 @@
+import unittest
+from typing import Any
+from tests.database import DatabaseTestCase
+
+
+class SeedTest(DatabaseTestCase):
+    def assertReproducible(self, **options: Any) -> None:
+        # Bill dates and password salts included: neither depends on the
+        # clock or on a system random source
+        dumps = []
+        for run in range(2):
+            if run:
+                self.truncate()
+            self.populate(size=50, seed=7, **options)
+            dumps.append(self.dump())
+        self.assertEqual(self.count('bill'), 50)
+        for table, rows in dumps[0].items():
+            with self.subTest(table=table):
+                self.assertEqual(rows, dumps[1][table])
+
+    def test_same_seed_same_dataset(self) -> None:
+        self.assertReproducible()
+
+    def test_same_seed_same_columnar_dataset(self) -> None:
+        self.assertReproducible(columnar=True)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,19 @@
+import unittest
+from tests.database import DatabaseTestCase
+
+
+class ConcurrentStagesTest(DatabaseTestCase):
+    def test_member_user_account_one_to_one(self) -> None:
+        # Concurrent stages read the same ID lists: the race showed
+        # in about half of the runs
+        for seed in range(4):
+            with self.subTest(seed=seed):
+                if seed:
+                    self.truncate()
+                self.populate(size=300, seed=seed, stage_workers=4)
+                self.assertEqual(self.count('member'), 300)
+                self.assertIntegrity()
+
+
+if __name__ == '__main__':
+    unittest.main()